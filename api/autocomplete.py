@@ -0,0 +1,156 @@
+import heapq
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection
+
+from api.models import Game, Genre, Keyword, Platform
+from api.models.image_model import ImageBase
+
+WORD_RE = re.compile(r'\w+')
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    type: str
+    id: int
+    slug: Optional[str]
+    title: str
+    cover: Optional[int] = None
+
+
+def normalize(text: str) -> str:
+    """Lowercase words without accents, e.g. 'Pokémon: Red' is 'pokemon red'"""
+    text = unicodedata.normalize('NFKD', text.casefold())
+    return ' '.join(WORD_RE.findall(''.join(char for char in text if not unicodedata.combining(char))))
+
+
+class PrefixIndex:
+    """Sorted keys of the suggestions of one type, searched by prefix with bisect
+
+    Every suggestion is indexed from each of its words, so 'zel' finds 'The Legend of Zelda'.
+
+    Args:
+        suggestions (Iterable[Suggestion]): suggestions of the index.
+    """
+
+    def __init__(self, suggestions: Iterable[Suggestion]):
+        entries: List[Tuple[str, int, Suggestion]] = []
+        for suggestion in suggestions:
+            words = normalize(suggestion.title or '').split()
+            entries += [(' '.join(words[position:]), position, suggestion) for position in range(len(words))]
+        entries.sort(key=lambda entry: entry[0])
+        self.keys = [key for key, _, _ in entries]
+        self.entries = [(position, suggestion) for _, position, suggestion in entries]
+
+    def find(self, prefix: str, max_scan: int) -> Iterable[Tuple[int, Suggestion]]:
+        """Position of the matched word and suggestion of up to max_scan keys starting with the prefix"""
+        start = bisect_left(self.keys, prefix)
+        end = bisect_left(self.keys, f'{prefix}\U0010ffff', lo=start)
+        return self.entries[start:min(end, start + max_scan)]
+
+
+class AutocompleteIndex:
+    """In-process prefix indexes of the games, genres, keywords and platforms for the typeahead
+
+    The indexes are rebuilt in a background thread once invalidated by a catalog change or
+    older than their ttl, while the requests keep being served from the previous ones.
+
+    Args:
+        ttl (int): seconds before the indexes are rebuilt, to see the changes of other processes.
+        max_scan (int): keys scanned per type and request, bounding the time of short prefixes.
+    """
+    TYPES = ('game', 'genre', 'keyword', 'platform')
+
+    def __init__(self, ttl: int, max_scan: int = 2000):
+        self.ttl = ttl
+        self.max_scan = max_scan
+        self.indexes: Optional[Dict[str, PrefixIndex]] = None
+        self.built_at = 0.0
+        self.stale = False
+        self._lock = threading.Lock()
+        self._rebuilding = False
+
+    def search(self, text: str, types: Iterable[str], limit: int) -> List[Suggestion]:
+        """Suggestions with a word starting with the text, ranked by the position of the word and length
+
+        Args:
+            text (str): text typed by the user.
+            types (Iterable[str]): types of the suggestions.
+            limit (int): max suggestions.
+
+        Returns:
+            List[Suggestion]: best suggestions
+        """
+        prefix = normalize(text)
+        if not prefix:
+            return []
+        indexes = self.get_indexes()
+        ranked: Dict[Suggestion, Tuple[int, int, str]] = {}
+        for type_name in types:
+            for position, suggestion in indexes[type_name].find(prefix, self.max_scan):
+                rank = (position, len(suggestion.title), suggestion.title)
+                if suggestion not in ranked or rank < ranked[suggestion]:
+                    ranked[suggestion] = rank
+        return heapq.nsmallest(limit, ranked, key=ranked.__getitem__)
+
+    def get_indexes(self) -> Dict[str, PrefixIndex]:
+        if self.indexes is None:
+            with self._lock:
+                if self.indexes is None:
+                    self.indexes, self.built_at = self.build(), time.monotonic()
+        elif self.stale or time.monotonic() - self.built_at > self.ttl:
+            with self._lock:
+                if not self._rebuilding:
+                    self._rebuilding = True
+                    threading.Thread(target=self._rebuild, daemon=True).start()
+        return self.indexes
+
+    def invalidate(self):
+        """Rebuild the indexes on the next search"""
+        self.stale = True
+
+    def warm(self):
+        """Build the indexes in a background thread, so the first search does not pay for it"""
+        threading.Thread(target=self._warm, daemon=True).start()
+
+    def _warm(self):
+        try:
+            self.get_indexes()
+        finally:
+            connection.close()
+
+    def _rebuild(self):
+        try:
+            self.stale = False
+            self.indexes, self.built_at = self.build(), time.monotonic()
+        finally:
+            self._rebuilding = False
+            connection.close()
+
+    def build(self) -> Dict[str, PrefixIndex]:
+        """Load the suggestions of every type with one query each, the games with the id of their ready cover"""
+        games = Game.objects.order_by().values_list('id', 'slug', 'title', 'cover_id', 'cover__state')
+        indexes = {'game': PrefixIndex(
+            Suggestion('game', pk, slug, title, cover_id if state == ImageBase.State.READY else None)
+            for pk, slug, title, cover_id, state in games.iterator(chunk_size=5000)
+        )}
+        for type_name, model in (('genre', Genre), ('keyword', Keyword)):
+            rows = model.objects.order_by().values_list('id', 'slug', 'name')
+            indexes[type_name] = PrefixIndex(Suggestion(type_name, pk, slug, name) for pk, slug, name in rows.iterator())
+        platforms = Platform.objects.order_by().values_list('id', 'name')
+        indexes['platform'] = PrefixIndex(Suggestion('platform', pk, None, name) for pk, name in platforms)
+        return indexes
+
+
+@lru_cache(maxsize=None)
+def get_autocomplete_index() -> AutocompleteIndex:
+    """Autocomplete index of the process"""
+    return AutocompleteIndex(settings.AUTOCOMPLETE_TTL, settings.AUTOCOMPLETE_MAX_SCAN)
@@ -1,15 +1,119 @@
+from http.client import responses
+from typing import Any, Optional
+from urllib.parse import urlencode
+
+from fastapi import Depends, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
 from api.models import (Game, Genre, Keyword, Language, Platform,
                         PlayerPerspective, Theme)
-from api.schemas import (GameSchema, GenreSchema,
-                         KeywordSchema, LanguageSchema, PlatformSchema,
-                         PlayerPerspectiveSchema, ThemeSchema)
-
-from .services import BaseRouter
+from api.schemas import (CursorResponseSchema, GameSchema, GenreSchema,
+                         KeywordSchema, LanguageSchema, PaginatedResponse,
+                         PlatformSchema, PlayerPerspectiveSchema, ThemeSchema)
+from api.search import get_search_page, search_games
+from main.utils.exceptions import SearchException
+
+from .services import AutocompleteRouter, BaseRouter, MediaRouter, TagFilter
+
+
+class SearchQueryParams:
+    def __init__(
+        self,
+        q: str = Query(
+            description="Words to search in the titles, summaries and story lines, e.g. 'zelda -\"breath of the wild\"'.",
+            min_length=1,
+        ),
+        limit: int = Query(
+            default=10,
+            description="Amount of total data that can access per request."
+        ),
+        cursor: Optional[str] = Query(
+            default=None,
+            description="Position after the last result of the previous page, as given in its next link."
+        ),
+    ):
+        self.q = q
+        self.limit = limit
+        self.cursor = cursor
 
 
 class GameRouter(BaseRouter):
     model = Game
     schema = GameSchema
+    root_parameters = [
+        {
+            'name': 'tags',
+            'in': 'query',
+            'required': False,
+            'description': "Filter by tags with 'all:', 'any:' or 'none:' followed by tag values or slugs "
+                           "of genres, keywords or themes separated by commas. Can be repeated.",
+            'schema': {'type': 'array', 'items': {'type': 'string'}},
+            'example': ['all:role-playing-rpg,fantasy', 'none:horror'],
+        },
+        {
+            'name': 'facets',
+            'in': 'query',
+            'required': False,
+            'description': "Facets counted in the filtered games, separated by commas "
+                           "(genres, platforms, themes, game_modes, type, status).",
+            'schema': {'type': 'string'},
+            'example': 'genres,platforms',
+        },
+    ]
+    link_params = ('tags', 'facets')
+    relation_filters = (
+        'genres.slug', 'genres.name', 'keywords.slug', 'keywords.name', 'themes.slug', 'themes.name',
+        'game_modes.slug', 'game_modes.name', 'player_perspectives.slug', 'player_perspectives.name',
+        'release_platforms.platform.name', 'release_platforms.platform.abbreviation', 'release_platforms.region',
+        'release_platforms.release_date', 'release_platforms.multiplayer_modes.online_players',
+        'release_platforms.multiplayer_modes.offline_players', 'release_platforms.multiplayer_modes.online_coop_players',
+        'release_platforms.multiplayer_modes.offline_coop_players', 'language_supports.language.locale',
+        'language_supports.language.name',
+    )
+    facet_fields = {
+        'genres': ('genres__slug', 'genres__name'),
+        'platforms': ('release_platforms__platform', 'release_platforms__platform__name'),
+        'themes': ('themes__slug', 'themes__name'),
+        'game_modes': ('game_modes__slug', 'game_modes__name'),
+        'type': ('type', 'type'),
+        'status': ('status', 'status'),
+    }
+
+    def _add_routes(self):
+        """Add the search route before the slug route, which would match it"""
+        self.add_api_route(
+            path="/search",
+            status_code=200,
+            endpoint=self.search_items,
+            name='Search Games',
+            description='Endpoint to search games by relevance in their titles, alternative and localized titles, '
+                        'summary and story line, paginated with a cursor.',
+            response_model=PaginatedResponse,
+            response_model_exclude_none=True,
+            methods=["GET"],
+        )
+        super()._add_routes()
+
+    def filter_queryset(self, request, queryset):
+        if expressions := request.query_params.getlist('tags'):
+            queryset = queryset.filter(TagFilter(expressions).get_query())
+        return queryset
+
+    def search_items(self, params: SearchQueryParams = Depends()) -> Any:
+        if not params.q.strip():
+            raise SearchException(code=1)
+        self.validate_limit(params.limit)
+        games = search_games(params.q)
+        try:
+            page, next_cursor = get_search_page(games, params.limit, params.cursor)
+        except (ValueError, TypeError):
+            raise SearchException(code=0, value=params.cursor)
+        result = CursorResponseSchema(raw_query=f'{urlencode({"q": params.q})}&', data=self.schema.from_django(page, many=True),
+                                      route_name='games/search', limit=params.limit, max_count=games.count(),
+                                      next_cursor=next_cursor)
+        response = PaginatedResponse(message=responses[200], result=result)
+        return JSONResponse(content=jsonable_encoder(response.dict(exclude_none=True)))
 
 
 class GenreRouter(BaseRouter):
@@ -50,3 +154,5 @@ theme_router = ThemeRouter()
 language_router = LanguageRouter()
 player_perspective_router = PlayerPerspectiveRouter()
 platform_router = PlatformRouter()
+media_router = MediaRouter()
+autocomplete_router = AutocompleteRouter()
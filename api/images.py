@@ -0,0 +1,70 @@
+import os
+import pathlib
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, suppress
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Tuple, Type, Union
+
+from PIL import Image
+
+from api.models import Cover, LocaleCover, Thumbnail
+from api.models.image_model import ImageBase
+
+IMAGE_MODELS: Tuple[Type[ImageBase], ...] = (Cover, LocaleCover, Thumbnail)
+IMAGE_MODELS_BY_NAME: Dict[str, Type[ImageBase]] = {model.__name__.lower(): model for model in IMAGE_MODELS}
+
+# File extension of each format written by Pillow
+EXTENSIONS = {'jpeg': 'jpg', 'webp': 'webp', 'avif': 'avif'}
+
+
+def supported_formats(formats: Iterable[str] = EXTENSIONS) -> List[str]:
+    """Keep the formats the installed Pillow is able to write"""
+    Image.init()
+    return [fmt for fmt in formats if fmt.upper() in Image.SAVE]
+
+
+@contextmanager
+def partial_file(directory: Union[str, pathlib.Path]) -> Iterator[Tuple[BinaryIO, pathlib.Path]]:
+    """Hidden temporary file in the directory, to be renamed over its final path once complete
+
+    The file is removed when the block fails or does not rename it, so readers never see a
+    partial file. The handle must be closed by the block before renaming the file.
+
+    Args:
+        directory (Union[str, pathlib.Path]): directory of the final path, so the rename is atomic.
+
+    Yields:
+        Tuple[BinaryIO, pathlib.Path]: open handle and path of the temporary file
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as handle:
+            yield handle, pathlib.Path(tmp_path)
+    finally:
+        with suppress(FileNotFoundError):
+            os.unlink(tmp_path)
+
+
+class RunStats(Counter):
+    """Thread-safe counters of a run of the image services, with its elapsed seconds"""
+
+    def __init__(self, *names: str):
+        super().__init__(dict.fromkeys(names, 0))
+        self._lock = threading.Lock()
+        self.started_at = time.monotonic()
+
+    def count(self, name: str, value: int = 1):
+        with self._lock:
+            self[name] += value
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def to_dict(self) -> Dict[str, Union[int, float]]:
+        return {**self, 'elapsed': round(self.elapsed, 3)}
+
+    def __str__(self):
+        return ', '.join(f'{k}={v}' for k, v in self.to_dict().items())
@@ -0,0 +1,63 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
+
+from langcodes import Language as Lang
+from language_data.language_lists import CLDR_LANGUAGES
+
+
+@dataclass(frozen=True)
+class LocaleInfo:
+    language: str
+    name: str
+    autonym: str
+    territory: Optional[str] = None
+
+    @property
+    def locale(self) -> str:
+        return f'{self.language}-{self.territory}' if self.territory else self.language
+
+
+class LocaleTable:
+    """Languages indexed by code, english name and autonym, built offline from the langcodes data
+
+    Args:
+        codes (Iterable[str]): language codes of the table.
+    """
+
+    def __init__(self, codes: Iterable[str]):
+        self.locales: Dict[str, LocaleInfo] = {}
+        self.names: Dict[str, LocaleInfo] = {}
+        for code in sorted(codes):
+            lang = Lang.get(code)
+            info = LocaleInfo(code, lang.display_name(), lang.autonym(), lang.maximize().territory)
+            self.locales[code] = info
+            for key in (info.name, info.autonym, code):
+                self.names.setdefault(key.lower(), info)
+
+    def find(self, name: str) -> LocaleInfo:
+        """Language of a name, in english or in the language itself
+
+        Raises:
+            LookupError: when no language has that name.
+        """
+        if info := self.names.get(name.lower()):
+            return info
+        return self._find(name)
+
+    @lru_cache(maxsize=None)
+    def _find(self, name: str) -> LocaleInfo:
+        code = Lang.find(name).language
+        return self.locales.get(code) or self.describe(code)
+
+    @lru_cache(maxsize=None)
+    def describe(self, locale: str) -> LocaleInfo:
+        """Name, autonym and territory of a locale, e.g. es-MX is Spanish (Mexico)"""
+        lang = Lang.get(locale)
+        return LocaleInfo(lang.language, lang.display_name(), lang.autonym(), lang.maximize().territory)
+
+
+@lru_cache(maxsize=None)
+def get_locale_table() -> LocaleTable:
+    """Locale table of the CLDR languages, built once per process"""
+    return LocaleTable(CLDR_LANGUAGES)
@@ -0,0 +1,58 @@
+# Generated by Django 4.1.13 on 2026-10-19 16:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_alter_agerating_options_alter_gamemode_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='collection',
+            name='igdb_id',
+            field=models.PositiveBigIntegerField(blank=True, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='igdb_id',
+            field=models.PositiveBigIntegerField(blank=True, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='gamemode',
+            name='igdb_id',
+            field=models.PositiveBigIntegerField(blank=True, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='genre',
+            name='igdb_id',
+            field=models.PositiveBigIntegerField(blank=True, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='keyword',
+            name='igdb_id',
+            field=models.PositiveBigIntegerField(blank=True, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='language',
+            name='igdb_id',
+            field=models.PositiveBigIntegerField(blank=True, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='platform',
+            name='igdb_id',
+            field=models.PositiveBigIntegerField(blank=True, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='playerperspective',
+            name='igdb_id',
+            field=models.PositiveBigIntegerField(blank=True, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='theme',
+            name='igdb_id',
+            field=models.PositiveBigIntegerField(blank=True, null=True, unique=True),
+        ),
+    ]
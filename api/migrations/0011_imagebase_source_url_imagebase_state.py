@@ -0,0 +1,23 @@
+# Generated by Django 4.1.13 on 2026-10-19 16:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_collection_igdb_id_game_igdb_id_gamemode_igdb_id_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imagebase',
+            name='source_url',
+            field=models.URLField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='imagebase',
+            name='state',
+            field=models.CharField(choices=[('pending', 'Pending'), ('ready', 'Ready'), ('failed', 'Failed')], db_index=True, default='pending', max_length=10),
+        ),
+    ]
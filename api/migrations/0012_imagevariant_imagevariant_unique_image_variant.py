@@ -0,0 +1,32 @@
+# Generated by Django 4.1.13 on 2026-10-19 16:34
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_imagebase_source_url_imagebase_state'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageVariant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('width', models.PositiveIntegerField()),
+                ('height', models.PositiveIntegerField()),
+                ('format', models.CharField(choices=[('jpeg', 'JPEG'), ('webp', 'WebP'), ('avif', 'AVIF')], max_length=4)),
+                ('url', models.URLField()),
+                ('image', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='variants', to='api.imagebase')),
+            ],
+            options={
+                'ordering': ['format', 'width'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='imagevariant',
+            constraint=models.UniqueConstraint(fields=('image', 'format', 'width'), name='unique_image_variant'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.1.13 on 2026-10-19 16:37
+
+import api.fields
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_imagevariant_imagevariant_unique_image_variant'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', api.fields.UCDateTimeField(auto_now_add=True)),
+                ('updated_at', api.fields.UCDateTimeField(auto_now=True)),
+                ('hash', models.CharField(max_length=64, unique=True)),
+                ('ext', models.CharField(max_length=10)),
+                ('size', models.PositiveIntegerField()),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.AddField(
+            model_name='imagebase',
+            name='blob',
+            field=models.ForeignKey(blank=True, db_column='content_hash', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='images', to='api.imageblob', to_field='hash'),
+        ),
+    ]
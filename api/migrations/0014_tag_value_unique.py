@@ -0,0 +1,31 @@
+# Generated by Django 4.1.13 on 2026-10-19 16:48
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def merge_duplicate_tags(apps, schema_editor):
+    Tag = apps.get_model('api', 'Tag')
+    through = apps.get_model('api', 'Game').tags.through
+    shared = dict(Tag.objects.values('value').annotate(pk=Min('pk')).values_list('value', 'pk'))
+    rows = {(game_id, shared[value]) for game_id, value in through.objects.values_list('game_id', 'tag__value')}
+    through.objects.all().delete()
+    through.objects.bulk_create([through(game_id=game_id, tag_id=tag_id) for game_id, tag_id in rows],
+                                batch_size=1000)
+    Tag.objects.exclude(pk__in=shared.values()).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_imageblob_imagebase_blob'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_tags, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='tag',
+            name='value',
+            field=models.PositiveIntegerField(blank=True, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.1.13 on 2026-10-19 16:50
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_tag_values(apps, schema_editor):
+    Game = apps.get_model('api', 'Game')
+    values = (Game.tags.through.objects.filter(game_id=OuterRef('pk')).order_by().values('game_id')
+              .annotate(values=ArrayAgg('tag__value', ordering='tag__value')).values('values'))
+    Game.objects.filter(pk__in=Game.tags.through.objects.values('game_id')).update(tag_values=Subquery(values))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_tag_value_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='tag_values',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.PositiveIntegerField(), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tag_values'], name='game_tag_values_gin'),
+        ),
+        migrations.RunPython(fill_tag_values, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 4.1.13 on 2026-10-19 16:53
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import migrations, models
+import django.db.models.functions.text
+
+TRIGRAM_INDEXES = [
+    ('game', django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('title'), name='gin_trgm_ops'), name='game_title_trgm')),
+    ('gamemode', django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='gamemode_name_trgm')),
+    ('genre', django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='genre_name_trgm')),
+    ('keyword', django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='keyword_name_trgm')),
+    ('playerperspective', django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='playerperspective_name_trgm')),
+    ('theme', django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='theme_name_trgm')),
+] if settings.DB_TRIGRAM_INDEXES else []
+
+
+def add_trigram_indexes(apps, schema_editor):
+    """Create the trigram indexes, the server must ship the pg_trgm extension unless they are disabled"""
+    if not TRIGRAM_INDEXES:
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            raise ImproperlyConfigured('The pg_trgm extension is not available, install it or set '
+                                       'DB_TRIGRAM_INDEXES=false to migrate without the trigram indexes')
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for model_name, index in TRIGRAM_INDEXES:
+        schema_editor.add_index(apps.get_model('api', model_name), index)
+
+
+def remove_trigram_indexes(apps, schema_editor):
+    for model_name, index in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {schema_editor.quote_name(index.name)}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_game_tag_values'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['title'], name='game_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['first_release'], name='game_first_release_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['created_at'], name='game_created_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['updated_at'], name='game_updated_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gamemode',
+            index=models.Index(fields=['name'], name='gamemode_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='genre',
+            index=models.Index(fields=['name'], name='genre_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='keyword',
+            index=models.Index(fields=['name'], name='keyword_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playerperspective',
+            index=models.Index(fields=['name'], name='playerperspective_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='theme',
+            index=models.Index(fields=['name'], name='theme_name_idx'),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(model_name=model_name, index=index) for model_name, index in TRIGRAM_INDEXES
+            ],
+            database_operations=[
+                migrations.RunPython(add_trigram_indexes, remove_trigram_indexes),
+            ],
+        ),
+    ]
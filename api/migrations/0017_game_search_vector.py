@@ -0,0 +1,44 @@
+# Generated by Django 4.1.13 on 2026-10-19 16:56
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def fill_search_vectors(apps, schema_editor):
+    Game = apps.get_model('api', 'Game')
+    AlternativeTitle = apps.get_model('api', 'AlternativeTitle')
+    LanguageTitle = apps.get_model('api', 'LanguageTitle')
+    alternative_titles = (AlternativeTitle.objects.filter(game=OuterRef('pk')).order_by().values('game')
+                          .annotate(titles=StringAgg('title', ' ')).values('titles'))
+    localized_titles = (LanguageTitle.objects.filter(language_support__game=OuterRef('pk')).order_by()
+                        .values('language_support__game').annotate(titles=StringAgg('title', ' ')).values('titles'))
+    Game.objects.update(search_vector=(
+        SearchVector('title', config='simple', weight='A')
+        + SearchVector(Subquery(alternative_titles), Subquery(localized_titles), config='simple', weight='B')
+        + SearchVector('summary', config='english', weight='C')
+        + SearchVector('story_line', config='english', weight='D')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='game_search_vector_gin'),
+        ),
+        migrations.RunPython(fill_search_vectors, migrations.RunPython.noop),
+    ]
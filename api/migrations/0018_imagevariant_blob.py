@@ -0,0 +1,31 @@
+# Generated by Django 4.1.13 on 2026-10-19 17:24
+
+from django.db import migrations, models
+from django.db.models import Min, OuterRef, Subquery
+import django.db.models.deletion
+
+
+def key_variants_by_blob(apps, schema_editor):
+    """Move the variants to the blob of their image, keeping one per blob, format and width"""
+    ImageBase = apps.get_model('api', 'ImageBase')
+    ImageVariant = apps.get_model('api', 'ImageVariant')
+    ImageVariant.objects.update(blob=Subquery(ImageBase.objects.filter(pk=OuterRef('image')).values('blob')))
+    ImageVariant.objects.filter(blob__isnull=True).delete()
+    kept = ImageVariant.objects.values('blob', 'format', 'width').annotate(kept=Min('pk')).values('kept')
+    ImageVariant.objects.exclude(pk__in=kept).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_game_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imagevariant',
+            name='blob',
+            field=models.ForeignKey(db_column='content_hash', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='variants', to='api.imageblob', to_field='hash'),
+        ),
+        migrations.RunPython(key_variants_by_blob, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.1.13 on 2026-10-19 17:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_imagevariant_blob'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='imagevariant',
+            name='unique_image_variant',
+        ),
+        migrations.RemoveField(
+            model_name='imagevariant',
+            name='image',
+        ),
+        migrations.AlterField(
+            model_name='imagevariant',
+            name='blob',
+            field=models.ForeignKey(db_column='content_hash', on_delete=django.db.models.deletion.CASCADE, related_name='variants', to='api.imageblob', to_field='hash'),
+        ),
+        migrations.AddConstraint(
+            model_name='imagevariant',
+            constraint=models.UniqueConstraint(fields=('blob', 'format', 'width'), name='unique_blob_variant'),
+        ),
+    ]
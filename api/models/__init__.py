@@ -5,7 +5,7 @@ from .alternative_titles import AlternativeTitle
 from .collection_model import Collection
 from .game_model import Game
 from .game_video_model import GameVideo
-from .image_model import Cover, LocaleCover, Thumbnail
+from .image_model import Cover, ImageBlob, ImageVariant, LocaleCover, Thumbnail
 from .language_model import Language, LanguageSupport, SupportType, LanguageTitle
 from .object_imagefield import ObjectWithImageField
 from .platform_model import Platform
@@ -3,10 +3,11 @@ from django.utils.text import slugify
 
 from .creation_update_model import CreatedUpdatedAt
 from .game_model import Game
-from .object_imagefield import unique_slugify
+from .object_imagefield import save_with_unique_slug
 
 
 class Collection(CreatedUpdatedAt):
+    igdb_id: int = models.PositiveBigIntegerField(unique=True, null=True, blank=True)
     name: str = models.CharField(max_length=150)
     games = models.ManyToManyField(Game, related_name='collection')
     slug: str = models.SlugField(max_length=150, unique=True)
@@ -14,7 +15,13 @@ class Collection(CreatedUpdatedAt):
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            self.slug = f'{slugify(self.name, allow_unicode=True)}{unique_slugify(self, self.slug)}'
+            default_url = not self.url
+
+            def save_row():
+                if default_url:
+                    self.url = f'http://127.0.0.1:8000/collection/{self.slug}'
+                super(Collection, self).save(*args, **kwargs)
+            return save_with_unique_slug(self, slugify(self.name, allow_unicode=True), save_row)
 
         if not self.url:
             self.url = f'http://127.0.0.1:8000/collection/{self.slug}'
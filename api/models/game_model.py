@@ -1,6 +1,11 @@
 from typing import Any
 
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
+from django.conf import settings
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 
@@ -9,7 +14,7 @@ from api.models.creation_update_model import CreatedUpdatedAt
 
 from .age_rating_model import AgeRating
 from .image_model import Cover
-from .object_imagefield import unique_slugify
+from .object_imagefield import save_with_unique_slug
 from .related_model import GameMode, Genre, Keyword, Tag, Theme
 
 
@@ -45,6 +50,7 @@ class Game(CreatedUpdatedAt):
         RUMORED = 'Rumored', _('Rumored')
         DELISTED = 'Delisted', _('Delisted')
 
+    igdb_id: int = models.PositiveBigIntegerField(unique=True, null=True, blank=True)
     title: str = models.CharField(max_length=100)
     player_perspectives: Any = models.ManyToManyField('api.PlayerPerspective')
     summary: str = models.CharField(max_length=5000, null=True, blank=True, default=None)
@@ -63,6 +69,10 @@ class Game(CreatedUpdatedAt):
     keywords: Any = models.ManyToManyField(Keyword)
     themes: Any = models.ManyToManyField(Theme)
     tags: Any = models.ManyToManyField(Tag)
+    # Sorted values of the tags, the inverted index used to filter games by tags
+    tag_values: list = ArrayField(models.PositiveIntegerField(), default=list, blank=True, editable=False)
+    # Weighted search vector of the titles, summary and story line, refreshed on write
+    search_vector: Any = SearchVectorField(null=True, editable=False)
     slug: str = models.SlugField(
         unique=True,
         verbose_name=_("slug"),
@@ -88,24 +98,24 @@ class Game(CreatedUpdatedAt):
         verbose_name = 'Game'
         verbose_name_plural = 'Games'
         ordering = ['title']
-
-    def _create_tags(self):
-        for field_name in ('genres', 'keywords', 'themes'):
-            for related_obj in getattr(self, field_name).all():
-                tag_obj = Tag.objects.create(
-                    type_id=getattr(Tag.Type, field_name[:-1].upper()),
-                    endpoint_id=related_obj.id
-                )
-                self.tags.add(tag_obj)
+        indexes = [
+            GinIndex(fields=['tag_values'], name='game_tag_values_gin'),
+            GinIndex(fields=['search_vector'], name='game_search_vector_gin'),
+            # Wildcard filters compare UPPER(title) with LIKE
+            *([GinIndex(OpClass(Upper('title'), name='gin_trgm_ops'), name='game_title_trgm')]
+              if settings.DB_TRIGRAM_INDEXES else []),
+            models.Index(fields=['title'], name='game_title_idx'),
+            models.Index(fields=['first_release'], name='game_first_release_idx'),
+            models.Index(fields=['created_at'], name='game_created_at_idx'),
+            models.Index(fields=['updated_at'], name='game_updated_at_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            self.slug = f'{unique_slugify(self, slugify(self.title, allow_unicode=True))}'
+            return save_with_unique_slug(self, slugify(self.title, allow_unicode=True),
+                                         lambda: super(Game, self).save(*args, **kwargs))
 
         super(Game, self).save(*args, **kwargs)
 
-        if not self.tags.exists():
-            self._create_tags()
-
     def __str__(self):
         return str(self.title)
@@ -1,61 +1,117 @@
 import re
 import pathlib
-from os.path import exists
-from typing import Any, Union
+from typing import Any
 
-import requests
 from django.db import models
 from django.conf import settings
 
 from .creation_update_model import CreatedUpdatedAt
-from django.core.files.images import get_image_dimensions
+
+
+class ImageBlob(CreatedUpdatedAt):
+    """ Image file stored once by the hash of its content, sharded in nested folders """
+    hash: str = models.CharField(max_length=64, unique=True)
+    ext: str = models.CharField(max_length=10)
+    size: int = models.PositiveIntegerField()
+    ref_count: int = models.PositiveIntegerField(default=0)
+
+    @staticmethod
+    def get_name(content_hash: str, ext: str) -> str:
+        return f'blobs/{content_hash[:2]}/{content_hash[2:4]}/{content_hash}{ext}'
+
+    @property
+    def name(self) -> str:
+        return self.get_name(self.hash, self.ext)
+
+    @property
+    def path(self) -> pathlib.Path:
+        return pathlib.Path(settings.STATIC_ROOT).joinpath(self.name)
+
+    @property
+    def url(self) -> str:
+        return f'{settings.IMAGE_STATIC_URL}{self.name}'
+
+    @property
+    def variants_folder(self) -> str:
+        """Folder of the resized variants, sharded like the blobs and named by the hash"""
+        return f'variants/{self.hash[:2]}/{self.hash[2:4]}'
 
 
 class ImageBase(CreatedUpdatedAt):
+    class State(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        READY = 'ready', 'Ready'
+        FAILED = 'failed', 'Failed'
+
     animated: bool = models.BooleanField(default=False, null=True)
     height: int = models.PositiveIntegerField(blank=True, null=True)
     width: int = models.PositiveIntegerField(blank=True, null=True)
     filename: str = models.SlugField(null=True, blank=True, max_length=100)
     url: str = models.URLField(blank=True, null=True)
+    source_url: str = models.URLField(blank=True, null=True)
+    state: str = models.CharField(max_length=10, choices=State.choices, default=State.PENDING, db_index=True)
+    blob: Any = models.ForeignKey(ImageBlob, to_field='hash', db_column='content_hash', null=True, blank=True,
+                                  on_delete=models.PROTECT, related_name='images')
 
     def save(self, *args, **kwargs):
-        if 'http://127.0.0.1:8000/static/' not in self.url:
-            self._get_image_from_url(url=self.url, filename=self.filename)
-        else:
-            self.filename = None
-        folder_name = f'{self.__class__.__name__.lower()}s'
-        self.url = f'http://127.0.0.1:8000/static/{folder_name}/{self.filename}.jpg'
+        """Record the remote url of the image to be downloaded by the image downloader"""
+        if self.url and not self.url.startswith(settings.IMAGE_STATIC_URL):
+            self.source_url = self._get_source_url(self.url)
+            self.state = self.State.PENDING
+            self.url = f'{settings.IMAGE_STATIC_URL}{self.folder_name}/{self.filename}{self.file_ext}'
         super(ImageBase, self).save(*args, **kwargs)
 
-    def _get_image_from_url(self, url: Union[str, None], filename: str):
+    @staticmethod
+    def _get_source_url(url: str) -> str:
         pattern = r'(http|ftp|https)?:?//([\w_-]+(?:(?:.[\w_-]+)+)[\w.,@?^=%&:\/~+#-]*[\w@?^=%&\/~+#-])'
         reg_match = re.match(pattern, url)
         schema = f'{reg_match[1]}://' if reg_match[1] else 'https://'
         url_body = reg_match[2].replace('t_thumb', 't_cover_big')
-        class_name = self.__class__.__name__.lower()
-        self.filename = f'{filename}'
-        file_ext = pathlib.Path(url_body).suffix
-        full_filename = self.filename+file_ext
-
-        full_root = pathlib.Path(settings.STATIC_ROOT).joinpath(f'{class_name}s')
-        full_root.mkdir(parents=True, exist_ok=True)
-        full_root = full_root.joinpath(full_filename)
-
-        if not exists(full_root):
-            with open(full_root, 'wb') as handle:
-                response = requests.get(schema+url_body)
-
-                if not response.ok:
-                    print('Error getting:', response.url, f'for {class_name} image ({response.status_code})')
-                    return
-
-                for block in response.iter_content(1024):
-                    if not block:
-                        break
-
-                    handle.write(block)
-
-        self.width, self.height = get_image_dimensions(full_root)
+        return schema + url_body
+
+    @property
+    def folder_name(self) -> str:
+        return f'{self.__class__.__name__.lower()}s'
+
+    @property
+    def file_ext(self) -> str:
+        return pathlib.Path(self.source_url or '').suffix or '.jpg'
+
+    @property
+    def legacy_path(self) -> pathlib.Path:
+        """Path of the images stored by filename before the blob storage"""
+        return pathlib.Path(settings.STATIC_ROOT).joinpath(self.folder_name, f'{self.filename}{self.file_ext}')
+
+    @property
+    def file_path(self) -> pathlib.Path:
+        """Local path of the image inside the static root"""
+        return self.blob.path if self.blob_id else self.legacy_path
+
+    @property
+    def variants(self) -> models.Manager:
+        """Resized variants of the content of the image, shared by the images of the same blob"""
+        return self.blob.variants if self.blob_id else ImageVariant.objects.none()
+
+
+class ImageVariant(models.Model):
+    """ Resized copy of an image blob in a given format """
+    class Format(models.TextChoices):
+        JPEG = 'jpeg', 'JPEG'
+        WEBP = 'webp', 'WebP'
+        AVIF = 'avif', 'AVIF'
+
+    blob: Any = models.ForeignKey(ImageBlob, to_field='hash', db_column='content_hash', on_delete=models.CASCADE,
+                                  related_name='variants')
+    width: int = models.PositiveIntegerField()
+    height: int = models.PositiveIntegerField()
+    format: str = models.CharField(max_length=4, choices=Format.choices)
+    url: str = models.URLField()
+
+    class Meta:
+        ordering = ['format', 'width']
+        constraints = [
+            models.UniqueConstraint(fields=['blob', 'format', 'width'], name='unique_blob_variant'),
+        ]
 
 
 class LocaleCover(ImageBase):
@@ -1,35 +1,31 @@
 import contextlib
 from typing import Any, Optional
 
-import requests
 from django.db import models
 from django.utils.translation import gettext_lazy as _
-from langcodes import Language as Lang
+
+from api.locales import get_locale_table
 
 from .creation_update_model import CreatedUpdatedAt
 
 
 class Language(CreatedUpdatedAt):
+    igdb_id: int = models.PositiveBigIntegerField(unique=True, null=True, blank=True)
     locale: str = models.CharField(max_length=10, null=True, unique=True)
     name: str = models.CharField(max_length=100, null=True, unique=True)
     native_name: str = models.CharField(max_length=100, null=True)
 
     def save(self, language: Optional[str] = None, *args, **kwargs):
+        locales = get_locale_table()
         if language and not self.locale:
             language = language.split()[0]
             if language.capitalize() not in ['Spanish', 'English']:
-                with contextlib.suppress(Exception):
-                    lang_code = Lang.find(language).language
-
-                    req = requests.get(f'https://restcountries.com/v3.1/lang/{language}')
-                    res = req.json()
-                    country_code = res[0]
-                    self.locale = f'{lang_code}-{country_code}'
+                with contextlib.suppress(LookupError):
+                    self.locale = locales.find(language).locale
         if not self.native_name and self.locale:
-            self.native_name = Lang.get(self.locale).autonym()
+            self.native_name = locales.describe(self.locale).autonym
         if (not self.name or ('-' in self.locale and '(' not in self.name)) and self.locale:
-            lang = Lang.get(self.locale)
-            self.name = lang.display_name()
+            self.name = locales.describe(self.locale).name
 
         super(Language, self).save(*args, **kwargs)
 
@@ -1,21 +1,100 @@
+import zlib
+from functools import reduce
+from operator import or_
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple, Type
 from urllib.request import urlopen
 
 from django.core.files import File
 from django.core.files.temp import NamedTemporaryFile
-from django.db import models
+from django.db import IntegrityError, connection, models, transaction
+
+
+def lock_slugs(slugs: Iterable[Tuple[Type[models.Model], str]]):
+    """Lock slugs of several models until the transaction ends, on PostgreSQL
+
+    The locks are taken in one query sorted by table and slug, so transactions locking the slugs of
+    several models never wait on each other in a cycle. Locking a slug again in the same transaction
+    does not wait, so a transaction may lock every slug it needs first and allocate them later.
+
+    Args:
+        slugs (Iterable[Tuple[Type[models.Model], str]]): model and slug of each lock.
+    """
+    if connection.vendor != 'postgresql':
+        return
+    keys = sorted({(zlib.crc32(model._meta.db_table.encode()) - 2 ** 31, slug) for model, slug in slugs})
+    if keys:
+        tables, bases = zip(*keys)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_xact_lock(key, hashtext(base)) FROM unnest(%s::integer[], %s::text[]) '
+                           'AS lock(key, base)', [list(tables), list(bases)])
+
+
+def allocate_slugs(model: Type[models.Model], slugs: Sequence[str]) -> List[str]:
+    """Reserve unique slugs of a model for a batch of rows
+
+    The taken slugs starting with each requested one are loaded in one query and the
+    duplicates get the next free `--N` suffix, counted in memory. On PostgreSQL the requested
+    slugs are locked in one query until the transaction ends, so the rows must be inserted in
+    the same transaction for concurrent threads or processes to never get the same slug.
+
+    Args:
+        model (Type[models.Model]): model with an unique slug field.
+        slugs (Sequence[str]): slugs wanted for each row.
+
+    Returns:
+        List[str]: unique slug of each row
+    """
+    bases = sorted(set(slugs))
+    if not bases:
+        return []
+    lock_slugs((model, base) for base in bases)
+
+    query = reduce(or_, (models.Q(slug=base) | models.Q(slug__startswith=f'{base}--') for base in bases))
+    taken = set(model.objects.filter(query).order_by().values_list('slug', flat=True))
+    counters: Dict[str, int] = {}
+    for slug in taken:
+        base, _, suffix = slug.rpartition('--')
+        if suffix.isdigit():
+            counters[base] = max(counters.get(base, 0), int(suffix))
+
+    unique_slugs = []
+    for slug in slugs:
+        unique_slug = slug
+        while unique_slug in taken:
+            counters[slug] = counters.get(slug, 0) + 1
+            unique_slug = f'{slug}--{counters[slug]}'
+        taken.add(unique_slug)
+        unique_slugs.append(unique_slug)
+    return unique_slugs
 
 
 def unique_slugify(instance, slug: str):
-    model = instance.__class__
-    unique_slug = slug
-    if model.objects.filter(slug=unique_slug).exists():
-        unique_slug, last_char = (slug.split('--')[0], slug.split('--')[-1])
+    return allocate_slugs(instance.__class__, [slug])[0]
+
+
+def save_with_unique_slug(instance, slug: str, save: Callable[[], Any], attempts: int = 3):
+    """Save a new row with the next free slug, in one transaction with the lock of the slug
+
+    Outside of a transaction the lock of the slug would be released before the row is inserted,
+    so the slug is allocated and the row saved in the same atomic block, which is retried with a
+    new slug when another writer inserted the same slug without locking it.
+
+    Args:
+        instance (Model): unsaved row with an unique slug field.
+        slug (str): slug wanted for the row.
+        save (Callable[[], Any]): saves the row once its slug is set.
+        attempts (int, optional): times the row is saved before raising. Defaults to 3.
+    """
+    for attempt in range(attempts):
         try:
-            i = int(last_char)
-            unique_slug += f'{i+1}'
-        except ValueError:
-            unique_slug += '--1'
-    return unique_slug
+            with transaction.atomic():
+                instance.slug = unique_slugify(instance, slug)
+                return save()
+        except IntegrityError:
+            taken = instance.__class__.objects.filter(slug=instance.slug).exists()
+            instance.slug = None
+            if not taken or attempt == attempts - 1:
+                raise
 
 
 class ObjectWithImageField(models.Model):
@@ -13,6 +13,7 @@ class Platform(CreatedUpdatedAt):
         COMPUTER = 'COMPUTER', _('Computer')
         UNDEFINED = 'UNDEFINED', _('Undefined')
 
+    igdb_id: int = models.PositiveBigIntegerField(unique=True, null=True, blank=True)
     name: str = models.CharField(max_length=100, unique=True)
     abbreviation: str = models.CharField(max_length=20, null=True)
     alternative_name: str = models.CharField(max_length=100, null=True)
@@ -1,11 +1,15 @@
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils.text import slugify
 
 from .creation_update_model import CreatedUpdatedAt
-from .object_imagefield import unique_slugify
+from .object_imagefield import save_with_unique_slug
 
 
 class RelatedBase(CreatedUpdatedAt):
+    igdb_id: int = models.PositiveBigIntegerField(unique=True, null=True, blank=True)
     name: str = models.TextField(max_length=200)
     slug: str = models.SlugField(max_length=150, unique=True)
     url: str = models.URLField(max_length=250)
@@ -13,10 +17,15 @@ class RelatedBase(CreatedUpdatedAt):
     class Meta:
         abstract = True
         ordering = ['name']
+        indexes = [
+            *([GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='%(class)s_name_trgm')]
+              if settings.DB_TRIGRAM_INDEXES else []),
+            models.Index(fields=['name'], name='%(class)s_name_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            self.slug = f'{slugify(self.name)}{unique_slugify(self, self.slug)}'
+            return save_with_unique_slug(self, slugify(self.name), lambda: super(RelatedBase, self).save(*args, **kwargs))
 
         super(RelatedBase, self).save(*args, **kwargs)
 
@@ -69,7 +78,7 @@ class Tag(CreatedUpdatedAt):
 
     type_id: int = models.PositiveIntegerField(choices=Type.choices)
     endpoint_id: int = models.PositiveIntegerField()
-    value: int = models.PositiveIntegerField(null=True, blank=True)
+    value: int = models.PositiveIntegerField(null=True, blank=True, unique=True)
 
     class Meta:
         verbose_name = 'Tag'
@@ -78,13 +87,13 @@ class Tag(CreatedUpdatedAt):
 
     def save(self, *args, **kwargs):
         if not self.value:
-            self.value = self.__gen_value()
+            self.value = self.pack(self.type_id, self.endpoint_id)
         super(Tag, self).save(*args, **kwargs)
 
-    def __gen_value(self):
-        res = self.type_id << 28
-        res |= self.endpoint_id
-        return res
+    @classmethod
+    def pack(cls, type_id: int, endpoint_id: int) -> int:
+        """Value of the tag, shared by every game of the same type and endpoint"""
+        return type_id << 28 | endpoint_id
 
     def __str__(self):
         return str(self.value)
@@ -1,10 +1,10 @@
 from .exception_schema import ExceptionSchema
 from .gameplay_schema import AgeRatingSchema, GameModeSchema, PlatformSchema, PlayerPerspectiveSchema, ReleasePlatformSchema, Platforms, PlayerPerspectives
 from .language_schema import LanguageSchema, SupportTypeSchema, AlternativeTitleSchema, LanguageSupportSchema, LanguageTitleSchema, Languages, LanguageTitles
-from .media_schema import CoverSchema, VideoSchema, ThumbnailSchema
-from .meta_schema import LinksSchema, MetaSchema, FilterSchema
+from .media_schema import CoverSchema, ImageVariantSchema, VideoSchema, ThumbnailSchema
+from .meta_schema import LinksSchema, MetaSchema, FacetSchema, FilterSchema
 from .related_schema import KeywordSchema, GenreSchema, ThemeSchema, TagSchema
-from .response_schema import ResponseSchema
+from .response_schema import CursorResponseSchema, ResponseSchema
 from .game_schema import GameSchema, GameBase, Games, Keywords, Genres, Themes
 from pydantic import Field, BaseModel
 from typing import List, TypeVar
@@ -0,0 +1,20 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class SuggestionSchema(BaseModel):
+    type: str
+    id: int
+    slug: Optional[str] = None
+    title: str
+    cover: Optional[str] = None
+
+
+class AutocompleteResultSchema(BaseModel):
+    data: List[SuggestionSchema]
+
+
+class AutocompleteResponse(BaseModel):
+    message: str
+    result: AutocompleteResultSchema
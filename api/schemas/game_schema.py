@@ -54,6 +54,7 @@ class GameBase(ModelSchema):
 
     class Config:
         model = Game
+        exclude = ['tag_values', 'search_vector', 'igdb_id']
         arbitrary_types_allowed = True
 
 
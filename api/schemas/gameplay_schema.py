@@ -17,13 +17,13 @@ class AgeRatingSchema(ModelSchema):
 class GameModeSchema(ModelSchema):
     class Config:
         model = GameMode
-        exclude = ['game_set']
+        exclude = ['game_set', 'igdb_id']
 
 
 class PlayerPerspectiveSchema(ModelSchema):
     class Config:
         model = PlayerPerspective
-        exclude = ['game_set']
+        exclude = ['game_set', 'igdb_id']
 
 
 PlayerPerspectives = List[PlayerPerspectiveSchema]
@@ -43,7 +43,7 @@ class PlatformSchema(ModelSchema):
 
     class Config:
         model = Platform
-        exclude = ['releaseplatform_set']
+        exclude = ['releaseplatform_set', 'igdb_id']
 
 
 Platforms = List[PlatformSchema]
@@ -8,7 +8,7 @@ from api.models import Language, LanguageSupport, LanguageTitle, AlternativeTitl
 class LanguageSchema(ModelSchema):
     class Config:
         model = Language
-        exclude = ['languagesupport_set']
+        exclude = ['languagesupport_set', 'igdb_id']
 
 
 Languages = List[LanguageSchema]
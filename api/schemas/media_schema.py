@@ -1,25 +1,36 @@
-from typing import Optional
+from typing import List, Optional
 from djantic import ModelSchema
 from pydantic import Field
-from api.models import Cover, Thumbnail, GameVideo
+from api.models import Cover, ImageVariant, Thumbnail, GameVideo
+
+
+class ImageVariantSchema(ModelSchema):
+    class Config:
+        model = ImageVariant
+        include = ['url', 'width', 'height', 'format']
+
+
+ImageVariants = List[ImageVariantSchema]
 
 
 class CoverSchema(ModelSchema):
     id: int = Field(example=1)
     animated: Optional[bool] = Field(example=False)
+    variants: Optional[ImageVariants]
 
     class Config:
         model = Cover
-        exclude = ['imagebase_ptr', 'game_set']
+        exclude = ['imagebase_ptr', 'game_set', 'source_url', 'state', 'blob']
 
 
 class ThumbnailSchema(ModelSchema):
     id: int = Field(example=1)
     animated: Optional[bool] = Field(example=False)
+    variants: Optional[ImageVariants]
 
     class Config:
         model = Thumbnail
-        exclude = ['imagebase_ptr', 'game']
+        exclude = ['imagebase_ptr', 'game', 'source_url', 'state', 'blob']
 
 
 class VideoSchema(ModelSchema):
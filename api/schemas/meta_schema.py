@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Dict, Optional, List, Union
 
 
 class LinksSchema(BaseModel):
@@ -18,8 +18,18 @@ class FilterSchema(BaseModel):
 Filters = List[FilterSchema]
 
 
+class FacetSchema(BaseModel):
+    value: Union[int, str]
+    label: str
+    count: int
+
+
+Facets = Dict[str, List[FacetSchema]]
+
+
 class MetaSchema(BaseModel):
     total_count: Optional[int] = None
     offset: Optional[int] = None
     limit: Optional[int] = None
     filters: Optional[Filters] = None
+    facets: Optional[Facets] = None
@@ -11,7 +11,7 @@ class ThemeSchema(ModelSchema):
 
     class Config:
         model = Theme
-        exclude = ['game_set']
+        exclude = ['game_set', 'igdb_id']
 
 
 class GenreSchema(ModelSchema):
@@ -22,7 +22,7 @@ class GenreSchema(ModelSchema):
 
     class Config:
         model = Genre
-        exclude = ['game_set']
+        exclude = ['game_set', 'igdb_id']
 
 
 class KeywordSchema(ModelSchema):
@@ -33,7 +33,7 @@ class KeywordSchema(ModelSchema):
 
     class Config:
         model = Keyword
-        exclude = ['game_set']
+        exclude = ['game_set', 'igdb_id']
 
 
 class TagSchema(ModelSchema):
@@ -19,8 +19,8 @@ class ResponseSchema(BaseModel):
         fixed_filters = [
             FilterSchema(
                 field=k.split('__')[0],
-                type=k.split('__')[1].removeprefix('i') if k.split('__')[1] != 'isnull' else k.split('__')[1],
-                query=v
+                type=k.split('__')[1].removeprefix('i') if k.split('__')[1] not in ('isnull', 'in') else k.split('__')[1],
+                query=self.format_query(v)
             )
             for k, v in filters.items()]
         last_offset = max_count - (max_count % limit)
@@ -41,5 +41,24 @@ class ResponseSchema(BaseModel):
     def query_params(self, offset: int, limit: int) -> str:
         return f"offset={offset}&limit={limit}"
 
+    @classmethod
+    def format_query(cls, value: Any) -> str:
+        if isinstance(value, list):
+            return ','.join(cls.format_query(item) for item in value)
+        return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
     class Config:
         arbitrary_types_allowed = True
+
+
+class CursorResponseSchema(ResponseSchema):
+    """Response paginated with the cursor of the last item instead of an offset"""
+
+    def __init__(self, raw_query: str, data: List[Dict[str, Any]], route_name: str, limit: int, max_count: int, next_cursor: Optional[str]):
+        BaseModel.__init__(self, data=data)
+        base_url = f"http://127.0.0.1:8000/api/v1/{route_name}"
+
+        self.links = LinksSchema(first=f"{base_url}?{raw_query}limit={limit}")
+        if next_cursor:
+            self.links.next = f"{base_url}?{raw_query}limit={limit}&cursor={next_cursor}"
+        self.meta = MetaSchema(total_count=max_count, limit=limit)
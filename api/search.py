@@ -0,0 +1,91 @@
+import base64
+import json
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional, Tuple
+
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import F, FloatField, OuterRef, Q, QuerySet, Subquery
+from django.db.models.functions import Cast
+
+from api.models import AlternativeTitle, Game, LanguageTitle
+
+# Titles are indexed without stemming, they are names in many languages
+TITLE_CONFIG = 'simple'
+TEXT_CONFIG = 'english'
+
+_deferred = threading.local()
+
+
+def get_search_vector() -> SearchVector:
+    """Weighted search vector of a game: title, then alternative and localized titles, summary and story line"""
+    alternative_titles = (AlternativeTitle.objects.filter(game=OuterRef('pk')).order_by().values('game')
+                          .annotate(titles=StringAgg('title', ' ')).values('titles'))
+    localized_titles = (LanguageTitle.objects.filter(language_support__game=OuterRef('pk')).order_by()
+                        .values('language_support__game').annotate(titles=StringAgg('title', ' ')).values('titles'))
+    return (SearchVector('title', config=TITLE_CONFIG, weight='A')
+            + SearchVector(Subquery(alternative_titles), Subquery(localized_titles), config=TITLE_CONFIG, weight='B')
+            + SearchVector('summary', config=TEXT_CONFIG, weight='C')
+            + SearchVector('story_line', config=TEXT_CONFIG, weight='D'))
+
+
+def refresh_search_vectors(game_ids: Optional[Iterable[int]] = None) -> int:
+    """Store the search vector of the games, or queue it while the updates are deferred
+
+    Args:
+        game_ids (Optional[Iterable[int]], optional): games to refresh. Defaults to every game.
+
+    Returns:
+        int: games updated
+    """
+    pending = getattr(_deferred, 'game_ids', None)
+    if pending is not None and game_ids is not None:
+        pending.update(game_ids)
+        return 0
+    games = Game.objects.all() if game_ids is None else Game.objects.filter(pk__in=list(game_ids))
+    return games.update(search_vector=get_search_vector())
+
+
+@contextmanager
+def deferred_search_vectors() -> Iterator[None]:
+    """Refresh the search vectors of the games changed inside the block with one update when it exits"""
+    _deferred.game_ids = game_ids = set()
+    try:
+        yield
+    finally:
+        del _deferred.game_ids
+    if game_ids:
+        refresh_search_vectors(game_ids)
+
+
+def search_games(text: str) -> QuerySet:
+    """Games matching a web search, e.g. `zelda -"breath of the wild"`, with their relevance as `rank`"""
+    query = (SearchQuery(text, config=TITLE_CONFIG, search_type='websearch')
+             | SearchQuery(text, config=TEXT_CONFIG, search_type='websearch'))
+    return (Game.objects.filter(search_vector=query)
+            .annotate(rank=Cast(SearchRank(F('search_vector'), query), FloatField())))
+
+
+def get_search_page(games: QuerySet, limit: int, cursor: Optional[str] = None) -> Tuple[list, Optional[str]]:
+    """Page of the most relevant games after a cursor, seeking by rank and id instead of an offset
+
+    Args:
+        games (QuerySet): games annotated with their `rank`.
+        limit (int): games of the page.
+        cursor (Optional[str], optional): cursor of the last game of the previous page. Defaults to None.
+
+    Raises:
+        ValueError, TypeError: when the cursor is not valid.
+
+    Returns:
+        Tuple[list, Optional[str]]: games of the page and the cursor of the next one
+    """
+    if cursor:
+        rank, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        games = games.filter(Q(rank__lt=float(rank)) | Q(rank=float(rank), pk__gt=int(pk)))
+    page = list(games.order_by('-rank', 'pk')[:limit + 1])
+    if len(page) <= limit:
+        return page, None
+    last = page[limit - 1]
+    return page[:limit], base64.urlsafe_b64encode(json.dumps([last.rank, last.pk]).encode()).decode()
@@ -1 +1,5 @@
-from .base_router import BaseRouter
\ No newline at end of file
+from .autocomplete_router import AutocompleteRouter
+from .base_router import BaseRouter
+from .filters import ComparisonFilter, RelationFilter
+from .media_router import MediaRouter
+from .tag_filter import TagFilter
\ No newline at end of file
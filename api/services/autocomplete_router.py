@@ -0,0 +1,76 @@
+from dataclasses import asdict
+from http.client import responses
+from typing import Any, Optional
+
+from django.conf import settings
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import JSONResponse
+
+from api.autocomplete import AutocompleteIndex, Suggestion, get_autocomplete_index
+from api.schemas.autocomplete_schema import AutocompleteResponse
+from main.utils.exceptions import SearchException
+
+
+class AutocompleteQueryParams:
+    def __init__(
+        self,
+        q: str = Query(
+            min_length=1,
+            max_length=100,
+            description="Text typed by the user, matched against the start of every word of the titles and names."
+        ),
+        types: str = Query(
+            default=','.join(AutocompleteIndex.TYPES),
+            description=f"Types of the suggestions separated by commas ({', '.join(AutocompleteIndex.TYPES)})."
+        ),
+        limit: int = Query(
+            default=8,
+            ge=1,
+            le=20,
+            description="Max amount of suggestions."
+        ),
+    ):
+        self.q = q
+        self.types = [type_name.strip().lower() for type_name in types.split(',') if type_name.strip()]
+        self.limit = limit
+
+
+class AutocompleteRouter(APIRouter):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prefix = '/autocomplete'
+        self.tags = ['Autocomplete']
+        self.add_event_handler('startup', lambda: get_autocomplete_index().warm())
+
+        self._add_routes()
+
+    def _add_routes(self):
+        """Add routes"""
+        self.add_api_route(
+            path="",
+            status_code=200,
+            endpoint=self.get_suggestions,
+            name='Autocomplete',
+            description='Endpoint to get the games, genres, keywords and platforms starting with the typed text.',
+            response_model=AutocompleteResponse,
+            methods=["GET"],
+        )
+
+    def get_suggestions(self, request: Request, params: AutocompleteQueryParams = Depends()) -> Any:
+        for type_name in params.types:
+            if type_name not in AutocompleteIndex.TYPES:
+                raise SearchException(code=2, value=type_name)
+        suggestions = get_autocomplete_index().search(params.q, params.types, params.limit)
+        return JSONResponse(content={
+            'message': responses[200],
+            'result': {'data': [
+                {**asdict(suggestion), 'cover': self.get_cover_url(request, suggestion)} for suggestion in suggestions
+            ]},
+        })
+
+    def get_cover_url(self, request: Request, suggestion: Suggestion) -> Optional[str]:
+        """Thumbnail of the cover resized by the media route, on the host the request was sent to"""
+        if suggestion.cover is None:
+            return None
+        url = request.url_for('Get Image', kind='covers', image_id=suggestion.cover)
+        return f'{url}?w={settings.AUTOCOMPLETE_THUMB_WIDTH}'
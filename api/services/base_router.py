@@ -1,9 +1,14 @@
+import hashlib
 import re
+import time
 from http.client import responses
 from operator import attrgetter
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from django.core.exceptions import FieldError
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, FieldError
+from django.db.models import Count, F, QuerySet
 from django.utils.html import escape
 from fastapi import APIRouter, Depends, Query, Request
 from fastapi.encoders import jsonable_encoder
@@ -11,7 +16,10 @@ from fastapi.responses import JSONResponse
 
 from api.schemas import PaginatedResponse, ResponseSchema
 from api.schemas.exception_schema import BadRequestSchema, ForbiddenSchema, NotFoundSchema, ValidationErrorSchema
+from main.db_router import replica_reads
 from main.utils.exceptions import FilterException, LimitException, OffsetException, SlugException, SortException
+
+from .filters import ComparisonFilter, RelationFilter
 from utils import String
 
 example_field = "?filters[field]"
@@ -94,6 +102,13 @@ class BaseRouter(APIRouter):
     path_slug = r"/{slug:str}"
     description_root = None
     description_slug = None
+    # Extra query params of the root route, documented and kept in the pagination links
+    root_parameters: List[Dict[str, Any]] = []
+    link_params: Tuple[str, ...] = ()
+    # Dotted paths of the related fields accepted as filter keys, e.g. `genres.slug`
+    relation_filters: Tuple[str, ...] = ()
+    # Facets of the `facets` query param: field of the value and field of the label of each facet
+    facet_fields: Dict[str, Tuple[str, str]] = {}
     custom_responses = {
         400: {'model': BadRequestSchema},
         403: {'model': ForbiddenSchema},
@@ -116,6 +131,12 @@ class BaseRouter(APIRouter):
 
         self._add_routes()
 
+    def add_api_route(self, path: str, endpoint: Any, **kwargs: Any) -> None:
+        """Add a route, serving the reads of the GET routes from the read replicas"""
+        if kwargs.get('methods') == ['GET']:
+            endpoint = replica_reads()(endpoint)
+        super().add_api_route(path, endpoint, **kwargs)
+
     def _add_routes(self):
         """Add routes"""
         self.add_api_route(
@@ -127,6 +148,7 @@ class BaseRouter(APIRouter):
             response_model=PaginatedResponse,
             response_model_exclude_none=True,
             methods=["GET"],
+            openapi_extra={'parameters': self.root_parameters} if self.root_parameters else None,
         )
 
         self.add_api_route(
@@ -166,29 +188,87 @@ class BaseRouter(APIRouter):
         sort_sanitized = self.sanitize_sort(sort)
         self.validate_limit(limit)
         self.validate_offset(offset)
+        facet_names = self.get_facet_names(request)
 
         try:
-            ordered_and_filtered = self.model.objects.all().filter(**filters).order_by(sort_sanitized)
+            relation_filters = {k: v for k, v in filters.items() if '.' in k}
+            fields_filters = {k: v for k, v in filters.items() if k not in relation_filters}
+            queryset = self.model.objects.filter(*RelationFilter(self.model, relation_filters).get_conditions(), **fields_filters)
+            filtered = self.filter_queryset(request, queryset)
+            ordered_and_filtered = filtered.order_by(sort_sanitized)
             query = ordered_and_filtered[offset: offset + limit]
-            count = ordered_and_filtered.count()
-            raw_filters = f'filters[{filter_items[0][0]}]={filter_items[0][1]}&' if filter_items else ''
+            count, facets = self.get_count_and_facets(filtered, self.get_filtered_key(request, filters), facet_names)
+            raw_filters = ''.join(f'filters[{k}]={v}&' for k, v in filter_items)
+            raw_filters += ''.join(f'{k}={v}&' for k, v in request.query_params.multi_items() if k in self.link_params)
             result = ResponseSchema(raw_filters=raw_filters, data=self.schema.from_django(query, many=True),
                                     route_name=f'{self.model_name.lower()}s', offset=offset, limit=limit, max_count=count, **filters)
+            result.meta.facets = facets
             response = PaginatedResponse(message=responses[200], result=result)
             return JSONResponse(content=jsonable_encoder(response.dict()))
         except FieldError as e:
             self.handle_sort_exception(e)
 
-    def _filtering_data(self, filter_items: List, filters: Dict[str, str]):
-        filter_keys, filter_value = filter_items[0]
-        filter_list = self._check_filter_list_length(filter_keys)
+    def filter_queryset(self, request: Request, queryset: QuerySet) -> QuerySet:
+        """Hook to filter the items of the root route with the extra query params"""
+        return queryset
+
+    def get_facet_names(self, request: Request) -> List[str]:
+        """Facets of the `facets` query param
+
+        Raises:
+            FilterException: when a facet is not one of facet_fields.
+        """
+        names = [name.strip() for name in request.query_params.get('facets', '').split(',') if name.strip()]
+        for name in names:
+            if name not in self.facet_fields:
+                raise FilterException(code=5, key=name, model=self.model_name, choices=self.facet_fields)
+        return names
+
+    def get_filtered_key(self, request: Request, filters: Dict[str, Any]) -> str:
+        """Hash of the parsed filters and of the extra query params, the same for every page of a filtered set"""
+        extra_params = sorted((k, v) for k, v in request.query_params.multi_items() if k in self.link_params and k != 'facets')
+        return hashlib.sha1(repr((sorted(filters.items()), extra_params)).encode()).hexdigest()
+
+    def get_count_and_facets(
+        self, queryset: QuerySet, filtered_key: str, names: List[str]
+    ) -> Tuple[int, Optional[Dict[str, List[Dict[str, Any]]]]]:
+        """Count of the filtered items and counts per value of the facets, one grouped query per facet
+
+        With facets, the count and the facets are cached together per filtered set for FACETS_CACHE_TTL
+        seconds, so the pages of the same filters share them.
+        """
+        if not names:
+            return queryset.count(), None
 
-        for filter_key in filter_list:
-            filter_key, is_nullable = self._set_isnull_filter(filters, filter_key)
-            self._check_filter_key(filter_key)
-            self._check_filter_key_exists(filter_key.lower())
-            if is_nullable:
-                self._set_filter(filters, filter_key, filter_value)
+        key = f'facets:{self.model._meta.label_lower}:{filtered_key}'
+        entry = cache.get(key) or {'count': queryset.count(), 'facets': {}, 'expires_at': time.time() + settings.FACETS_CACHE_TTL}
+        missing = [name for name in names if name not in entry['facets']]
+        for name in missing:
+            value, label = self.facet_fields[name]
+            counts = (queryset.order_by().filter(**{f'{value}__isnull': False})
+                      .values(value=F(value), label=F(label)).annotate(count=Count('pk', distinct=True))
+                      .order_by('-count', 'label'))
+            entry['facets'][name] = list(counts[:settings.FACETS_MAX_VALUES])
+        if missing:
+            # Adding facets keeps the expiry of the count
+            cache.set(key, entry, max(entry['expires_at'] - time.time(), 1))
+        return entry['count'], {name: entry['facets'][name] for name in names}
+
+    def _filtering_data(self, filter_items: List, filters: Dict[str, Any]):
+        for filter_keys, filter_value in filter_items:
+            filter_list = self._check_filter_list_length(filter_keys)
+
+            for filter_key in filter_list:
+                # Paths of relations are matched against the lowercase names of relation_filters
+                filter_key = filter_key.lower() if '.' in filter_key else filter_key
+                filter_key, is_nullable = self._set_isnull_filter(filters, filter_key)
+                self._check_filter_key(filter_key)
+                self._check_filter_key_exists(filter_key.lower())
+                if is_nullable and ComparisonFilter.is_comparison(filter_value):
+                    field = self._get_filter_field(filter_key)
+                    filters.update(ComparisonFilter(field, filter_value).get_lookups(filter_key))
+                elif is_nullable:
+                    self._set_filter(filters, filter_key, filter_value)
 
     def _check_filter_key(self, filter_key: str):
         if not filter_key:
@@ -201,8 +281,29 @@ class BaseRouter(APIRouter):
         return filter_list
 
     def _check_filter_key_exists(self, filter_key_lower: str):
-        if not hasattr(self.model, filter_key_lower):
+        if '.' in filter_key_lower:
+            if filter_key_lower not in self.relation_filters:
+                raise FilterException(code=8, key=filter_key_lower, model=self.model_name, choices=self.relation_filters)
+        elif not hasattr(self.model, filter_key_lower):
             raise FilterException(code=0, key=filter_key_lower, model=self.model_name)
+        else:
+            self._check_filter_key_is_column(filter_key_lower)
+
+    def _check_filter_key_is_column(self, filter_key_lower: str):
+        """Reject the related items and the many-to-many fields, a join on them repeats the filtered items"""
+        try:
+            field = self.model._meta.get_field(filter_key_lower)
+        except FieldDoesNotExist:
+            return
+        if field.one_to_many or field.many_to_many or not field.concrete:
+            choices = [path for path in self.relation_filters if path.startswith(f'{filter_key_lower}.')]
+            raise FilterException(code=9, key=filter_key_lower, model=self.model_name, choices=choices)
+
+    def _get_filter_field(self, filter_key: str):
+        try:
+            return RelationFilter.get_field(self.model, filter_key)
+        except FieldDoesNotExist:
+            raise FilterException(code=0, key=filter_key, model=self.model_name)
 
     def _set_filter(self, filters: Dict[str, Any], filter_key: str, filter_value: str):
         stripped_filter_value = filter_value.strip('*')
@@ -0,0 +1,150 @@
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple, Type
+
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from main.utils.exceptions import FilterException
+
+# Dates compared as a period: a year, a month or a day
+PERIOD_FORMATS = (
+    (re.compile(r'^\d{4}$'), '%Y'),
+    (re.compile(r'^\d{4}-\d{2}$'), '%Y-%m'),
+    (re.compile(r'^\d{4}-\d{2}-\d{2}$'), '%Y-%m-%d'),
+)
+
+
+class ComparisonFilter:
+    """Typed comparison of a field, e.g. `gte:2015`, `between:2015,2020-06` or `in:1,2,3`
+
+    The values are parsed and validated by the model field. Dates may be a year, a month or a
+    day and match the whole period with a half-open range on the column, e.g. `lte:2020` is
+    `< 2021-01-01`, so the predicates are served by the index of the field.
+
+    Args:
+        field (models.Field): compared field of the model.
+        expression (str): operator followed by the value, or by values separated by commas.
+    """
+    OPERATORS = ('gt', 'gte', 'lt', 'lte', 'between', 'in')
+    OPERATOR_RE = re.compile(rf'^({"|".join(OPERATORS)}):')
+    ORDERED_FIELDS = (models.DateField, models.IntegerField, models.FloatField, models.DecimalField)
+
+    def __init__(self, field: models.Field, expression: str):
+        self.field = field
+        self.expression = expression
+        self.operator, _, values = expression.partition(':')
+        self.values = [value.strip() for value in values.split(',')]
+        if self.operator not in self.get_operators(field):
+            raise FilterException(code=6, key=field.name, choices=self.get_operators(field))
+        if self.operator != 'in' and len(self.values) != (2 if self.operator == 'between' else 1):
+            raise FilterException(code=7, key=f'{field.name}={expression}')
+
+    @classmethod
+    def is_comparison(cls, expression: str) -> bool:
+        return bool(cls.OPERATOR_RE.match(expression))
+
+    def get_lookups(self, path: str) -> Dict[str, Any]:
+        """Lookups of the comparison on the field at the path
+
+        Raises:
+            FilterException: when a value is not valid for the field.
+        """
+        if self.operator == 'in':
+            return {f'{path}__in': [self.parse(value) for value in self.values]}
+        if self.operator == 'between':
+            start, end = self.values
+            return {**self.get_lookups_of('gte', path, start), **self.get_lookups_of('lte', path, end)}
+        return self.get_lookups_of(self.operator, path, self.values[0])
+
+    def get_lookups_of(self, operator: str, path: str, value: str) -> Dict[str, Any]:
+        start, end, closed = self.get_period(value)
+        if operator in ('gte', 'lt'):
+            return {f'{path}__{operator}': start}
+        if closed:
+            return {f'{path}__{operator}': end}
+        return {f'{path}__{"gte" if operator == "gt" else "lt"}': end}
+
+    def get_period(self, value: str) -> Tuple[Any, Any, bool]:
+        """Start, end and whether the end is included of the values matched by a value"""
+        if isinstance(self.field, models.DateField):
+            for pattern, date_format in PERIOD_FORMATS:
+                if pattern.match(value):
+                    try:
+                        start = datetime.strptime(value, date_format)
+                    except ValueError:
+                        raise FilterException(code=7, key=f'{self.field.name}={self.expression}')
+                    end = self.get_period_end(start, date_format)
+                    if isinstance(self.field, models.DateTimeField):
+                        return timezone.make_aware(start), timezone.make_aware(end), False
+                    return start.date(), end.date(), False
+        value = self.parse(value)
+        return value, value, True
+
+    def get_period_end(self, start: datetime, date_format: str) -> datetime:
+        if date_format == '%Y':
+            return start.replace(year=start.year + 1)
+        if date_format == '%Y-%m':
+            return start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+        return start + timedelta(days=1)
+
+    def parse(self, value: str) -> Any:
+        try:
+            parsed = self.field.to_python(value)
+            if not self.field.is_relation:
+                self.field.validate(parsed, None)
+        except ValidationError:
+            raise FilterException(code=7, key=f'{self.field.name}={self.expression}')
+        if isinstance(parsed, datetime) and timezone.is_naive(parsed):
+            return timezone.make_aware(parsed)
+        return parsed
+
+    @classmethod
+    def get_operators(cls, field: models.Field) -> Tuple[str, ...]:
+        """Operators supported by the field, only `in` when its values are not ordered"""
+        return cls.OPERATORS if isinstance(field, cls.ORDERED_FIELDS) else ('in',)
+
+
+class RelationFilter:
+    """Filters on fields of the related items, e.g. `genres.slug` or `release_platforms.platform.name`
+
+    The filters of each relation are compiled to one correlated EXISTS subquery instead of a join,
+    so an item with many matching related rows is counted and paginated once, and the filters of
+    the same relation must match the same related row.
+
+    Args:
+        model (Type[models.Model]): filtered model.
+        filters (Dict[str, Any]): lookups keyed by dotted path and lookup, e.g. `genres.slug__iexact`.
+    """
+
+    def __init__(self, model: Type[models.Model], filters: Dict[str, Any]):
+        self.model = model
+        self.relations: Dict[str, Dict[str, Any]] = {}
+        for key, value in filters.items():
+            path, _, lookup = key.partition('__')
+            relation, _, field_path = path.partition('.')
+            self.relations.setdefault(relation, {})[f'{field_path.replace(".", "__")}__{lookup}'] = value
+
+    @staticmethod
+    def get_field(model: Type[models.Model], path: str) -> models.Field:
+        """Field at the end of a dotted path of relations
+
+        Raises:
+            FieldDoesNotExist: when a name of the path is not a field of its model.
+        """
+        *relations, name = path.split('.')
+        for relation in relations:
+            model = model._meta.get_field(relation).related_model
+        return model._meta.get_field(name)
+
+    def get_conditions(self) -> List[Exists]:
+        """One EXISTS subquery per relation, correlated with the filtered item"""
+        conditions = []
+        for relation, lookups in self.relations.items():
+            field = self.model._meta.get_field(relation)
+            outer_name = field.field.name if field.auto_created and not field.concrete else field.related_query_name()
+            related = field.related_model.objects.filter(**{outer_name: OuterRef('pk')}, **lookups)
+            conditions.append(Exists(related.order_by()))
+        return conditions
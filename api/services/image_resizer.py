@@ -0,0 +1,119 @@
+import hashlib
+import os
+import pathlib
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import suppress
+from typing import Dict, Optional
+
+from PIL import Image
+
+from api.images import EXTENSIONS, partial_file
+
+
+def resize_image(source: str, target: str, width: int, quality: int, fmt: str) -> str:
+    """Resize an image keeping its aspect ratio, run in the worker processes
+
+    The image is never upscaled and the result is written to a temporary file renamed once complete.
+
+    Args:
+        source (str): path of the original image.
+        target (str): path of the resized image.
+        width (int): width of the resized image.
+        quality (int): encoder quality.
+        fmt (str): format of the resized image.
+
+    Returns:
+        str: path of the resized image
+    """
+    with Image.open(source) as original:
+        image = original.convert('RGBA' if original.mode in ('RGBA', 'LA', 'P') and fmt != 'jpeg' else 'RGB')
+    if width < image.width:
+        image = image.resize((width, max(1, round(image.height * width / image.width))), Image.Resampling.LANCZOS)
+
+    with partial_file(os.path.dirname(target)) as (handle, tmp_path):
+        with handle:
+            image.save(handle, format=fmt.upper(), quality=quality)
+        os.replace(tmp_path, target)
+    return target
+
+
+class ImageResizer:
+    """Resize images on demand in a process pool, keeping the results in a size-capped disk cache
+
+    Identical requests resized at the same time share one job, and once the cache goes over
+    its size the least recently used files are evicted.
+
+    Args:
+        directory (str): directory of the cache.
+        max_size (int): max bytes stored in the cache.
+        processes (Optional[int], optional): worker processes, one per CPU when None. Defaults to None.
+    """
+
+    def __init__(self, directory: str, max_size: int, processes: Optional[int] = None):
+        self.directory = pathlib.Path(directory)
+        self.max_size = max_size
+        self.processes = processes
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._jobs: Dict[str, Future] = {}
+        self._lock = threading.RLock()
+        self._size: Optional[int] = None
+
+    def get(self, source: pathlib.Path, width: int, quality: int, fmt: str) -> pathlib.Path:
+        """Path of the resized image, resizing it when it is not cached
+
+        Args:
+            source (pathlib.Path): path of the original image, its name changes with its content.
+            width (int): width of the resized image.
+            quality (int): encoder quality.
+            fmt (str): format of the resized image.
+
+        Returns:
+            pathlib.Path: path of the resized image in the cache
+        """
+        key = hashlib.sha256(f'{source}:{width}:{quality}:{fmt}'.encode()).hexdigest()
+        path = self.directory.joinpath(key[:2], f'{key}.{EXTENSIONS[fmt]}')
+        with suppress(FileNotFoundError):
+            os.utime(path)
+            return path
+
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                job = self._jobs[key] = self.executor.submit(resize_image, str(source), str(path), width, quality, fmt)
+                job.add_done_callback(lambda _: self._finished(key, path))
+        job.result()
+        return path
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.processes)
+        return self._executor
+
+    def _finished(self, key: str, path: pathlib.Path):
+        with self._lock:
+            self._jobs.pop(key, None)
+            if self._size is None:
+                self._size = sum(file.stat().st_size for file in self.directory.glob('*/[!.]*') if file.is_file())
+            elif path.exists():
+                self._size += path.stat().st_size
+            if self._size > self.max_size:
+                self.evict()
+
+    def evict(self):
+        """Remove the least recently used files until the cache is under 90% of its size"""
+        files = sorted((file.stat().st_mtime, file.stat().st_size, file) for file in self.directory.glob('*/[!.]*')
+                       if file.is_file())
+        self._size = sum(size for _, size, _ in files)
+        for _, size, file in files:
+            if self._size <= self.max_size * 0.9:
+                break
+            with suppress(FileNotFoundError):
+                file.unlink()
+            self._size -= size
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
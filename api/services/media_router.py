@@ -0,0 +1,90 @@
+from enum import Enum
+from typing import Any, Optional
+
+from django.conf import settings
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import FileResponse, Response
+
+from api.images import EXTENSIONS, IMAGE_MODELS, supported_formats
+from api.models.image_model import ImageBase
+from main.utils.exceptions import MediaException
+
+from .image_resizer import ImageResizer
+
+
+class MediaKind(str, Enum):
+    covers = 'covers'
+    localecovers = 'localecovers'
+    thumbnails = 'thumbnails'
+
+
+class MediaQueryParams:
+    def __init__(
+        self,
+        w: Optional[int] = Query(
+            default=None,
+            ge=1,
+            le=settings.IMAGE_RESIZE_MAX_WIDTH,
+            description="Width of the image, the original width is kept when it is smaller."
+        ),
+        q: int = Query(
+            default=80,
+            ge=1,
+            le=100,
+            description="Quality of the image."
+        ),
+        fmt: str = Query(
+            default='jpeg',
+            description=f"Format of the image ({', '.join(EXTENSIONS)})."
+        ),
+    ):
+        self.w = w
+        self.q = q
+        self.fmt = fmt.lower()
+
+
+class MediaRouter(APIRouter):
+    models = {MediaKind(f'{model.__name__.lower()}s'): model for model in IMAGE_MODELS}
+    cache_control = 'public, max-age=31536000, immutable'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prefix = '/media'
+        self.tags = ['Media']
+        self.resizer = ImageResizer(settings.IMAGE_RESIZE_CACHE_DIR, settings.IMAGE_RESIZE_CACHE_MAX_SIZE,
+                                    processes=settings.IMAGE_RESIZE_PROCESSES or None)
+        self.formats = supported_formats()
+
+        self._add_routes()
+
+    def _add_routes(self):
+        """Add routes"""
+        self.add_api_route(
+            path="/{kind}/{image_id}",
+            status_code=200,
+            endpoint=self.get_image,
+            name='Get Image',
+            description='Endpoint to get a cover or thumbnail resized to a width, quality and format.',
+            response_class=FileResponse,
+            methods=["GET"],
+        )
+
+    def get_image(self, kind: MediaKind, image_id: int, request: Request, params: MediaQueryParams = Depends()) -> Any:
+        if params.fmt not in self.formats:
+            raise MediaException(code=1, value=params.fmt)
+        image: Optional[ImageBase] = (self.models[kind].objects.filter(pk=image_id, state=ImageBase.State.READY)
+                                      .select_related('blob').first())
+        if image is None or not image.file_path.exists():
+            raise MediaException(code=0, value=f'{kind.value}/{image_id}')
+
+        width = min(params.w or image.width, image.width)
+        try:
+            path = self.resizer.get(image.file_path, width, params.q, params.fmt)
+        except (OSError, ValueError):
+            raise MediaException(code=2, value=f'{kind.value}/{image_id}')
+
+        etag = f'"{path.stem}"'
+        headers = {'Cache-Control': self.cache_control, 'ETag': etag}
+        if request.headers.get('if-none-match') == etag:
+            return Response(status_code=304, headers=headers)
+        return FileResponse(path, media_type=f'image/{params.fmt}', headers=headers)
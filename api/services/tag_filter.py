@@ -0,0 +1,58 @@
+from typing import Dict, List
+
+from django.db.models import Q
+
+from api.models import Tag
+from api.signals import TAGGED_RELATIONS
+from main.utils.exceptions import FilterException
+
+
+class TagFilter:
+    """Filter the games by their tags with the GIN index of `Game.tag_values`
+
+    Every expression is a mode, `all`, `any` or `none`, followed by tags separated by commas,
+    e.g. `all:role-playing-rpg,fantasy` or `none:horror`. A tag is its value or the slug of a
+    genre, keyword or theme, matching the tags of every type with that slug.
+
+    Args:
+        expressions (List[str]): expressions of the `tags` query params.
+    """
+    MODES = ('all', 'any', 'none')
+
+    def __init__(self, expressions: List[str]):
+        self.groups: Dict[str, List[str]] = {mode: [] for mode in self.MODES}
+        for expression in expressions:
+            mode, _, tags = expression.partition(':')
+            tags = [tag.strip() for tag in tags.split(',') if tag.strip()]
+            if mode not in self.groups or not tags:
+                raise FilterException(code=3, key=expression)
+            self.groups[mode] += tags
+
+    def get_query(self) -> Q:
+        """Query of the games matching every expression"""
+        values = self.resolve({tag for tags in self.groups.values() for tag in tags})
+        required = [values[tag][0] for tag in self.groups['all'] if len(values[tag]) == 1]
+        query = Q(tag_values__contains=required) if required else Q()
+        for tag in self.groups['all']:
+            if len(values[tag]) > 1:
+                query &= Q(tag_values__overlap=values[tag])
+        if self.groups['any']:
+            query &= Q(tag_values__overlap=[value for tag in self.groups['any'] for value in values[tag]])
+        if self.groups['none']:
+            query &= ~Q(tag_values__overlap=[value for tag in self.groups['none'] for value in values[tag]])
+        return query
+
+    def resolve(self, tags: set) -> Dict[str, List[int]]:
+        """Values of the tags, querying the slugs once per tagged model
+
+        Raises:
+            FilterException: when a slug is not found.
+        """
+        values = {tag: [int(tag)] for tag in tags if tag.isdigit()}
+        if slugs := tags - values.keys():
+            for model, type_id in TAGGED_RELATIONS.values():
+                for slug, pk in model.objects.filter(slug__in=slugs).values_list('slug', 'pk'):
+                    values.setdefault(slug, []).append(Tag.pack(type_id, pk))
+        if missing := tags - values.keys():
+            raise FilterException(code=4, key=', '.join(sorted(missing)))
+        return values
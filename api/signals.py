@@ -0,0 +1,126 @@
+from contextlib import suppress
+from functools import partial
+from typing import Iterable, Optional, Set, Type
+
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from api.autocomplete import get_autocomplete_index
+from api.models import (AlternativeTitle, Cover, Game, Genre, Keyword, LanguageSupport, LanguageTitle, Platform, Tag,
+                        Theme)
+from api.search import refresh_search_vectors
+
+TAGGED_RELATIONS = {
+    'genres': (Genre, Tag.Type.GENRE),
+    'keywords': (Keyword, Tag.Type.KEYWORD),
+    'themes': (Theme, Tag.Type.THEME),
+}
+SEARCH_FIELDS = {'title', 'summary', 'story_line'}
+
+
+def get_tags(type_id: int, endpoint_ids: Iterable[int]) -> Set[int]:
+    """Ids of the shared tags of the endpoints, inserting the missing ones in bulk
+
+    Args:
+        type_id (int): type of the tags.
+        endpoint_ids (Iterable[int]): ids of the genres, keywords or themes.
+
+    Returns:
+        Set[int]: ids of the tags
+    """
+    tags = [Tag(type_id=type_id, endpoint_id=pk, value=Tag.pack(type_id, pk)) for pk in endpoint_ids]
+    Tag.objects.bulk_create(tags, ignore_conflicts=True)
+    return set(Tag.objects.filter(value__in=[tag.value for tag in tags]).values_list('id', flat=True))
+
+
+def update_tags(sender: Type[models.Model], instance: models.Model, action: str, reverse: bool,
+                pk_set: Set[int], type_id: int, **kwargs):
+    """Keep the tags of the games in sync with one of their tagged relations"""
+    through = Game.tags.through
+    game_ids = pk_set if reverse else {instance.pk}
+    if action == 'post_add' and pk_set:
+        if reverse:
+            rows = [(game_id, tag_id) for tag_id in get_tags(type_id, [instance.pk]) for game_id in pk_set]
+        else:
+            rows = [(instance.pk, tag_id) for tag_id in get_tags(type_id, pk_set)]
+        through.objects.bulk_create([through(game_id=game_id, tag_id=tag_id) for game_id, tag_id in rows],
+                                    ignore_conflicts=True)
+    elif action == 'post_remove' and pk_set:
+        if reverse:
+            through.objects.filter(game_id__in=pk_set, tag__value=Tag.pack(type_id, instance.pk)).delete()
+        else:
+            values = [Tag.pack(type_id, pk) for pk in pk_set]
+            through.objects.filter(game_id=instance.pk, tag__value__in=values).delete()
+    elif action == 'post_clear':
+        if reverse:
+            game_tags = through.objects.filter(tag__value=Tag.pack(type_id, instance.pk))
+            game_ids = set(game_tags.values_list('game_id', flat=True))
+            game_tags.delete()
+        else:
+            through.objects.filter(game_id=instance.pk, tag__type_id=type_id).delete()
+    else:
+        return
+    refresh_tag_values(game_ids)
+
+
+def delete_tag(sender: Type[models.Model], instance: models.Model, type_id: int, **kwargs):
+    """Remove the tag of a deleted genre, keyword or theme"""
+    tags = Tag.objects.filter(value=Tag.pack(type_id, instance.pk))
+    game_ids = set(Game.tags.through.objects.filter(tag__in=tags).values_list('game_id', flat=True))
+    tags.delete()
+    refresh_tag_values(game_ids)
+
+
+def refresh_tag_values(game_ids: Optional[Iterable[int]] = None) -> int:
+    """Copy the sorted tag values of the games to their `tag_values` index
+
+    Args:
+        game_ids (Optional[Iterable[int]], optional): games to refresh. Defaults to every game.
+
+    Returns:
+        int: games updated
+    """
+    values = (Game.tags.through.objects.filter(game_id=OuterRef('pk')).order_by().values('game_id')
+              .annotate(values=ArrayAgg('tag__value', ordering='tag__value')).values('values'))
+    games = Game.objects.all() if game_ids is None else Game.objects.filter(pk__in=list(game_ids))
+    return games.update(tag_values=Coalesce(Subquery(values), Value([]), output_field=Game.tag_values.field))
+
+
+def update_game_search(sender: Type[models.Model], instance: Game, update_fields=None, **kwargs):
+    """Refresh the search vector of a saved game when its searched fields may have changed"""
+    if update_fields is None or SEARCH_FIELDS & set(update_fields):
+        refresh_search_vectors([instance.pk])
+
+
+def update_title_search(sender: Type[models.Model], instance: models.Model, **kwargs):
+    """Refresh the search vector of the game of a saved or deleted alternative or localized title"""
+    if isinstance(instance, AlternativeTitle):
+        refresh_search_vectors([instance.game_id])
+    else:
+        with suppress(LanguageSupport.DoesNotExist):
+            refresh_search_vectors([instance.language_support.game_id])
+
+
+def invalidate_autocomplete(sender: Type[models.Model], **kwargs):
+    """Rebuild the autocomplete indexes after a change of the suggested models"""
+    get_autocomplete_index().invalidate()
+
+
+def connect_signals():
+    for model in (Game, Genre, Keyword, Platform, Cover):
+        uid = f'api.autocomplete.{model._meta.model_name}'
+        post_save.connect(invalidate_autocomplete, sender=model, dispatch_uid=uid)
+        post_delete.connect(invalidate_autocomplete, sender=model, dispatch_uid=uid)
+    post_save.connect(update_game_search, sender=Game, dispatch_uid='api.search.game')
+    for model in (AlternativeTitle, LanguageTitle):
+        uid = f'api.search.{model._meta.model_name}'
+        post_save.connect(update_title_search, sender=model, dispatch_uid=uid)
+        post_delete.connect(update_title_search, sender=model, dispatch_uid=uid)
+    for field_name, (model, type_id) in TAGGED_RELATIONS.items():
+        uid = f'api.tags.{field_name}'
+        m2m_changed.connect(partial(update_tags, type_id=type_id), sender=getattr(Game, field_name).through,
+                            weak=False, dispatch_uid=uid)
+        post_delete.connect(partial(delete_tag, type_id=type_id), sender=model, weak=False, dispatch_uid=uid)
@@ -0,0 +1,58 @@
+import asyncio
+import json
+from unittest import mock
+
+from django.conf import settings
+from django.test import TestCase
+from fastapi import FastAPI
+from starlette.requests import Request
+
+from api.autocomplete import AutocompleteIndex, get_autocomplete_index
+from api.endpoints import autocomplete_router
+from api.models import Cover, Game, Genre
+from api.services.autocomplete_router import AutocompleteQueryParams
+from main.services import api_router
+
+
+class AutocompleteTest(TestCase):
+    def test_suggests_by_word_prefix(self):
+        for title in ('The Legend of Zelda', 'Zelda II', 'Pokémon Red'):
+            Game.objects.create(title=title, type=Game.Type.MAINGAME, status=Game.Status.RELEASED)
+        Genre.objects.create(name='Zelda-like')
+        index = AutocompleteIndex(ttl=60)
+
+        self.assertEqual([s.title for s in index.search('zel', index.TYPES, 10)],
+                         ['Zelda II', 'Zelda-like', 'The Legend of Zelda'])
+        self.assertEqual([s.title for s in index.search('legend of ze', ['game'], 10)], ['The Legend of Zelda'])
+        self.assertEqual([s.slug for s in index.search('POKEMON', ['game'], 10)], ['pokémon-red'])
+        self.assertEqual(len(index.search('zel', index.TYPES, 1)), 1)
+        self.assertEqual(index.search('zel', ['keyword'], 10), [])
+
+    def test_catalog_changes_invalidate_the_index(self):
+        index = get_autocomplete_index()
+        index.stale = False
+        Genre.objects.create(name='Puzzle')
+        self.assertTrue(index.stale)
+
+    def test_cover_urls_follow_the_request_host(self):
+        cover = Cover.objects.create(filename='zelda', url='https://images.igdb.com/t_thumb/zelda.png')
+        Cover.objects.filter(pk=cover.pk).update(state=Cover.State.READY)
+        Game.objects.create(title='Zelda', cover=cover, type=Game.Type.MAINGAME, status=Game.Status.RELEASED)
+        Game.objects.create(title='Zelda II', type=Game.Type.MAINGAME, status=Game.Status.RELEASED)
+        get_autocomplete_index().invalidate()
+        app = FastAPI()
+        app.include_router(api_router, prefix=settings.API_V1_STR)
+        request = Request({'type': 'http', 'scheme': 'https', 'server': ('natket.com', 443), 'path': '/',
+                           'root_path': '', 'headers': [(b'host', b'natket.com')], 'router': app.router})
+        params = AutocompleteQueryParams(q='zel', types='game', limit=8)
+
+        response = autocomplete_router.get_suggestions(request, params)
+        covers = {s['title']: s['cover'] for s in json.loads(response.body)['result']['data']}
+        self.assertEqual(covers, {
+            'Zelda': f'https://natket.com{settings.API_V1_STR}/media/covers/{cover.pk}'
+                     f'?w={settings.AUTOCOMPLETE_THUMB_WIDTH}',
+            'Zelda II': None,
+        })
+        with mock.patch.object(AutocompleteIndex, 'warm') as warm:
+            asyncio.run(app.router.startup())
+        warm.assert_called_once_with()
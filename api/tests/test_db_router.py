@@ -0,0 +1,50 @@
+import threading
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.db import connections
+from django.db.utils import OperationalError
+from django.test import TestCase, override_settings
+
+from api.models import Game
+from main.db_router import ReplicaRouter, replica_reads, use_primary
+
+
+@skipUnless(settings.DB_REPLICAS, 'DB_REPLICAS is not configured')
+class ReplicaRouterTest(TestCase):
+    databases = '__all__'
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def test_routes_the_api_reads_to_the_replicas(self):
+        self.assertEqual(self.router.db_for_read(Game), 'default')
+        with replica_reads():
+            self.assertEqual([self.router.db_for_read(Game) for _ in self.router.replicas * 2], self.router.replicas * 2)
+            with use_primary():
+                self.assertEqual(self.router.db_for_read(Game), 'default')
+        self.assertEqual(self.router.db_for_write(Game), 'default')
+
+    @override_settings(DB_READ_YOUR_WRITES_WINDOW=60)
+    def test_reads_stay_on_the_primary_after_a_write(self):
+        with replica_reads():
+            self.assertIn(self.router.db_for_read(Game), self.router.replicas)
+            self.router.db_for_write(Game)
+            self.assertEqual(self.router.db_for_read(Game), 'default')
+            with replica_reads():
+                self.assertIn(self.router.db_for_read(Game), self.router.replicas)
+            reads = []
+            other_request = threading.Thread(target=replica_reads()(lambda: reads.append(self.router.db_for_read(Game))))
+            other_request.start()
+            other_request.join()
+            self.assertEqual(len(reads), 1)
+            self.assertIn(reads[0], self.router.replicas)
+            self.assertEqual(self.router.db_for_read(Game), 'default')
+
+    @override_settings(DB_REPLICA_CHECK_INTERVAL=0)
+    def test_skips_the_unavailable_replicas(self):
+        down = self.router.replicas[0]
+        with replica_reads():
+            with mock.patch.object(connections[down], 'cursor', side_effect=OperationalError('down')):
+                self.assertNotIn(down, [self.router.db_for_read(Game) for _ in self.router.replicas * 2])
+            self.assertIn(down, [self.router.db_for_read(Game) for _ in self.router.replicas * 2])
@@ -0,0 +1,44 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from starlette.requests import Request
+
+from api.endpoints import game_router
+from api.models import Game, Genre
+from main.utils.exceptions import FilterException
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class FacetsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.games = [Game.objects.create(title=f'Game {i}', type=Game.Type.MAINGAME if i else Game.Type.DLC,
+                                          status=Game.Status.RELEASED) for i in range(3)]
+        action, puzzle = Genre.objects.create(name='Action'), Genre.objects.create(name='Puzzle')
+        self.games[0].genres.add(action, puzzle)
+        self.games[1].genres.add(action)
+
+    def get_facets(self, facets, **filters):
+        request = Request({'type': 'http', 'query_string': f'facets={facets}'.encode(), 'headers': []})
+        names = game_router.get_facet_names(request)
+        filtered_key = game_router.get_filtered_key(request, filters)
+        return game_router.get_count_and_facets(Game.objects.filter(**filters), filtered_key, names)
+
+    def test_counts_the_filtered_games(self):
+        with self.assertNumQueries(3):
+            count, facets = self.get_facets('genres,type')
+        self.assertEqual(count, 3)
+        self.assertEqual(facets['genres'], [{'value': 'action', 'label': 'Action', 'count': 2},
+                                            {'value': 'puzzle', 'label': 'Puzzle', 'count': 1}])
+        self.assertEqual(facets['type'], [{'value': 'MainGame', 'label': 'MainGame', 'count': 2},
+                                          {'value': 'DLC', 'label': 'DLC', 'count': 1}])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_facets('genres'), (3, {'genres': facets['genres']}))
+        with self.assertNumQueries(3):
+            self.assertEqual(self.get_facets('status,genres', title='Game 1'), (1, {
+                'status': [{'value': 'Released', 'label': 'Released', 'count': 1}],
+                'genres': [{'value': 'action', 'label': 'Action', 'count': 1}],
+            }))
+        self.assertEqual(self.get_facets('genres', pk__in=[]), (0, {'genres': []}))
+        self.assertEqual(self.get_facets('', title='Game 1'), (1, None))
+        with self.assertRaises(FilterException):
+            self.get_facets('genres,missing')
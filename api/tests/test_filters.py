@@ -0,0 +1,83 @@
+import json
+from datetime import datetime, timezone
+
+from django.test import TestCase
+from starlette.requests import Request
+
+from api.endpoints import game_router
+from api.models import Game, Genre, Multiplayer, Platform, ReleasePlatform
+from api.services import ComparisonFilter, RelationFilter
+from api.services.base_router import RootQueryParams
+from main.utils.exceptions import FilterException
+
+
+class ComparisonFilterTest(TestCase):
+    def lookups(self, model, name, expression):
+        return ComparisonFilter(model._meta.get_field(name), expression).get_lookups(name)
+
+    def test_compares_typed_values(self):
+        for year in (2014, 2015, 2020, 2021):
+            Game.objects.create(title=f'Game {year}', type=Game.Type.MAINGAME, status=Game.Status.RELEASED,
+                                first_release=datetime(year, 6, 1, tzinfo=timezone.utc))
+
+        def titles(expression):
+            games = Game.objects.filter(**self.lookups(Game, 'first_release', expression))
+            return list(games.values_list('title', flat=True))
+
+        self.assertEqual(titles('between:2015,2020'), ['Game 2015', 'Game 2020'])
+        self.assertEqual(titles('lte:2015-06'), ['Game 2014', 'Game 2015'])
+        self.assertEqual(titles('gt:2020'), ['Game 2021'])
+        self.assertEqual(titles('lt:2015-06-01T00:00:00'), ['Game 2014'])
+        self.assertEqual(self.lookups(Multiplayer, 'online_players', 'gte:8'), {'online_players__gte': 8})
+        self.assertEqual(self.lookups(Game, 'type', 'in:MainGame,DLC'), {'type__in': ['MainGame', 'DLC']})
+
+    def test_rejects_invalid_comparisons(self):
+        for name, expression in (('title', 'gte:b'), ('type', 'in:Unknown'), ('first_release', 'between:2015'),
+                                 ('first_release', 'gt:2015-13'), ('online_players', 'gt:many')):
+            model = Multiplayer if name == 'online_players' else Game
+            with self.assertRaises(FilterException):
+                self.lookups(model, name, expression)
+
+    def test_rejects_relations_as_filter_fields(self):
+        games = [Game.objects.create(title=f'Game {i}', type=Game.Type.MAINGAME, status=Game.Status.RELEASED)
+                 for i in range(2)]
+        games[0].genres.add(Genre.objects.create(name='Action'), Genre.objects.create(name='Puzzle'))
+
+        def count(query_string):
+            request = Request({'type': 'http', 'query_string': query_string.encode(), 'headers': []})
+            response = game_router.get_items(request, RootQueryParams(filters=None, offset=0, limit=10, sort=None))
+            return json.loads(response.body)['result']['meta']['total_count']
+
+        for query_string in ('filters[genres]=in:1,2', 'filters[genres]=action', 'filters[release_platforms]=in:1',
+                             'filters[collection]=in:1', 'filters[!alternative_titles]'):
+            with self.subTest(query_string), self.assertRaises(FilterException) as error:
+                count(query_string)
+            self.assertEqual(error.exception.status_code, 400)
+        self.assertEqual(count('filters[genres.slug]=in:action,puzzle'), 1)
+        self.assertEqual(count(f'filters[id]=in:{games[0].pk},{games[1].pk}'), 2)
+
+
+class RelationFilterTest(TestCase):
+    def test_filters_related_fields_with_exists(self):
+        switch = Platform.objects.create(name='Switch', type=Platform.Type.CONSOLE)
+        rpg = Genre.objects.create(name='RPG')
+        games = [Game.objects.create(title=f'Game {i}', type=Game.Type.MAINGAME, status=Game.Status.RELEASED)
+                 for i in range(3)]
+        for game in games[:2]:
+            game.genres.add(rpg)
+        for region in (ReleasePlatform.Regions.EUROPE, ReleasePlatform.Regions.NORTH_AMERICA):
+            ReleasePlatform.objects.create(game=games[0], platform=switch, region=region,
+                                           release_date=datetime(2018, 1, 1, tzinfo=timezone.utc))
+        ReleasePlatform.objects.create(game=games[2], platform=switch, region=ReleasePlatform.Regions.JAPAN)
+
+        def titles(filters):
+            conditions = RelationFilter(Game, filters).get_conditions()
+            return list(Game.objects.filter(*conditions).values_list('title', flat=True))
+
+        self.assertEqual(titles({'genres.slug__iexact': 'rpg', 'release_platforms.platform.name__iexact': 'switch'}),
+                         ['Game 0'])
+        self.assertEqual(titles({'release_platforms.platform.name__iexact': 'switch'}), ['Game 0', 'Game 2'])
+        self.assertEqual(titles({'release_platforms.region__iexact': 'JP',
+                                 'release_platforms.release_date__isnull': False}), [])
+        self.assertEqual(RelationFilter.get_field(Game, 'release_platforms.multiplayer_modes.online_players'),
+                         Multiplayer._meta.get_field('online_players'))
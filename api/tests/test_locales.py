@@ -0,0 +1,25 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from api.locales import get_locale_table
+from api.models import Language
+
+
+class LocaleTableTest(TestCase):
+    def test_resolves_languages_offline(self):
+        locales = get_locale_table()
+        self.assertIs(locales, get_locale_table())
+        self.assertEqual(locales.find('Spanish').locale, 'es-ES')
+        self.assertEqual(locales.find('español').locale, 'es-ES')
+        self.assertEqual(locales.find('Klingon').language, 'tlh')
+        self.assertEqual(locales.describe('pt-BR').name, 'Portuguese (Brazil)')
+        with self.assertRaises(LookupError):
+            locales.find('Zzqx')
+
+    def test_language_save_fills_locale_names(self):
+        with mock.patch('requests.get') as get:
+            language = Language(native_name=None)
+            language.save(language='Japanese title')
+        get.assert_not_called()
+        self.assertEqual((language.locale, language.name, language.native_name), ('ja-JP', 'Japanese (Japan)', '日本語 (日本)'))
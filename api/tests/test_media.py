@@ -0,0 +1,43 @@
+import hashlib
+import io
+import tempfile
+
+from django.test import TestCase, override_settings
+from PIL import Image
+from starlette.requests import Request
+
+from api.models import Cover, ImageBlob
+from api.services import MediaRouter
+from api.services.media_router import MediaKind, MediaQueryParams
+from api_populators.tests import StaticRootMixin
+from main.utils.exceptions import MediaException
+
+
+class MediaRouterTest(StaticRootMixin, TestCase):
+    def create_cover(self, filename: str, width: int) -> Cover:
+        content = io.BytesIO()
+        Image.new('RGB', (width, 10)).save(content, format='PNG')
+        content = content.getvalue()
+        blob = ImageBlob.objects.create(hash=hashlib.sha256(content).hexdigest(), ext='.png', size=len(content))
+        blob.path.parent.mkdir(parents=True, exist_ok=True)
+        blob.path.write_bytes(content)
+        cover = Cover.objects.create(filename=filename, url=f'https://images.igdb.com/t_thumb/{filename}.png')
+        Cover.objects.filter(pk=cover.pk).update(state=Cover.State.READY, blob=blob, width=width, height=10)
+        return cover
+
+    def test_gets_the_image_by_id_when_filenames_repeat(self):
+        first, second = self.create_cover('game', 12), self.create_cover('game', 20)
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        with override_settings(IMAGE_RESIZE_CACHE_DIR=cache_dir.name, IMAGE_RESIZE_PROCESSES=1):
+            router = MediaRouter()
+        self.addCleanup(router.resizer.close)
+        request = Request({'type': 'http', 'headers': []})
+        params = MediaQueryParams(w=None, q=80, fmt='jpeg')
+
+        for cover, width in ((first, 12), (second, 20)):
+            response = router.get_image(MediaKind.covers, cover.pk, request, params)
+            with Image.open(response.path) as image:
+                self.assertEqual(image.size, (width, 10))
+        with self.assertRaises(MediaException):
+            router.get_image(MediaKind.thumbnails, first.pk, request, params)
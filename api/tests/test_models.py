@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+from django.test import TestCase
+
+from api.models import AgeRating, Game, AlternativeTitle
+
+
+class GameTestCase(TestCase):
+    def setUp(self):
+        self.age_rating = AgeRating.objects.create(
+            organization=AgeRating.Organizations.ESRB,
+            rating='M'
+        )
+        self.game = Game.objects.create(
+            title='Testing',
+            type=Game.Type.MAINGAME,
+            status=Game.Status.RELEASED,
+            first_release=datetime.now(timezone.utc)
+        )
+        self.game.age_ratings.add(self.age_rating)
+        self.alt_name1 = AlternativeTitle.objects.create(
+            title='Test',
+            type='Spanish title',
+            game=self.game
+        )
+        self.alt_name2 = AlternativeTitle.objects.create(
+            title='Test2',
+            type='Portuguese title',
+            game=self.game
+        )
+
+    def test_age_rating_org(self):
+        """ Age Rating Organization can be show correctly """
+        esrb = AgeRating.objects.get(organization=AgeRating.Organizations.ESRB)
+        self.assertEqual(
+            esrb.organization,
+            "ESRB"
+        )
+
+    def test_game(self):
+        game = Game.objects.get(title='Testing')
+        title = game.title
+        slug = game.slug
+        game_type = game.type
+        age_ratings = list(game.age_ratings.all())
+        alt_names = game.alternative_titles.all()
+        self.assertEqual(
+            title,
+            "Testing"
+        )
+        self.assertEqual(
+            slug,
+            "testing"
+        )
+        self.assertEqual(
+            game_type,
+            Game.Type.MAINGAME
+        )
+        self.assertEqual(
+            age_ratings,
+            [self.age_rating]
+        )
+        self.assertQuerysetEqual(
+            alt_names,
+            [self.alt_name1, self.alt_name2],
+            ordered=False
+        )
+        self.assertEqual(
+            self.alt_name2.type,
+            "Portuguese"
+        )
@@ -0,0 +1,36 @@
+from django.test import TestCase
+
+from api.models import AlternativeTitle, Game
+from api.search import deferred_search_vectors, get_search_page, search_games
+
+
+class SearchTest(TestCase):
+    def setUp(self):
+        self.games = [Game.objects.create(title=f'Legend {i}', type=Game.Type.MAINGAME, status=Game.Status.RELEASED)
+                      for i in range(5)]
+
+    def test_vectors_follow_the_titles(self):
+        game = self.games[0]
+        AlternativeTitle.objects.create(title='Densetsu', type='Japanese title', game=game)
+        self.assertEqual(list(search_games('densetsu')), [game])
+        game.summary = 'A hero runs through dungeons'
+        game.save()
+        self.assertEqual(list(search_games('running dungeon')), [game])
+        with deferred_search_vectors(), self.assertNumQueries(2):
+            AlternativeTitle.objects.create(title='Mythos', type='German title', game=self.games[1])
+            self.assertEqual(list(search_games('mythos')), [])
+        self.assertEqual(list(search_games('mythos')), [self.games[1]])
+
+    def test_pages_with_a_cursor(self):
+        AlternativeTitle.objects.create(title='Legend', type='Remaster title', game=self.games[3])
+        games, pages, cursor = search_games('legend'), [], None
+        while True:
+            page, cursor = get_search_page(games, 2, cursor)
+            pages.append([game.title for game in page])
+            if cursor is None:
+                break
+        self.assertEqual(pages[0][0], 'Legend 3')
+        self.assertEqual(sorted(sum(pages, [])), [game.title for game in self.games])
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        with self.assertRaises(ValueError):
+            get_search_page(games, 2, 'not-a-cursor')
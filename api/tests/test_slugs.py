@@ -0,0 +1,76 @@
+import threading
+import time
+from unittest import mock
+
+from django.db import connection, transaction
+from django.test import TransactionTestCase
+
+from api.models import Genre, Keyword, Theme
+from api.models.object_imagefield import allocate_slugs, lock_slugs
+
+
+class SlugAllocatorTest(TransactionTestCase):
+    def test_allocates_a_batch_in_one_query(self):
+        Genre.objects.create(name='Action')
+        Genre.objects.create(name='Action')
+        self.assertEqual(Genre.objects.create(name='Action').slug, 'action--2')
+        with self.assertNumQueries(2):
+            slugs = allocate_slugs(Genre, ['action', 'puzzle', 'action', 'puzzle', 'action--1'])
+        self.assertEqual(slugs, ['action--3', 'puzzle', 'action--4', 'puzzle--1', 'action--1--1'])
+
+    def test_concurrent_batches_never_share_a_slug(self):
+        barrier = threading.Barrier(4)
+
+        def insert():
+            barrier.wait()
+            with transaction.atomic():
+                slugs = allocate_slugs(Genre, ['racing'] * 5)
+                Genre.objects.bulk_create([Genre(name='Racing', slug=slug) for slug in slugs])
+            connection.close()
+
+        threads = [threading.Thread(target=insert) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(Genre.objects.filter(name='Racing').count(), 20)
+
+    def run_concurrently(self, *targets):
+        barrier, errors = threading.Barrier(len(targets)), []
+
+        def run(target):
+            barrier.wait()
+            try:
+                target()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=run, args=(target,)) for target in targets]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def test_concurrent_saves_never_share_a_slug(self):
+        self.run_concurrently(*[lambda: Genre.objects.create(name='Racing')] * 4)
+        self.assertEqual(sorted(Genre.objects.values_list('slug', flat=True)),
+                         ['racing', 'racing--1', 'racing--2', 'racing--3'])
+
+    def test_retries_a_slug_taken_without_its_lock(self):
+        Genre.objects.create(name='Action', slug='action')
+        with mock.patch('api.models.object_imagefield.unique_slugify', side_effect=['action', 'action--1']):
+            self.assertEqual(Genre.objects.create(name='Action').slug, 'action--1')
+
+    def test_locking_the_slugs_first_avoids_deadlocks_between_models(self):
+        def allocate(*models):
+            with transaction.atomic():
+                lock_slugs((model, 'rpg') for model in models)
+                for model in models:
+                    model.objects.create(name='RPG', slug=allocate_slugs(model, ['rpg'])[0])
+                    time.sleep(0.2)
+
+        self.run_concurrently(lambda: allocate(Genre, Keyword, Theme), lambda: allocate(Theme, Keyword, Genre))
+        self.assertEqual(sorted(Genre.objects.values_list('slug', flat=True)), ['rpg', 'rpg--1'])
@@ -0,0 +1,73 @@
+import io
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from api.models import Game, Genre, Tag, Theme
+from api.services import TagFilter
+from main.utils.exceptions import FilterException
+
+
+class TagsTest(TestCase):
+    def setUp(self):
+        self.games = [Game.objects.create(title=f'Game {i}', type=Game.Type.MAINGAME, status=Game.Status.RELEASED)
+                      for i in range(2)]
+        self.action, self.puzzle = Genre.objects.create(name='Action'), Genre.objects.create(name='Puzzle')
+        self.space = Theme.objects.create(name='Space')
+
+    def tag_values(self, game):
+        return sorted(game.tags.values_list('value', flat=True))
+
+    def test_tags_follow_the_relations(self):
+        game, other = self.games
+        game.genres.add(self.action, self.puzzle)
+        game.themes.add(self.space)
+        self.action.game_set.add(other)
+        self.assertEqual(Tag.objects.count(), 3)
+        self.assertEqual(self.tag_values(game), sorted([
+            Tag.pack(Tag.Type.GENRE, self.action.pk), Tag.pack(Tag.Type.GENRE, self.puzzle.pk),
+            Tag.pack(Tag.Type.THEME, self.space.pk)
+        ]))
+        self.assertEqual(self.tag_values(other), [Tag.pack(Tag.Type.GENRE, self.action.pk)])
+
+        game.genres.remove(self.puzzle)
+        self.assertNotIn(Tag.pack(Tag.Type.GENRE, self.puzzle.pk), self.tag_values(game))
+        game.themes.clear()
+        self.action.game_set.clear()
+        self.assertEqual(self.tag_values(game), [])
+        self.assertEqual(self.tag_values(other), [])
+
+        self.space.delete()
+        self.assertFalse(Tag.objects.filter(type_id=Tag.Type.THEME).exists())
+
+    def test_rebuild_recomputes_every_tag(self):
+        game, other = self.games
+        game.genres.add(self.action)
+        Game.genres.through.objects.create(game=other, genre=self.puzzle)
+        Game.genres.through.objects.filter(game=game).delete()
+        Tag.objects.create(type_id=Tag.Type.KEYWORD, endpoint_id=999)
+
+        call_command('rebuild_tags', stdout=io.StringIO())
+        self.assertEqual(self.tag_values(game), [])
+        self.assertEqual(self.tag_values(other), [Tag.pack(Tag.Type.GENRE, self.puzzle.pk)])
+        self.assertFalse(Tag.objects.filter(type_id=Tag.Type.KEYWORD).exists())
+        self.assertEqual(Game.objects.get(pk=other.pk).tag_values, [Tag.pack(Tag.Type.GENRE, self.puzzle.pk)])
+
+    def test_filters_games_by_tags(self):
+        game, other = self.games
+        game.genres.add(self.action)
+        game.themes.add(self.space)
+        other.genres.add(self.action, self.puzzle)
+        self.assertEqual(Game.objects.get(pk=game.pk).tag_values, self.tag_values(game))
+
+        def titles(*expressions):
+            return list(Game.objects.filter(TagFilter(list(expressions)).get_query()).values_list('title', flat=True))
+
+        self.assertEqual(titles('all:action'), ['Game 0', 'Game 1'])
+        self.assertEqual(titles('all:action', 'none:space'), ['Game 1'])
+        self.assertEqual(titles(f'any:space,{Tag.pack(Tag.Type.GENRE, self.puzzle.pk)}'), ['Game 0', 'Game 1'])
+        self.assertEqual(titles('all:action,puzzle,space'), [])
+        with self.assertRaises(FilterException):
+            titles('all:missing')
+        with self.assertRaises(FilterException):
+            titles('some:action')
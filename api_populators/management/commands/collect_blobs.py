@@ -0,0 +1,106 @@
+import os
+import pathlib
+import time
+from contextlib import suppress
+from datetime import timedelta
+from typing import Dict, List
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from api.images import RunStats
+from api.models import ImageBlob
+from api.models.image_model import ImageBase
+
+
+class Command(BaseCommand):
+    """Remove the image blobs that are not referenced by any image, with their resized variants
+
+    The reference counts are recounted first, so the images deleted since they were
+    downloaded are accounted. Files younger than --min-age are kept to not race with a download.
+    The rows are deleted before the files, locked so a blob referenced again in between keeps
+    its row, and only the files of the deleted rows are removed.
+
+    Args:
+        BaseCommand(Type): Parent of the class
+    """
+    BATCH_SIZE = 1000
+
+    def add_arguments(self, parser):
+        parser.add_argument('--min-age', type=int, default=60 * 60, help='Seconds a blob is kept before collected')
+        parser.add_argument('--dry-run', action='store_true', help='Report the blobs without removing them')
+
+    def handle(self, *args, **options):
+        self.dry_run = options['dry_run']
+        self.min_age = options['min_age']
+        stats = RunStats('recounted', 'blobs', 'files', 'bytes')
+        stats['recounted'] = self.recount()
+
+        created_before = timezone.now() - timedelta(seconds=self.min_age)
+        unreferenced = ImageBlob.objects.filter(ref_count=0, created_at__lt=created_before).order_by('pk')
+        last_pk = 0
+        while batch := list(unreferenced.filter(pk__gt=last_pk).values_list('pk', flat=True)[:self.BATCH_SIZE]):
+            last_pk = batch[-1]
+            for blob in self.delete_unreferenced(batch):
+                stats['bytes'] += blob.size
+                self.remove(blob.path)
+                for variant in pathlib.Path(settings.STATIC_ROOT).joinpath(blob.variants_folder).glob(f'{blob.hash}-*'):
+                    self.remove(variant)
+                stats['blobs'] += 1
+
+        stats['files'] = self.remove_orphan_files()
+        print(f'{"Would collect" if self.dry_run else "Collected"}: {stats}')
+
+    def delete_unreferenced(self, pks: List[int]) -> List[ImageBlob]:
+        """Delete the blobs of the batch still unreferenced, skipping the ones locked by a new reference
+
+        Returns:
+            List[ImageBlob]: deleted blobs, or the ones that would be deleted in a dry run
+        """
+        if self.dry_run:
+            return list(ImageBlob.objects.filter(pk__in=pks, ref_count=0))
+        with transaction.atomic():
+            blobs = list(ImageBlob.objects.select_for_update(skip_locked=True).filter(pk__in=pks, ref_count=0))
+            ImageBlob.objects.filter(pk__in=[blob.pk for blob in blobs]).delete()
+        return blobs
+
+    def recount(self) -> int:
+        """Set the reference count of every blob to the images pointing to it"""
+        references = (ImageBase.objects.filter(blob=OuterRef('hash')).order_by().values('blob')
+                      .annotate(count=Count('pk')).values('count'))
+        return ImageBlob.objects.update(ref_count=Coalesce(Subquery(references), 0))
+
+    def remove_orphan_files(self) -> int:
+        """Remove the files of the blob folders without a blob row and the temporary files left by a download"""
+        root = pathlib.Path(settings.STATIC_ROOT).joinpath('blobs')
+        removed = 0
+        modified_before = time.time() - self.min_age
+        files: Dict[str, pathlib.Path] = {}
+        for directory, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = pathlib.Path(directory, filename)
+                if path.stat().st_mtime >= modified_before:
+                    continue
+                if filename.endswith('.part'):
+                    removed += self.remove(path)
+                    continue
+                files[path.name.split('.')[0]] = path
+                if len(files) >= self.BATCH_SIZE:
+                    removed += self.remove_unknown(files)
+        return removed + self.remove_unknown(files)
+
+    def remove_unknown(self, files: Dict[str, pathlib.Path]) -> int:
+        known = set(ImageBlob.objects.filter(hash__in=list(files)).values_list('hash', flat=True))
+        orphans: List[pathlib.Path] = [path for content_hash, path in files.items() if content_hash not in known]
+        files.clear()
+        return sum(self.remove(path) for path in orphans)
+
+    def remove(self, path: pathlib.Path) -> int:
+        if not self.dry_run:
+            with suppress(FileNotFoundError):
+                path.unlink()
+        return 1
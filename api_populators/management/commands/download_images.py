@@ -0,0 +1,56 @@
+from typing import Iterable, Optional, Type
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.images import IMAGE_MODELS_BY_NAME, RunStats
+from api.models.image_model import ImageBase
+from api_populators.services import ImageDownloader
+
+
+def download_pending_images(models: Optional[Iterable[Type[ImageBase]]] = None,
+                            max_workers: Optional[int] = None) -> RunStats:
+    """Download the pending images with the limits of the settings
+
+    Args:
+        models (Optional[Iterable[Type[ImageBase]]], optional): image models to download. Defaults to all.
+        max_workers (Optional[int], optional): images downloaded at the same time. Defaults to None.
+
+    Returns:
+        RunStats: counters of the run
+    """
+    downloader = ImageDownloader(
+        max_workers=max_workers or settings.IMAGE_DOWNLOAD_WORKERS,
+        per_host=settings.IMAGE_DOWNLOAD_PER_HOST,
+        timeout=(5, settings.IMAGE_DOWNLOAD_TIMEOUT),
+        max_retries=settings.IMAGE_DOWNLOAD_MAX_RETRIES,
+        batch_size=settings.IMAGE_DOWNLOAD_BATCH_SIZE,
+    )
+    try:
+        return downloader.run(models)
+    finally:
+        downloader.close()
+
+
+class Command(BaseCommand):
+    """Download the images saved as pending by the populator
+
+    Args:
+        BaseCommand(Type): Parent of the class
+    """
+    MODELS = IMAGE_MODELS_BY_NAME
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', action='append', choices=list(self.MODELS),
+                            help='Image model to download, all of them by default')
+        parser.add_argument('--workers', type=int, default=settings.IMAGE_DOWNLOAD_WORKERS,
+                            help='Images downloaded at the same time')
+        parser.add_argument('--retry-failed', action='store_true', help='Queue again the images that failed')
+
+    def handle(self, *args, **options):
+        models = [self.MODELS[name] for name in options['model'] or self.MODELS]
+        if options['retry_failed']:
+            for model in models:
+                model.objects.filter(state=ImageBase.State.FAILED).update(state=ImageBase.State.PENDING)
+        stats = download_pending_images(models, max_workers=options['workers'])
+        print(f'Image download stats: {stats}')
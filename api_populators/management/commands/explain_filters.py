@@ -0,0 +1,95 @@
+import json
+from typing import Dict, Iterator, List, Tuple
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import QuerySet
+
+from api.models import Game, Genre, Keyword, PlayerPerspective, Theme
+from api.services import ComparisonFilter, RelationFilter
+
+# Lookups of the wildcard filters of BaseRouter: *query*, query*, *query and query
+LOOKUPS = ('icontains', 'istartswith', 'iendswith', 'iexact')
+SORTS = {
+    Game: ('title', '-title', 'first_release', '-first_release', 'created_at', '-created_at', 'updated_at',
+           '-updated_at'),
+}
+
+
+class Command(BaseCommand):
+    """Run EXPLAIN on the canonical filter and sort combinations of the API and fail on full scans
+
+    Sequential scans are disabled for the session, so the planner only falls back to one on the
+    filtered table when no index can serve the query. It may also walk a whole B-tree index of
+    the table and filter every row instead, so a filtered query also fails on an index scan of
+    the table without an index condition. The filters run without the default ordering of the
+    models, which such an index scan could serve. The wildcard filters are skipped when the
+    pg_trgm extension is not installed.
+
+    Args:
+        BaseCommand(Type): Parent of the class
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plans', action='store_true', help='Print the plan of every query')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('EXPLAIN checks need PostgreSQL')
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            trigram = cursor.fetchone() is not None
+
+        failed, checked, skipped = [], 0, 0
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+            for label, queryset, needs_trigram in self.get_cases():
+                if needs_trigram and not trigram:
+                    skipped += 1
+                    continue
+                checked += 1
+                plan = json.loads(queryset.explain(format='json'))[0]['Plan']
+                if options['verbose_plans']:
+                    print(label, json.dumps(plan, indent=2))
+                if scans := self.get_full_scans(plan, queryset):
+                    failed.append(f"{label}: {scans[0]['Node Type']} on {scans[0]['Relation Name']}")
+            transaction.set_rollback(True)
+
+        print(f'Explained: checked={checked}, skipped={skipped}, failed={len(failed)}')
+        if failed:
+            raise CommandError('Full scans found:\n' + '\n'.join(failed))
+
+    def get_full_scans(self, plan: Dict, queryset: QuerySet) -> List[Dict]:
+        """Scans of the queried table reading every row, or every index entry when the query is filtered"""
+        full_scans = ('Seq Scan', 'Index Scan', 'Index Only Scan') if queryset.query.where else ('Seq Scan',)
+        return [node for node in self.walk(plan) if node['Node Type'] in full_scans and 'Index Cond' not in node
+                and node.get('Relation Name') == queryset.model._meta.db_table]
+
+    def get_cases(self) -> Iterator[Tuple[str, QuerySet, bool]]:
+        """Label, query and whether it needs pg_trgm for every canonical call of the routers"""
+        for model, field in ((Game, 'title'), (Genre, 'name'), (Keyword, 'name'), (PlayerPerspective, 'name'),
+                             (Theme, 'name')):
+            route = model.__name__.lower()
+            for lookup in LOOKUPS:
+                filtered = model.objects.filter(**{f'{field}__{lookup}': 'zelda'}).order_by()
+                yield f'{route}?filters[{field}]={lookup}', self.page(filtered), True
+            for sort in SORTS.get(model, (field, f'-{field}')):
+                yield f'{route}?sort={sort}', self.page(model.objects.order_by(sort)), False
+                filtered = model.objects.filter(**{f'{field}__icontains': 'zelda'}).order_by(sort)
+                yield f'{route}?filters[{field}]=icontains&sort={sort}', self.page(filtered), True
+
+        yield 'game?tags=all:...', self.page(Game.objects.filter(tag_values__contains=[1, 2]).order_by()), False
+        yield 'game?tags=any:...', self.page(Game.objects.filter(tag_values__overlap=[1, 2]).order_by()), False
+        released = ComparisonFilter(Game._meta.get_field('first_release'), 'between:2015,2020')
+        yield 'game?filters[first_release]=between:...', self.page(
+            Game.objects.filter(**released.get_lookups('first_release')).order_by('first_release')), False
+        on_platform = RelationFilter(Game, {'genres.slug__iexact': 'rpg', 'release_platforms.platform.name__iexact': 'switch'})
+        yield 'game?filters[genres.slug]=...&filters[release_platforms.platform.name]=...', self.page(
+            Game.objects.filter(*on_platform.get_conditions()).order_by()), False
+
+    def page(self, queryset: QuerySet) -> QuerySet:
+        return queryset[:10]
+
+    def walk(self, plan: Dict) -> List[Dict]:
+        return [plan] + [node for child in plan.get('Plans', []) for node in self.walk(child)]
@@ -1,16 +1,39 @@
 import sys
 from multiprocessing import Process
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
 import requests
+from django.db import connections
 
 from api.models import AgeRating, Language, Platform, SupportType
 from api_populators.models import PlatformType, Rating, RatingOrg
+from api_populators.services import CacheMissError, IGDBClient, ResponseCache
 from main import settings
 
 
+def claim_igdb_ids(model, field: str, natural_keys: Dict[int, Any]) -> int:
+    """Write the IGDB ids onto the rows seeded before they had one, found by their natural key
+
+    Args:
+        model (ModelType): model with a nullable unique `igdb_id`.
+        field (str): unique field of the rows seeded without IGDB id, like `name` or `slug`.
+        natural_keys (Dict[int, Any]): value of the field of each fetched row by IGDB id.
+
+    Returns:
+        int: number of rows that got their IGDB id
+    """
+    known = set(model.objects.filter(igdb_id__in=natural_keys).values_list('igdb_id', flat=True))
+    wanted = {key: igdb_id for igdb_id, key in natural_keys.items() if igdb_id not in known and key}
+    if not wanted:
+        return 0
+    rows = dict(model.objects.filter(igdb_id__isnull=True, **{f'{field}__in': wanted})
+                .order_by('-pk').values_list(field, 'pk'))
+    return sum(model.objects.filter(pk=pk, igdb_id__isnull=True).update(igdb_id=wanted[key])
+               for key, pk in rows.items())
+
+
 class IGDBAPI:
-    BASE_URL = 'https://api.igdb.com/v4'
+    BASE_URL = settings.IGDB_BASE_URL
     HEADERS = {
         'Client-ID': settings.TWITCH_CLIENT_ID,
         'Authorization': f'Bearer {settings.TWITCH_AUTH}',
@@ -57,16 +80,43 @@ class IGDBAPI:
         'websites.*'
     ]
 
-    def _post_request(self, endpoint: str, data: str = 'fields *; limit 500;') -> Optional[List[Dict]]:
-        response = requests.post(
-            f'{self.BASE_URL}/' + endpoint.removeprefix('/'),
-            data=data,
+    def __init__(self, client: Optional[IGDBClient] = None, cache: Optional[ResponseCache] = None, offline: bool = False):
+        """
+        Args:
+            client (IGDBClient, optional): HTTP client used for the requests. Defaults to None.
+            cache (ResponseCache, optional): cache of the responses. Defaults to None.
+            offline (bool, optional): replay the responses from the cache without requests. Defaults to False.
+        """
+        self.cache = cache
+        self.offline = offline
+        if offline and not cache:
+            raise ValueError('Offline mode requires a response cache')
+        self.client = client or IGDBClient(
+            self.BASE_URL,
             headers=self.HEADERS,
+            rate=settings.IGDB_REQUESTS_PER_SECOND,
+            max_concurrency=settings.IGDB_MAX_CONCURRENCY,
+            timeout=(5, settings.IGDB_TIMEOUT),
+            max_retries=settings.IGDB_MAX_RETRIES,
         )
+
+    def _post_request(self, endpoint: str, data: str = 'fields *; limit 500;') -> Optional[List[Dict]]:
+        if self.cache:
+            try:
+                return self.cache.get(endpoint, data, ignore_ttl=self.offline)
+            except CacheMissError:
+                if self.offline:
+                    raise
+
+        response = self.client.post(endpoint, data)
         if response.status_code != 200:
-            print(f'Request "{response.url}" failed with status code {response.status_code}: {response.text}')
-            sys.exit(1)
-        return response.json()
+            raise requests.HTTPError(
+                f'Request "{response.url}" failed with status code {response.status_code}: {response.text}', response=response)
+
+        result = response.json()
+        if self.cache:
+            self.cache.set(endpoint, data, result)
+        return result
 
     def fetch_games(self, offset: int = 0, limit: int = 100, ids: Optional[List[int]] = None) -> List[Dict]:
         """Fetch games from IGDB API
@@ -86,17 +136,31 @@ class IGDBAPI:
         return self._post_request('/games', data)
 
     @classmethod
-    def populate(cls):
-        igdb_api = IGDBAPI()
-        f1 = Process(target=igdb_api._populate_age_ratings())
-        f1.start()
-        f2 = Process(target=igdb_api._populate_languages())
-        f2.start()
-        f3 = Process(target=igdb_api._populate_platforms())
-        f3.start()
+    def populate(cls, cache: Optional[ResponseCache] = None, offline: bool = False):
+        igdb_api = IGDBAPI(cache=cache, offline=offline)
+        # the loaders run in child processes, each one must open its own database connection
+        connections.close_all()
+        loaders = [
+            Process(target=igdb_api._run_loader, args=(loader,))
+            for loader in ('_populate_age_ratings', '_populate_languages', '_populate_platforms')
+        ]
+        for loader in loaders:
+            loader.start()
+        for loader in loaders:
+            loader.join()
+
+        if any(loader.exitcode != 0 for loader in loaders):
+            print('Failed to populate the reference tables')
+            sys.exit(1)
 
         return igdb_api
 
+    def _run_loader(self, loader: str):
+        try:
+            getattr(self, loader)()
+        finally:
+            connections.close_all()
+
     def _populate_age_ratings(self):
         for age_rating in self._post_request('age_ratings'):
             rating = Rating(int(age_rating['rating'])).label
@@ -107,7 +171,9 @@ class IGDBAPI:
             )
 
     def _populate_platforms(self):
-        for platform in self._post_request('platforms'):
+        platforms = self._post_request('platforms')
+        claim_igdb_ids(Platform, 'name', {platform['id']: platform.get('name') for platform in platforms})
+        for platform in platforms:
             abbreviation = platform.get('abbreviation')
             alternative_name = platform.get('alternative_name')
             name = platform.get('name')
@@ -115,17 +181,27 @@ class IGDBAPI:
             if platform.get('category'):
                 platform_type = Platform.Type(PlatformType(int(platform['category'])).name)
 
-            Platform.objects.get_or_create(name=name, type=platform_type, abbreviation=abbreviation,
-                                           alternative_name=alternative_name)
+            Platform.objects.update_or_create(
+                igdb_id=platform['id'],
+                defaults={
+                    'name': name,
+                    'type': platform_type,
+                    'abbreviation': abbreviation,
+                    'alternative_name': alternative_name
+                }
+            )
 
         for support_type in SupportType.Enum.choices:
             SupportType.objects.get_or_create(name=support_type[1])
 
     def _populate_languages(self):
-        for language in self._post_request('languages'):
+        languages = self._post_request('languages')
+        claim_igdb_ids(Language, 'locale', {language['id']: language['locale'] for language in languages})
+        for language in languages:
             Language.objects.get_or_create(
-                locale=language['locale'],
+                igdb_id=language['id'],
                 defaults={
+                    'locale': language['locale'],
                     'name': language['name'],
                     'native_name': language['native_name']
                 }
@@ -0,0 +1,50 @@
+from typing import Iterable, Optional, Type
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.images import IMAGE_MODELS_BY_NAME, RunStats
+from api.models.image_model import ImageBase
+from api_populators.services import ImageDerivativeGenerator
+
+
+def generate_derivatives(models: Optional[Iterable[Type[ImageBase]]] = None, processes: Optional[int] = None,
+                         force: bool = False) -> RunStats:
+    """Generate the image variants with the sizes and formats of the settings
+
+    Args:
+        models (Optional[Iterable[Type[ImageBase]]], optional): image models to process. Defaults to all.
+        processes (Optional[int], optional): worker processes, one per CPU when None. Defaults to None.
+        force (bool, optional): generate again the images that already have variants. Defaults to False.
+
+    Returns:
+        RunStats: counters of the run
+    """
+    generator = ImageDerivativeGenerator(
+        widths=settings.IMAGE_VARIANT_WIDTHS,
+        formats=settings.IMAGE_VARIANT_FORMATS,
+        quality=settings.IMAGE_VARIANT_QUALITY,
+        processes=processes or settings.IMAGE_VARIANT_PROCESSES or None,
+    )
+    return generator.run(models, force=force)
+
+
+class Command(BaseCommand):
+    """Generate the resized variants of the downloaded images
+
+    Args:
+        BaseCommand(Type): Parent of the class
+    """
+    MODELS = IMAGE_MODELS_BY_NAME
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', action='append', choices=list(self.MODELS),
+                            help='Image model to process, all of them by default')
+        parser.add_argument('--processes', type=int, default=settings.IMAGE_VARIANT_PROCESSES,
+                            help='Worker processes used to resize the images, 0 uses one per CPU')
+        parser.add_argument('--force', action='store_true', help='Generate again the existing variants')
+
+    def handle(self, *args, **options):
+        models = [self.MODELS[name] for name in options['model'] or self.MODELS]
+        stats = generate_derivatives(models, processes=options['processes'], force=options['force'])
+        print(f'Image derivative stats: {stats}')
@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from api.models import Game, Tag
+from api.signals import TAGGED_RELATIONS, refresh_tag_values
+
+
+class Command(BaseCommand):
+    """Recompute the tags of the whole catalog from the genres, keywords and themes of the games
+
+    Every relation is rebuilt with a few set-based statements: the missing tags and game tags are
+    inserted from the relations, and the ones without a relation are deleted. The tag values of
+    every game are then copied to its index in one update.
+
+    Args:
+        BaseCommand(Type): Parent of the class
+    """
+
+    def handle(self, *args, **options):
+        stats = {'tags': 0, 'game_tags': 0, 'removed_tags': 0, 'removed_game_tags': 0}
+        with transaction.atomic():
+            for field_name, (model, type_id) in TAGGED_RELATIONS.items():
+                for key, count in self.rebuild(field_name, model, type_id).items():
+                    stats[key] += count
+            stats['games'] = refresh_tag_values()
+        print('Rebuilt tags: ' + ', '.join(f'{k}={v}' for k, v in stats.items()))
+
+    def rebuild(self, field_name, model, type_id):
+        """Rebuild the tags of one tagged relation
+
+        Args:
+            field_name (str): relation of the Game model.
+            model (Type[RelatedBase]): model of the relation.
+            type_id (int): type of the tags of the relation.
+
+        Returns:
+            Dict[str, int]: rows inserted and deleted
+        """
+        relation = getattr(Game, field_name).through
+        relation_column = relation._meta.get_field(model._meta.model_name).column
+        game_tags = Game.tags.through
+        tags = Tag.objects.filter(type_id=type_id)
+        stale = tags.exclude(endpoint_id__in=model.objects.values('pk'))
+        removed_tags = stale.delete()[1].get(Tag._meta.label, 0)
+
+        offset = Tag.pack(type_id, 0)
+        with connection.cursor() as cursor:
+            now = timezone.now()
+            cursor.execute(
+                f'INSERT INTO {Tag._meta.db_table} (created_at, updated_at, type_id, endpoint_id, value) '
+                f'SELECT %s, %s, %s, id, %s + id FROM {model._meta.db_table} ON CONFLICT (value) DO NOTHING',
+                [now, now, type_id, offset]
+            )
+            inserted_tags = cursor.rowcount
+            cursor.execute(
+                f'INSERT INTO {game_tags._meta.db_table} (game_id, tag_id) '
+                f'SELECT relation.game_id, tag.id FROM {relation._meta.db_table} relation '
+                f'JOIN {Tag._meta.db_table} tag ON tag.value = %s + relation.{relation_column} '
+                f'ON CONFLICT DO NOTHING',
+                [offset]
+            )
+            inserted_game_tags = cursor.rowcount
+
+        related = relation.objects.filter(game_id=OuterRef('game_id'),
+                                          **{f'{model._meta.model_name}_id': OuterRef('tag__endpoint_id')})
+        removed_game_tags, _ = game_tags.objects.filter(tag__type_id=type_id).exclude(Exists(related)).delete()
+        return {'tags': inserted_tags, 'game_tags': inserted_game_tags, 'removed_tags': removed_tags,
+                'removed_game_tags': removed_game_tags}
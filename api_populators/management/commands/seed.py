@@ -1,15 +1,20 @@
 import contextlib
 import json
+import multiprocessing
+import multiprocessing.pool
+import multiprocessing.util
+import random
 import time
 from concurrent import futures
-from difflib import SequenceMatcher
-from typing import Any, Dict, List, Optional
+from functools import cached_property, partial
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+import requests
+from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.db.models import Q
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
 from django.db.utils import OperationalError
 from django.utils.text import slugify
-from langcodes import Language as Lang
 
 from api.models import (AgeRating, AlternativeTitle, Collection, Cover, Game,
                         GameMode, GameVideo, Genre, Keyword, Language,
@@ -17,16 +22,75 @@ from api.models import (AgeRating, AlternativeTitle, Collection, Cover, Game,
                         Multiplayer, Platform, PlayerPerspective,
                         ReleasePlatform, SupportType, Theme, Thumbnail,
                         Website)
+from api.locales import get_locale_table
+from api.search import deferred_search_vectors
+from api.models.object_imagefield import allocate_slugs, lock_slugs
 from api_populators.models import (Categories, Link, PlatformType, Rating,
                                    RatingOrg, Regions, Status)
+from api_populators.services import CacheMissError, ResponseCache, SeedPipeline, SeedReport, TitleMatcher
 
-from .fetch import IGDBAPI
+from .download_images import download_pending_images
+from .generate_derivatives import generate_derivatives
+from .fetch import IGDBAPI, claim_igdb_ids
 
 
-class IGDBPopulator:
+class ChunkExecutor(futures.ThreadPoolExecutor):
+    """Thread pool whose threads keep their database connection across chunks, closed on shutdown
+
+    Args:
+        max_workers (int): threads writing chunks concurrently.
+    """
+
+    def __init__(self, max_workers: int):
+        self.worker_connections = []
+        super().__init__(max_workers=max_workers, initializer=self._track_connection)
+
+    def _track_connection(self):
+        self.worker_connections.append(connections[DEFAULT_DB_ALIAS])
+
+    def shutdown(self, wait: bool = True, **kwargs):
+        super().shutdown(wait=True, **kwargs)
+        # the threads are done, their connections can be closed from this one
+        for worker_connection in self.worker_connections:
+            worker_connection.inc_thread_sharing()
+            try:
+                worker_connection.close()
+            finally:
+                worker_connection.dec_thread_sharing()
+        self.worker_connections.clear()
 
-    def __init__(self, igdb_api: IGDBAPI, json_data: Optional[List[Dict]] = None):
+
+class IGDBPopulator:
+    PARSED_GAMES = (
+        'dlcs',
+        'similar_games',
+        'expanded_games',
+        'standalone_expansions',
+        'expansions',
+        'remakes',
+        'remasters',
+    )
+    RELATED_DATA = (
+        (Genre, 'genres'),
+        (Keyword, 'keywords'),
+        (Theme, 'themes'),
+        (PlayerPerspective, 'player_perspectives'),
+        (GameMode, 'game_modes'),
+    )
+
+    def __init__(self, igdb_api: Optional[IGDBAPI], json_data: Optional[List[Dict]] = None, processes: int = 0,
+                 max_workers: int = 10, chunk_size: Optional[int] = None, link_relations: bool = True,
+                 executor: Optional[ChunkExecutor] = None):
         self.igdb_api = igdb_api
+        self.processes = processes
+        self.max_workers = max_workers
+        self.executor = executor
+        self.chunk_size = chunk_size or settings.IGDB_SEED_CHUNK_SIZE
+        self.max_retries = settings.IGDB_SEED_MAX_RETRIES
+        self.link_relations = link_relations
+        self.parsed_games: Dict[int, Dict[str, List[int]]] = {}
+        self.collections: Dict[int, Dict[str, Any]] = {}
+        self.report = SeedReport()
         self.seed_model(json_data=json_data)
 
     def clear_data(self, ):
@@ -34,45 +98,158 @@ class IGDBPopulator:
             Game.objects.all().delete()
 
     def _populate_executor(self, igdb_games, model: Optional[Game | Collection] = None, attr: Optional[str] = None):
-        """Thread Pool Executor used to populate database
+        """Populate the database in the chunk threads, which reuse their connections across batches
 
         Args:
             igdb_games (List[Dict]): list of dictionaries that contains the games
             model (Game  |  Collection, optional): model used to add the saved game. Defaults to None.
             attr (Optional[str], optional): attribute where the model should add the game. Defaults to None.
         """
-        with futures.ThreadPoolExecutor(max_workers=10) as executor:
-            game_futures = [executor.submit(self.populate_game, game) for game in igdb_games]
-            for future in futures.as_completed(game_futures):
-                igdb_game: Game = future.result()
-                if model and attr:
-                    getattr(model, attr).add(igdb_game)
+        chunks = [igdb_games[i:i + self.chunk_size] for i in range(0, len(igdb_games), self.chunk_size)]
+        future_to_chunk = {self.executor.submit(self._populate_chunk, chunk): chunk for chunk in chunks}
+        for future in futures.as_completed(future_to_chunk):
+            chunk = future_to_chunk[future]
+            try:
+                igdb_chunk: List[Game] = future.result()
+            except Exception as e:
+                self.report.games_failed(len(chunk))
+                print(f'Failed to populate {len(chunk)} games starting with {chunk[0].get("name")}: {e}')
+                continue
+            self.report.games_populated(len(igdb_chunk))
+            if model and attr:
+                getattr(model, attr).add(*igdb_chunk)
+
+    def _populate_chunk(self, igdb_games: List[Dict]) -> List[Game]:
+        """Populate a chunk of games inside a single transaction
+
+        The whole chunk is rolled back and retried with jittered backoff on operational errors (e.g. deadlocks),
+        up to IGDB_SEED_MAX_RETRIES times.
+
+        Args:
+            igdb_games (List[Dict]): list of dictionaries that contains the games
+
+        Returns:
+            List[Game]: Game models populated
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                with transaction.atomic(), deferred_search_vectors():
+                    self.lock_chunk_slugs(igdb_games)
+                    slugs = self.allocate_game_slugs(igdb_games)
+                    igdb_chunk = [self.populate_game(game, slugs.get(game['id'])) for game in igdb_games]
+                    written = time.perf_counter()
+                self.report.chunk_committed(time.perf_counter() - written)
+                return igdb_chunk
+            except OperationalError:
+                connection.close_if_unusable_or_obsolete()
+                if attempt == self.max_retries:
+                    raise
+                self.report.chunk_retried()
+                time.sleep(random.uniform(0, settings.IGDB_SEED_RETRY_BACKOFF * 2 ** attempt))
 
     def seed_model(self, json_data: Optional[List[Dict]] = None):
         """Function used to seed the database model"""
-        igdb_games = json_data or []
-
-        if not json_data:
-            offset = 0
-            total_igdb_games = 10000
-            with futures.ThreadPoolExecutor(max_workers=10) as executor:
-                future_to_offset = {executor.submit(self.igdb_api.fetch_games, offset, min(
-                    total_igdb_games - offset, 500)): offset for offset in range(0, total_igdb_games, 500)}
-                for future in futures.as_completed(future_to_offset):
-                    offset = future_to_offset[future]
-                    try:
-                        games = future.result()
-                        igdb_games.extend(games)
-                    except Exception as e:
-                        print(f"Failed to fetch games starting from offset {offset}: {e}")
-
-        self._populate_executor(igdb_games)
-
-    def populate_game(self, game: Dict[str, Any]):
+        start = time.perf_counter()
+        self.report.workers = self.processes or 1
+        executor = contextlib.nullcontext(self.executor) if self.executor else ChunkExecutor(self.max_workers)
+        with self._process_pool() as pool, executor as self.executor:
+            if json_data:
+                self._write_games(json_data, pool)
+            else:
+                pipeline = SeedPipeline(
+                    fetch_page=self.igdb_api.fetch_games,
+                    write_batch=partial(self._write_games, pool=pool),
+                    total=settings.IGDB_SEED_TOTAL,
+                    page_size=settings.IGDB_PAGE_SIZE,
+                    fetchers=settings.IGDB_SEED_FETCHERS,
+                    writers=self.processes or settings.IGDB_SEED_WRITERS,
+                    queue_size=settings.IGDB_SEED_QUEUE_SIZE,
+                )
+                stats = pipeline.run()
+                print(f"Seeded {stats['items']} games in {stats['wall_time']:.1f}s "
+                      f"(fetching {stats['fetch_time']:.1f}s, writing {stats['write_time']:.1f}s)")
+
+            if self.link_relations:
+                self.link_related_games(pool)
+        self.report.elapsed = time.perf_counter() - start
+
+    @contextlib.contextmanager
+    def _process_pool(self):
+        """Pool of worker processes used to populate, or None when seeding in threads
+
+        The pool is closed instead of terminated when the seed succeeds, so the workers exit
+        normally and close their connections.
+        """
+        if not self.processes:
+            yield None
+            return
+
+        # each worker has to open its own connection instead of sharing the inherited one
+        connections.close_all()
+        pool = multiprocessing.Pool(self.processes, initializer=init_partition_worker, initargs=(self.max_workers,))
+        try:
+            yield pool
+            pool.close()
+            pool.join()
+        finally:
+            pool.terminate()
+
+    def _write_games(self, igdb_games: List[Dict], pool: Optional[multiprocessing.pool.Pool] = None):
+        """Populate a batch of games in this process or partitioned across the worker processes
+
+        Args:
+            igdb_games (List[Dict]): list of dictionaries that contains the games
+            pool (multiprocessing.pool.Pool, optional): worker processes. Defaults to None.
+        """
+        if not igdb_games:
+            return
+        self.collect_relations(igdb_games)
+        if not pool:
+            self._populate_executor(igdb_games)
+            return
+
+        size = -(-len(igdb_games) // (self.processes * 4))
+        partitions = [igdb_games[i:i + size] for i in range(0, len(igdb_games), size)]
+        for report in pool.imap_unordered(partial(populate_partition, chunk_size=self.chunk_size), partitions):
+            self.report.merge(report)
+
+    def lock_chunk_slugs(self, igdb_games: List[Dict]):
+        """Lock the slugs the chunk may allocate before writing it, all in one sorted query
+
+        The games and their related data allocate slugs of several models, locking them one model at
+        a time would make concurrent chunks wait on each other in a cycle.
+
+        Args:
+            igdb_games (List[Dict]): list of dictionaries that contains the games
+        """
+        lock_slugs([(Game, slugify(game.get('name'), allow_unicode=True)) for game in igdb_games] + [
+            (model, slugify(related_object['name']))
+            for game in igdb_games for model, related_data in self.RELATED_DATA
+            for related_object in game.get(related_data, []) if 'name' in related_object
+        ])
+
+    def allocate_game_slugs(self, igdb_games: List[Dict]) -> Dict[int, str]:
+        """Reserve the slugs of the games not populated yet in one query
+
+        Args:
+            igdb_games (List[Dict]): list of dictionaries that contains the games
+
+        Returns:
+            Dict[int, str]: slug of each new game by IGDB id
+        """
+        claim_igdb_ids(Game, 'slug', {game['id']: slugify(game.get('name'), allow_unicode=True) for game in igdb_games})
+        existing = set(Game.objects.filter(igdb_id__in=[game['id'] for game in igdb_games])
+                       .values_list('igdb_id', flat=True))
+        new_games = {game['id']: game for game in igdb_games if game['id'] not in existing}
+        slugs = allocate_slugs(Game, [slugify(game.get('name'), allow_unicode=True) for game in new_games.values()])
+        return dict(zip(new_games, slugs))
+
+    def populate_game(self, game: Dict[str, Any], slug: Optional[str] = None):
         """Function used to populate the game
 
         Args:
             game (Dict[str, Any]): dictionary of the game from the fetched data
+            slug (Optional[str], optional): slug reserved for a new game. Defaults to None.
 
         Returns:
             Game: Game model used to populate
@@ -84,21 +261,21 @@ class IGDBPopulator:
         game_first_release = str(game['first_release_date']
                                  ) if 'first_release_date' in game else None
         game_status = Status(int(game.get('status', 8))).label
-        try:
-            igdb_data, _ = Game.objects.update_or_create(
-                title=game_title,
-                cover=self.add_game_cover(game=game),
-                defaults={
-                    'summary': game_summary,
-                    'story_line': game_story_line,
-                    'first_release': game_first_release,
-                    'type': Game.Type(game_type),
-                    'status': Game.Status(game_status),
-                }
-            )
-        except OperationalError:
-            time.sleep(5)
-            return self.populate_game(game)
+        igdb_data, _ = Game.objects.update_or_create(
+            igdb_id=game['id'],
+            defaults={
+                'title': game_title,
+                'summary': game_summary,
+                'story_line': game_story_line,
+                'first_release': game_first_release,
+                'type': Game.Type(game_type),
+                'status': Game.Status(game_status),
+                **({'slug': slug} if slug else {}),
+            }
+        )
+        if not igdb_data.cover_id and game.get('cover'):
+            igdb_data.cover = self.add_game_cover(game=game)
+            igdb_data.save(update_fields=['cover'])
 
         self._add_relations(game, igdb_data)
 
@@ -114,7 +291,6 @@ class IGDBPopulator:
         print(f'Populating with {game.get("name")}')
         # TODO:
         self.add_language_support(igdb_data, game)
-        # self.add_collections(game.get('collection'))
         self.add_videos(igdb_data, game.get('videos'))
         self.add_websites(igdb_data, game.get('websites'))
         self.add_related_data(igdb_data, game, Genre, "genres")
@@ -122,9 +298,8 @@ class IGDBPopulator:
         self.add_related_data(igdb_data, game, Theme, "themes")
         self.add_age_ratings(igdb_data, game)
         self.add_release_platforms(igdb_data, game)
-        self.add_player_perspective(igdb_data, game.get('player_perspectives', []))
+        self.add_related_data(igdb_data, game, PlayerPerspective, 'player_perspectives')
         self.add_thumbnails(igdb_data, game.get('screenshots'))
-        # self.add_parsed_games(igdb_data, game)
 
     def add_release_platforms(self, igdb_data, game):
         """Add release dates to game model
@@ -146,13 +321,7 @@ class IGDBPopulator:
 
         for release_platform in game.get('release_dates', []):
             if platform := release_platform.get('platform'):
-                platform_name = platform['name']
-
-                platform_type = Platform.Type.UNDEFINED
-                if platform.get('category'):
-                    platform_type = Platform.Type(PlatformType(int(platform['category'])).name)
-
-                platform_obj = Platform.objects.get(name=platform_name, type=platform_type)
+                platform_obj = self.get_platform(platform)
 
                 region_label = Regions(int(release_platform['region'])).label
 
@@ -216,12 +385,82 @@ class IGDBPopulator:
 
         return multiplayer_obj
 
+    @cached_property
+    def platforms(self) -> Dict[int, Platform]:
+        """Platforms indexed by IGDB id, loaded once since they are reference data"""
+        return Platform.objects.in_bulk(field_name='igdb_id')
+
+    @cached_property
+    def languages(self) -> Dict[int, Language]:
+        """Languages indexed by IGDB id, loaded once since they are reference data"""
+        return Language.objects.in_bulk(field_name='igdb_id')
+
+    def get_platform(self, platform: Dict[str, Any]) -> Platform:
+        """Get the platform model of a fetched platform
+
+        Args:
+            platform (Dict[str, Any]): Dictionary of the platform
+
+        Returns:
+            Platform: Platform model
+        """
+        if platform_obj := self.platforms.get(platform.get('id')):
+            return platform_obj
+
+        platform_type = Platform.Type.UNDEFINED
+        if platform.get('category'):
+            platform_type = Platform.Type(PlatformType(int(platform['category'])).name)
+
+        return Platform.objects.get(name=platform['name'], type=platform_type)
+
+    def get_language(self, language: Dict[str, Any]) -> Language:
+        """Get the language model of a fetched language
+
+        Args:
+            language (Dict[str, Any]): Dictionary of the language
+
+        Returns:
+            Language: Language model
+        """
+        if language_obj := self.languages.get(language.get('id')):
+            return language_obj
+
+        return Language.objects.get(locale=language.get('locale'))
+
+    @cached_property
+    def language_index(self) -> Tuple[Dict[str, Tuple[int, Language]], Dict[str, Tuple[int, Language]]]:
+        """Languages indexed by every prefix of their locale and by name, keeping the first one by locale"""
+        prefixes, names = {}, {}
+        for position, language in enumerate(Language.objects.all()):
+            if language.locale:
+                for end in range(len(language.locale) + 1):
+                    prefixes.setdefault(language.locale[:end], (position, language))
+            if language.name:
+                names.setdefault(language.name.lower(), (position, language))
+        return prefixes, names
+
+    def get_title_language(self, lang_code: str, comment: Optional[str]) -> Language:
+        """Get the language of an alternative title by its locale or by the language named in its comment
+
+        Args:
+            lang_code (str): locale or prefix of the locale of the title
+            comment (Optional[str]): comment of the title, e.g. Japanese title
+
+        Raises:
+            LookupError: when no language matches.
+
+        Returns:
+            Language: Language model
+        """
+        prefixes, names = self.language_index
+        name = comment.replace('title', '').strip().lower() if comment else ''
+        matches = [match for match in (prefixes.get(str(lang_code)), names.get(name)) if match]
+        if not matches:
+            raise LookupError(lang_code)
+        return min(matches, key=lambda match: match[0])[1]
+
     def add_player_perspective(self, igdb_data: Game, player_perspectives: List):
-        for player_perspective in player_perspectives:
-            perspective_obj, _ = PlayerPerspective.objects.get_or_create(
-                name=player_perspective['name'],
-            )
-            igdb_data.player_perspectives.add(perspective_obj)
+        self.add_related_data(igdb_data, {'player_perspectives': player_perspectives}, PlayerPerspective, 'player_perspectives')
 
     def add_videos(self, igdb_data: Game, videos: Optional[List[Dict]]):
         """Add videos to game model
@@ -252,7 +491,7 @@ class IGDBPopulator:
 
         game_title: str = igdb_data.title
         for i, thumbnail in enumerate(thumbnails):
-            thumbnail_obj, thumbnail_created = Thumbnail.objects.get_or_create(
+            Thumbnail.objects.get_or_create(
                 filename=slugify(f'{game_title}--{i}'),
                 game=igdb_data,
                 defaults={
@@ -261,9 +500,6 @@ class IGDBPopulator:
                 }
             )
 
-            if thumbnail_created:
-                thumbnail_obj.save()
-
     def add_websites(self, igdb_data: Game, links: Optional[List[Dict]]):
         """Add website links to game model
 
@@ -283,50 +519,114 @@ class IGDBPopulator:
                 url=link.get('url')
             )
 
-    def add_collections(self, collection: Optional[Dict[str, Any]]):
-        """Add collection to game model
+    def collect_relations(self, igdb_games: List[Dict]):
+        """Collect the IGDB ids of the parsed games (DLCs, Similars, Expanded, Expansions, Remakes, Remasters)
+        and the distinct collections, so they are linked once every game of the dataset is populated
 
         Args:
-            collection (Optional[Dict[str, Any]]): List of dictionaries that contains the collection data
+            igdb_games (List[Dict]): list of dictionaries that contains the games
         """
-        if collection:
-            collection_name = collection.get('name')
-            collection_obj, collection_created = Collection.objects.get_or_create(
-                name=collection_name
+        for game in igdb_games:
+            if parsed_games := {attr: game[attr] for attr in self.PARSED_GAMES if game.get(attr)}:
+                self.parsed_games[game['id']] = parsed_games
+            if (collection := game.get('collection')) and collection['id'] not in self.collections:
+                self.collections[collection['id']] = collection
+
+    def link_related_games(self, pool: Optional[multiprocessing.pool.Pool] = None):
+        """Link the parsed games and the collections of the populated dataset
+
+        Referenced games that weren't loaded are fetched once in batches of IGDB_PAGE_SIZE ids, without following
+        their own relations, so the whole phase costs O(unique ids / IGDB_PAGE_SIZE) requests.
+
+        Args:
+            pool (multiprocessing.pool.Pool, optional): worker processes. Defaults to None.
+        """
+        self.fetch_missing_games(self._referenced_games() | self._collection_games(), pool)
+        self.link_parsed_games()
+        self.add_collections()
+
+    def add_collections(self):
+        """Add the collected collections and write their games membership with bulk inserts"""
+        collections = dict(self.collections)
+        claim_igdb_ids(Collection, 'name', {igdb_id: collection.get('name') for igdb_id, collection in collections.items()})
+        collection_objs = Collection.objects.in_bulk(collections, field_name='igdb_id')
+        if missing := [igdb_id for igdb_id in collections if igdb_id not in collection_objs]:
+            with transaction.atomic():
+                names = [collections[igdb_id].get('name') for igdb_id in missing]
+                slugs = allocate_slugs(Collection, [slugify(name, allow_unicode=True) for name in names])
+                Collection.objects.bulk_create([
+                    Collection(igdb_id=igdb_id, name=name, slug=slug, url=f'http://127.0.0.1:8000/collection/{slug}')
+                    for igdb_id, name, slug in zip(missing, names, slugs)
+                ], ignore_conflicts=True)
+            collection_objs.update(Collection.objects.in_bulk(missing, field_name='igdb_id'))
+
+        game_pks = dict(Game.objects.filter(igdb_id__in=self._collection_games()).values_list('igdb_id', 'id'))
+        through_model = Collection.games.through
+        rows = [
+            through_model(collection_id=collection_objs[igdb_id].id, game_id=game_pks[game_id])
+            for igdb_id, collection in collections.items()
+            for game_id in set(collection.get('games', [])) if game_id in game_pks
+        ]
+        through_model.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+        self.report.relations_linked(len(rows))
+
+    def link_parsed_games(self):
+        """Link the collected parsed games with bulk inserts in the through tables"""
+        game_ids = self._referenced_games().union(self.parsed_games)
+        game_pks = dict(Game.objects.filter(igdb_id__in=game_ids).values_list('igdb_id', 'id'))
+        for attr in self.PARSED_GAMES:
+            through_model = getattr(Game, attr).through
+            symmetrical = getattr(Game, attr).field.remote_field.symmetrical
+            rows = set()
+            for igdb_id, parsed_games in list(self.parsed_games.items()):
+                from_pk = game_pks.get(igdb_id)
+                for to_pk in (game_pks.get(parsed_id) for parsed_id in parsed_games.get(attr, [])):
+                    if from_pk and to_pk:
+                        rows.add((from_pk, to_pk))
+                        if symmetrical:
+                            rows.add((to_pk, from_pk))
+            through_model.objects.bulk_create(
+                [through_model(from_game_id=from_pk, to_game_id=to_pk) for from_pk, to_pk in rows],
+                batch_size=1000,
+                ignore_conflicts=True,
             )
-            if collection_created:
-                collection_obj.save()
-            data = self.igdb_api.fetch_games(limit=len(collection.get('games')), ids=collection.get('games'))
-            self._populate_executor(data, collection_obj, 'games')
+            self.report.relations_linked(len(rows))
+
+    def _referenced_games(self) -> Set[int]:
+        return {
+            igdb_id for parsed_games in list(self.parsed_games.values())
+            for ids in parsed_games.values() for igdb_id in ids
+        }
+
+    def _collection_games(self) -> Set[int]:
+        return {igdb_id for collection in list(self.collections.values()) for igdb_id in collection.get('games', [])}
 
-    def add_parsed_games(self, igdb_data: Game, game: Dict[str, Any]):
-        """Add parsed games (DLCs, Similars, Expanded, Expansions, Remakes, Remasters) to game model
+    def fetch_missing_games(self, igdb_ids: Set[int], pool: Optional[multiprocessing.pool.Pool] = None):
+        """Fetch and populate the games that aren't loaded yet in batches of IGDB_PAGE_SIZE ids
 
         Args:
-            igdb_data (Game): Game model to populate
-            game (Dict[str, Any]): Dictionary of the game
+            igdb_ids (Set[int]): IGDB ids of the games that should be loaded
+            pool (multiprocessing.pool.Pool, optional): worker processes. Defaults to None.
         """
-        if game.get('dlcs'):
-            data = self.igdb_api.fetch_games(limit=len(game.get('dlcs')), ids=game.get('dlcs'))
-            self._populate_executor(data, igdb_data, 'dlcs')
-        if game.get('similar_games'):
-            data = self.igdb_api.fetch_games(limit=len(game.get('similar_games')), ids=game.get('similar_games'))
-            self._populate_executor(data, igdb_data, 'similar_games')
-        if game.get('expanded_games'):
-            data = self.igdb_api.fetch_games(limit=len(game.get('expanded_games')), ids=game.get('expanded_games'))
-            self._populate_executor(data, igdb_data, 'expanded_games')
-        if game.get('standalone_expansions'):
-            data = self.igdb_api.fetch_games(limit=len(game.get('standalone_expansions')), ids=game.get('standalone_expansions'))
-            self._populate_executor(data, igdb_data, 'standalone_expansions')
-        if game.get('expansions'):
-            data = self.igdb_api.fetch_games(limit=len(game.get('expansions')), ids=game.get('expansions'))
-            self._populate_executor(data, igdb_data, 'expansions')
-        if game.get('remakes'):
-            data = self.igdb_api.fetch_games(limit=len(game.get('remakes')), ids=game.get('remakes'))
-            self._populate_executor(data, igdb_data, 'remakes')
-        if game.get('remasters'):
-            data = self.igdb_api.fetch_games(limit=len(game.get('remasters')), ids=game.get('remasters'))
-            self._populate_executor(data, igdb_data, 'remasters')
+        loaded_ids = set(Game.objects.filter(igdb_id__in=igdb_ids).values_list('igdb_id', flat=True))
+        missing_ids = sorted(igdb_ids - loaded_ids)
+        if not missing_ids or not self.igdb_api:
+            return
+
+        page_size = settings.IGDB_PAGE_SIZE
+        batches = [missing_ids[i:i + page_size] for i in range(0, len(missing_ids), page_size)]
+        with futures.ThreadPoolExecutor(max_workers=settings.IGDB_SEED_FETCHERS) as executor:
+            batch_futures = [executor.submit(self.igdb_api.fetch_games, limit=len(ids), ids=ids) for ids in batches]
+            for future in futures.as_completed(batch_futures):
+                try:
+                    igdb_games = future.result()
+                except (CacheMissError, requests.RequestException) as e:
+                    # The games of the other batches are still linked, the ones of this batch stay unlinked
+                    print(f'Failed to fetch missing games: {e}')
+                    self.report.fetch_failed()
+                    continue
+                self.report.games_fetched(len(igdb_games))
+                self._write_games(igdb_games, pool)
 
     def add_language_support(self, igdb_data: Game, game: Dict[str, Any]):
         """Add language supports to game model
@@ -339,30 +639,19 @@ class IGDBPopulator:
         alt_titles: List = game.get('alternative_names', [])
         localizations = game.get('game_localizations', [])
 
-        all_names = [el.get('name').lower() for el in alt_titles]
+        matcher = TitleMatcher([el.get('name').lower() for el in alt_titles], threshold=0.8)
 
         for localization in localizations:
             name = localization.get('name')
-            if not name:
-                alt_titles.append(localization)
+            if name and (index := matcher.match(name)) is not None:
+                alt_titles[index].update(localization)
                 continue
 
-            if matches := [
-                (index, SequenceMatcher(None, alt_name.strip(), name.strip()).ratio())
-                for index, alt_name in enumerate(all_names)
-            ]:
-                index, sim = max(matches, key=lambda x: x[1])
-                if sim > 0.8:
-                    alt_titles[index].update(localization)
-                    continue
-
             alt_titles.append(localization)
 
         for language_support in language_supports:
             language: Dict = language_support.get('language')
-            lang_code = language.get('locale')
-
-            language_obj = Language.objects.get(locale=lang_code)
+            language_obj = self.get_language(language)
 
             support: Dict = language_support.get('language_support_type')
             support_name = SupportType.Enum(support['name'])
@@ -382,9 +671,8 @@ class IGDBPopulator:
             cover_obj = None
             try:
                 lang_code = alt_title.get('region', {'identifier': None})[
-                    'identifier'] or Lang.find(alt_language) if alt_language else ''
-                language_obj = Language.objects.filter(Q(name__trigram_similar=alt_comment.replace(
-                    'title', '').strip() if alt_comment else '') | Q(locale__startswith=lang_code))[0]
+                    'identifier'] or get_locale_table().find(alt_language).language if alt_language else ''
+                language_obj = self.get_title_language(lang_code, alt_comment)
 
                 if 'cover' in alt_title:
                     cover = alt_title['cover']
@@ -446,16 +734,40 @@ class IGDBPopulator:
             related_model(ModelType): ModelType related to Game model used to get or create the object
             related_data(str): Attribute that should be contained in Game model
         """
-        for related_object in obj.get(related_data, []):
-            related_slug = slugify(related_object['name'])
-            related_obj, _ = related_model.objects.get_or_create(
-                slug=related_slug,
-                defaults={
-                    'name': related_object['name'],
-                    'url': f'http://127.0.0.1:8000/{related_data.replace("_", "-")}/{related_slug}'
-                },
-            )
-            getattr(igdb_data, related_data).add(related_obj)
+        related_objects = obj.get(related_data, [])
+        if not related_objects:
+            return
+
+        url = f'http://127.0.0.1:8000/{related_data.replace("_", "-")}'
+        related_ids = [related_object['id'] for related_object in related_objects if 'id' in related_object]
+        resolved = related_model.objects.in_bulk(related_ids, field_name='igdb_id')
+        missing = {
+            related_object['id']: related_object['name']
+            for related_object in related_objects if 'id' in related_object and related_object['id'] not in resolved
+        }
+        if missing and claim_igdb_ids(related_model, 'slug', {igdb_id: slugify(name) for igdb_id, name in missing.items()}):
+            resolved.update(related_model.objects.in_bulk(list(missing), field_name='igdb_id'))
+            missing = {igdb_id: name for igdb_id, name in missing.items() if igdb_id not in resolved}
+        if missing:
+            slugs = allocate_slugs(related_model, [slugify(name) for name in missing.values()])
+            related_model.objects.bulk_create([
+                related_model(igdb_id=igdb_id, name=name, slug=slug, url=f'{url}/{slug}')
+                for (igdb_id, name), slug in zip(missing.items(), slugs)
+            ], ignore_conflicts=True)
+            resolved.update(related_model.objects.in_bulk(list(missing), field_name='igdb_id'))
+
+        related_objs = []
+        for related_object in related_objects:
+            related_obj = resolved.get(related_object.get('id'))
+            if not related_obj:
+                related_slug = slugify(related_object['name'])
+                related_obj, _ = related_model.objects.get_or_create(
+                    slug=related_slug,
+                    defaults={'name': related_object['name'], 'url': f'{url}/{related_slug}'}
+                )
+            related_objs.append(related_obj)
+
+        getattr(igdb_data, related_data).add(*related_objs)
 
     def add_age_ratings(self, igdb_data, game):
         """Add age ratings to game model
@@ -475,6 +787,32 @@ class IGDBPopulator:
             igdb_data.age_ratings.add(age_rating_obj)
 
 
+partition_executor: Optional[ChunkExecutor] = None
+
+
+def init_partition_worker(max_workers: int):
+    """Start the chunk threads of a worker process, shut down with their connections when it exits"""
+    global partition_executor
+    connections.close_all()
+    partition_executor = ChunkExecutor(max_workers)
+    multiprocessing.util.Finalize(None, partition_executor.shutdown, exitpriority=10)
+    multiprocessing.util.Finalize(None, connections.close_all, exitpriority=0)
+
+
+def populate_partition(igdb_games: List[Dict], chunk_size: Optional[int] = None) -> SeedReport:
+    """Populate a partition of games inside a worker process, reusing its chunk threads and connections
+
+    Args:
+        igdb_games (List[Dict]): list of dictionaries that contains the games
+        chunk_size (int, optional): games written per transaction. Defaults to None.
+
+    Returns:
+        SeedReport: summary of the partition
+    """
+    populator = IGDBPopulator(None, igdb_games, chunk_size=chunk_size, link_relations=False, executor=partition_executor)
+    return populator.report
+
+
 class Command(BaseCommand):
     """Command handled by Django
 
@@ -482,12 +820,39 @@ class Command(BaseCommand):
         BaseCommand(Type): Parent of the class
     """
 
+    def add_arguments(self, parser):
+        parser.add_argument('--file', default='exs.json', help='JSON file with the games to seed')
+        parser.add_argument('--fetch', action='store_true', help='Page the games from IGDB instead of reading a file')
+        parser.add_argument('--processes', type=int, default=settings.IGDB_SEED_PROCESSES,
+                            help='Worker processes used to populate the games, 0 populates in threads')
+        parser.add_argument('--chunk-size', type=int, default=settings.IGDB_SEED_CHUNK_SIZE,
+                            help='Games written per transaction')
+        parser.add_argument('--cache', action='store_true', default=settings.IGDB_CACHE_ENABLED,
+                            help=f'Cache the IGDB responses in {settings.IGDB_CACHE_DIR}')
+        parser.add_argument('--offline', action='store_true', help='Replay the IGDB responses from the cache only')
+        parser.add_argument('--skip-images', action='store_true',
+                            help='Leave the images pending to be downloaded later by download_images')
+
     def handle(self, *args, **options):
         """Function to handle the seed_model"""
         # clear_data()
-        igdb_api = IGDBAPI.populate()
-        with open('exs.json', encoding="utf8") as json_file:
-            data = json.load(json_file)
-            IGDBPopulator(igdb_api, data)
+        cache = None
+        if options['cache'] or options['offline']:
+            cache = ResponseCache(settings.IGDB_CACHE_DIR, ttl=settings.IGDB_CACHE_TTL, max_size=settings.IGDB_CACHE_MAX_SIZE)
+        igdb_api = IGDBAPI.populate(cache=cache, offline=options['offline'])
+        if options['fetch']:
+            populator = IGDBPopulator(igdb_api, processes=options['processes'], chunk_size=options['chunk_size'])
+        else:
+            with open(options['file'], encoding="utf8") as json_file:
+                data = json.load(json_file)
+                populator = IGDBPopulator(igdb_api, data, processes=options['processes'],
+                                          chunk_size=options['chunk_size'])
         # clear_data()
+        print(f'IGDB client stats: {igdb_api.client.stats}')
+        if cache:
+            print(f'IGDB cache stats: {cache}')
+        print(f'Seed report: {populator.report}')
+        if not options['skip_images'] and not options['offline']:
+            print(f'Image download stats: {download_pending_images()}')
+            print(f'Image derivative stats: {generate_derivatives()}')
         print("IGDB API was successfully added")
@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.images import IMAGE_MODELS_BY_NAME
+from api_populators.services import ImageVerifier
+
+from .download_images import download_pending_images
+
+
+class Command(BaseCommand):
+    """Verify the stored images and queue again the broken ones
+
+    Args:
+        BaseCommand(Type): Parent of the class
+    """
+    MODELS = IMAGE_MODELS_BY_NAME
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', action='append', choices=list(self.MODELS),
+                            help='Image model to verify, all of them by default')
+        parser.add_argument('--processes', type=int, default=settings.IMAGE_VERIFY_PROCESSES,
+                            help='Worker processes used to verify the images, 0 uses one per CPU')
+        parser.add_argument('--deep', action='store_true', help='Decode every pixel to find truncated images')
+        parser.add_argument('--dry-run', action='store_true', help='Report the broken images without repairing them')
+        parser.add_argument('--download', action='store_true', help='Download the queued images after verifying')
+
+    def handle(self, *args, **options):
+        models = [self.MODELS[name] for name in options['model'] or self.MODELS]
+        verifier = ImageVerifier(processes=options['processes'] or None, deep=options['deep'])
+        stats = verifier.run(models, repair=not options['dry_run'])
+
+        for model_name, pk, path, problem in verifier.problems[:None if options['verbosity'] > 1 else 20]:
+            print(f'{model_name} {pk}: {problem} ({path})')
+        print(f'Image verify stats: {stats}')
+        if options['download'] and not options['dry_run']:
+            print(f'Image download stats: {download_pending_images(models)}')
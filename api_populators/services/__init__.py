@@ -0,0 +1,8 @@
+from .http_client import ClientStats, IGDBClient, TokenBucket
+from .image_derivatives import ImageDerivativeGenerator
+from .image_downloader import ImageDownloader
+from .image_verifier import ImageVerifier
+from .matching import TitleMatcher
+from .pipeline import SeedPipeline
+from .report import SeedReport
+from .response_cache import CacheMissError, ResponseCache
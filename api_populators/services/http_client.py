@@ -0,0 +1,189 @@
+import random
+import threading
+import time
+from typing import Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Statuses of the responses worth retrying: throttled or a temporary failure of the server
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def get_backoff(attempt: int, response: Optional[requests.Response], backoff: float, max_backoff: float = 30) -> float:
+    """Exponential backoff with full jitter, honoring the Retry-After header when sent"""
+    delay = random.uniform(0, min(max_backoff, backoff * 2 ** attempt))
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    if retry_after and retry_after.isdigit():
+        delay = max(delay, min(max_backoff, float(retry_after)))
+    return delay
+
+
+class TokenBucket:
+    """Thread-safe token bucket used to keep the requests under the allowed rate
+
+    Args:
+        rate (float): tokens added per second.
+        burst (int, optional): max amount of tokens stored in the bucket. Defaults to 1.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and take it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class ClientStats:
+    """Throughput counters of the IGDB client"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.monotonic()
+        self.requests = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.retries = 0
+        self.throttled = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def request_started(self):
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def request_finished(self, response: Optional[requests.Response]):
+        with self._lock:
+            self.in_flight -= 1
+            if response is not None and response.ok:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+            if response is not None and response.status_code == 429:
+                self.throttled += 1
+
+    def retried(self):
+        with self._lock:
+            self.retries += 1
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> Dict[str, Union[int, float]]:
+        return {
+            'requests': self.requests,
+            'succeeded': self.succeeded,
+            'failed': self.failed,
+            'retries': self.retries,
+            'throttled': self.throttled,
+            'max_in_flight': self.max_in_flight,
+            'elapsed': round(self.elapsed, 3),
+            'requests_per_second': round(self.requests_per_second, 3),
+        }
+
+    def __str__(self):
+        return ', '.join(f'{k}={v}' for k, v in self.to_dict().items())
+
+
+class IGDBClient:
+    """Pooled HTTP client with rate limiting, concurrency limit and retries
+
+    Args:
+        base_url (str): base url of the API.
+        headers (Dict[str, str], optional): headers sent in every request. Defaults to None.
+        rate (float, optional): max requests per second. Defaults to 4.
+        max_concurrency (int, optional): max open requests at the same time. Defaults to 8.
+        timeout (Union[float, Tuple[float, float]], optional): connect and read timeout. Defaults to (5, 30).
+        max_retries (int, optional): retries allowed on 429/5xx or connection errors. Defaults to 5.
+        backoff (float, optional): base seconds of the exponential backoff. Defaults to 0.5.
+        max_backoff (float, optional): max seconds waited between retries. Defaults to 30.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: Optional[Dict[str, str]] = None,
+        rate: float = 4,
+        max_concurrency: int = 8,
+        timeout: Union[float, Tuple[float, float]] = (5, 30),
+        max_retries: int = 5,
+        backoff: float = 0.5,
+        max_backoff: float = 30,
+    ):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.bucket = TokenBucket(rate)
+        self.stats = ClientStats()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+        self.session = requests.Session()
+        self.session.headers.update(headers or {})
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def post(self, endpoint: str, data: str) -> requests.Response:
+        """Post data to the endpoint retrying with backoff on throttling and server errors
+
+        Args:
+            endpoint (str): endpoint of the API.
+            data (str): body of the request.
+
+        Raises:
+            requests.RequestException: when the connection keeps failing after all the retries.
+
+        Returns:
+            requests.Response: last response received.
+        """
+        url = f'{self.base_url}/' + endpoint.removeprefix('/')
+        for attempt in range(self.max_retries + 1):
+            response, error = self._send(url, data)
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                return response
+            if attempt == self.max_retries:
+                break
+            self.stats.retried()
+            time.sleep(get_backoff(attempt, response, self.backoff, self.max_backoff))
+
+        if response is None:
+            raise error
+        return response
+
+    def _send(self, url: str, data: str) -> Tuple[Optional[requests.Response], Optional[requests.RequestException]]:
+        self.bucket.acquire()
+        with self._slots:
+            self.stats.request_started()
+            response, error = None, None
+            try:
+                response = self.session.post(url, data=data, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            self.stats.request_finished(response)
+        return response, error
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,128 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from operator import or_
+from typing import Iterable, List, Optional, Sequence, Tuple, Type
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef
+from PIL import Image
+
+from api.images import EXTENSIONS, IMAGE_MODELS, RunStats, partial_file, supported_formats
+from api.models import ImageBlob, ImageVariant
+from api.models.image_model import ImageBase
+
+
+def render_variants(path: str, directory: str, stem: str, widths: Sequence[int], formats: Sequence[str],
+                    quality: int) -> List[Tuple[int, int, str, str]]:
+    """Resize an image to each width and format, run in the worker processes
+
+    Widths larger than the original are generated at the original width.
+
+    Args:
+        path (str): path of the original image.
+        directory (str): directory where the variants are written.
+        stem (str): name of the variants without width and extension.
+        widths (Sequence[int]): widths of the variants.
+        formats (Sequence[str]): formats of the variants.
+        quality (int): encoder quality.
+
+    Returns:
+        List[Tuple[int, int, str, str]]: width, height, format and file name of each variant
+    """
+    os.makedirs(directory, exist_ok=True)
+    with Image.open(path) as original:
+        original = original.convert('RGBA' if original.mode in ('RGBA', 'LA', 'P') else 'RGB')
+    variants = []
+    for width in sorted({min(width, original.width) for width in widths}):
+        height = max(1, round(original.height * width / original.width))
+        resized = original if width == original.width else original.resize((width, height), Image.Resampling.LANCZOS)
+        for fmt in formats:
+            image = resized.convert('RGB') if fmt == 'jpeg' else resized
+            filename = f'{stem}-{width}w.{EXTENSIONS[fmt]}'
+            with partial_file(directory) as (handle, tmp_path):
+                with handle:
+                    image.save(handle, format=fmt.upper(), quality=quality)
+                os.replace(tmp_path, os.path.join(directory, filename))
+            variants.append((width, height, fmt, filename))
+    return variants
+
+
+class ImageDerivativeGenerator:
+    """Generate the resized variants of the downloaded images in a process pool
+
+    The variants belong to the blob of the images and are named by its hash, so the images
+    sharing the same content are resized once and share their variants.
+
+    Args:
+        widths (Sequence[int], optional): widths of the variants. Defaults to (90, 180, 360, 720).
+        formats (Sequence[str], optional): formats of the variants. Defaults to ('jpeg', 'webp', 'avif').
+        quality (int, optional): encoder quality. Defaults to 80.
+        processes (Optional[int], optional): worker processes, one per CPU when None. Defaults to None.
+        batch_size (int, optional): blobs resized before their variants are inserted. Defaults to 200.
+    """
+
+    def __init__(
+        self,
+        widths: Sequence[int] = (90, 180, 360, 720),
+        formats: Sequence[str] = ('jpeg', 'webp', 'avif'),
+        quality: int = 80,
+        processes: Optional[int] = None,
+        batch_size: int = 200,
+    ):
+        self.widths = widths
+        self.formats = supported_formats(formats)
+        self.quality = quality
+        self.processes = processes
+        self.batch_size = batch_size
+
+    def run(self, models: Optional[Iterable[Type[ImageBase]]] = None, force: bool = False) -> RunStats:
+        """Generate the variants of the blobs of the ready images that do not have them yet
+
+        Args:
+            models (Optional[Iterable[Type[ImageBase]]], optional): image models to process. Defaults to all.
+            force (bool, optional): generate again the blobs that already have variants. Defaults to False.
+
+        Returns:
+            RunStats: counters of the run
+        """
+        stats = RunStats('blobs', 'variants', 'failed')
+        referenced = reduce(or_, (Exists(model.objects.filter(blob=OuterRef('hash'), state=ImageBase.State.READY))
+                                  for model in models or IMAGE_MODELS))
+        blobs = ImageBlob.objects.filter(referenced).order_by('pk')
+        if not force:
+            blobs = blobs.filter(~Exists(ImageVariant.objects.filter(blob=OuterRef('hash'))))
+        with ProcessPoolExecutor(max_workers=self.processes) as executor:
+            last_pk = 0
+            while batch := list(blobs.filter(pk__gt=last_pk)[:self.batch_size]):
+                last_pk = batch[-1].pk
+                variants = self._render_batch(executor, batch, stats)
+                if force:
+                    ImageVariant.objects.filter(blob__in=[blob.hash for blob in batch]).delete()
+                ImageVariant.objects.bulk_create(variants, ignore_conflicts=True)
+                stats['variants'] += len(variants)
+        return stats
+
+    def _render_batch(self, executor: ProcessPoolExecutor, batch: List[ImageBlob],
+                      stats: RunStats) -> List[ImageVariant]:
+        futures = {
+            blob: executor.submit(render_variants, str(blob.path), os.path.join(settings.STATIC_ROOT, blob.variants_folder),
+                                  blob.hash, self.widths, self.formats, self.quality)
+            for blob in batch
+        }
+
+        variants = []
+        for blob, future in futures.items():
+            try:
+                rendered = future.result()
+            except (OSError, ValueError) as e:
+                print(f'Error resizing {blob.path} ({e})')
+                stats['failed'] += 1
+                continue
+            stats['blobs'] += 1
+            variants.extend(
+                ImageVariant(blob_id=blob.hash, width=width, height=height, format=fmt,
+                             url=f'{settings.IMAGE_STATIC_URL}{blob.variants_folder}/{filename}')
+                for width, height, fmt, filename in rendered
+            )
+        return variants
@@ -0,0 +1,212 @@
+import hashlib
+import os
+import pathlib
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple, Type, Union
+from urllib.parse import urlparse
+
+import requests
+from django.conf import settings
+from django.core.files.images import get_image_dimensions
+from django.db import transaction
+from django.db.models import F
+from requests.adapters import HTTPAdapter
+
+from api.images import IMAGE_MODELS, RunStats, partial_file
+from api.models import ImageBlob
+from api.models.image_model import ImageBase
+
+from .http_client import RETRY_STATUSES, get_backoff
+
+
+class ImageDownloader:
+    """Pooled downloader of the pending images
+
+    The images are saved as pending with their source url, this downloads them concurrently
+    with a limit of open requests per host and fills their dimensions in batches. Each file is
+    stored once by the sha256 of its content, so sources already stored are not downloaded again.
+
+    Args:
+        max_workers (int, optional): images downloaded at the same time. Defaults to 16.
+        per_host (int, optional): max open requests to the same host. Defaults to 8.
+        timeout (Union[float, Tuple[float, float]], optional): connect and read timeout. Defaults to (5, 30).
+        max_retries (int, optional): retries allowed on 429/5xx or connection errors. Defaults to 3.
+        backoff (float, optional): base seconds of the exponential backoff. Defaults to 0.5.
+        batch_size (int, optional): images downloaded before their rows are updated. Defaults to 200.
+    """
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(
+        self,
+        max_workers: int = 16,
+        per_host: int = 8,
+        timeout: Union[float, Tuple[float, float]] = (5, 30),
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        batch_size: int = 200,
+    ):
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.batch_size = batch_size
+        self.stats = RunStats('downloaded', 'existing', 'deduplicated', 'failed', 'retries', 'bytes')
+        self._hosts: Dict[str, threading.BoundedSemaphore] = {}
+        self._hosts_lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def run(self, models: Optional[Iterable[Type[ImageBase]]] = None) -> RunStats:
+        """Download the pending images of the models
+
+        Args:
+            models (Optional[Iterable[Type[ImageBase]]], optional): image models to download. Defaults to all.
+
+        Returns:
+            RunStats: counters of the run
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for model in models or IMAGE_MODELS:
+                pending = model.objects.filter(state=ImageBase.State.PENDING).select_related('blob').order_by('pk')
+                last_pk = 0
+                while batch := list(pending.filter(pk__gt=last_pk)[:self.batch_size]):
+                    last_pk = batch[-1].pk
+                    self._download_batch(executor, model, batch)
+        return self.stats
+
+    def _download_batch(self, executor: ThreadPoolExecutor, model: Type[ImageBase], batch: List[ImageBase]):
+        """Download each distinct source once and update the images and the reference count of their blobs"""
+        sources: Dict[Union[str, int], List[ImageBase]] = defaultdict(list)
+        for image in batch:
+            sources[image.source_url or image.pk].append(image)
+        known = {
+            image.source_url: image.blob
+            for image in ImageBase.objects.filter(source_url__in=[s for s in sources if isinstance(s, str)],
+                                                  blob__isnull=False).select_related('blob')
+        }
+
+        results = executor.map(lambda images: self.download(images[0], known.get(images[0].source_url)),
+                               sources.values())
+        stored, refs = {}, Counter()
+        for images, result in zip(sources.values(), results):
+            for image in images:
+                if result is None:
+                    image.state = ImageBase.State.FAILED
+                    continue
+                blob, image.width, image.height = result
+                stored[blob.hash] = blob
+                if image.blob_id != blob.hash:
+                    refs[blob.hash] += 1
+                    if image.blob_id:
+                        refs[image.blob_id] -= 1
+                image.blob_id, image.url, image.state = blob.hash, blob.url, ImageBase.State.READY
+
+        with transaction.atomic():
+            ImageBlob.objects.bulk_create(stored.values(), ignore_conflicts=True)
+            for blob_hash, count in refs.items():
+                if count:
+                    ImageBlob.objects.filter(hash=blob_hash).update(ref_count=F('ref_count') + count)
+            model.objects.bulk_update(batch, ['width', 'height', 'state', 'blob', 'url'])
+
+    def download(self, image: ImageBase, blob: Optional[ImageBlob] = None) -> Optional[Tuple[ImageBlob, int, int]]:
+        """Store the image in its blob, downloading it only when its content is not known yet
+
+        Args:
+            image (ImageBase): pending image
+            blob (Optional[ImageBlob], optional): blob already stored for the same source url. Defaults to None.
+
+        Returns:
+            Optional[Tuple[ImageBlob, int, int]]: blob, width and height of the image, None when it failed
+        """
+        try:
+            if blob is not None and blob.path.exists():
+                self.stats.count('deduplicated')
+            elif image.blob_id and image.blob.path.exists():
+                blob = image.blob
+                self.stats.count('existing')
+            elif image.legacy_path.exists():
+                blob = self._store_file(image.legacy_path, image.file_ext)
+                self.stats.count('existing')
+            elif image.source_url:
+                blob = self._fetch(image.source_url, image.file_ext)
+                self.stats.count('downloaded')
+            else:
+                raise ValueError('missing source url')
+
+            width, height = get_image_dimensions(str(blob.path))
+            if width is None:
+                raise ValueError('unreadable image')
+            return blob, width, height
+        except (requests.RequestException, OSError, ValueError) as e:
+            print('Error getting:', image.source_url, f'for {image.folder_name} image ({e})')
+            self.stats.count('failed')
+            return None
+
+    def _fetch(self, url: str, ext: str) -> ImageBlob:
+        host = urlparse(url).netloc
+        for attempt in range(self.max_retries + 1):
+            response, error = None, None
+            try:
+                with self._host_slot(host), self.session.get(url, stream=True, timeout=self.timeout) as response:
+                    if response.status_code not in RETRY_STATUSES:
+                        response.raise_for_status()
+                        return self._write(response, ext)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                response, error = None, e
+            if attempt == self.max_retries:
+                break
+            self.stats.count('retries')
+            time.sleep(get_backoff(attempt, response, self.backoff))
+
+        if error is not None:
+            raise error
+        response.raise_for_status()
+
+    def _write(self, response: requests.Response, ext: str) -> ImageBlob:
+        """Stream the response to a temporary file hashing its content, so no partial image is left"""
+        root = pathlib.Path(settings.STATIC_ROOT).joinpath('blobs')
+        root.mkdir(parents=True, exist_ok=True)
+        digest, size = hashlib.sha256(), 0
+        with partial_file(root) as (handle, tmp_path):
+            with handle:
+                for block in response.iter_content(self.CHUNK_SIZE):
+                    handle.write(block)
+                    digest.update(block)
+                    size += len(block)
+            self.stats.count('bytes', size)
+            return self._commit(tmp_path, digest.hexdigest(), ext, size)
+
+    def _store_file(self, path: pathlib.Path, ext: str) -> ImageBlob:
+        """Move a file stored by filename to its blob"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as handle:
+            while block := handle.read(self.CHUNK_SIZE):
+                digest.update(block)
+        return self._commit(path, digest.hexdigest(), ext, path.stat().st_size)
+
+    def _commit(self, path: pathlib.Path, content_hash: str, ext: str, size: int) -> ImageBlob:
+        """Rename the file to its sharded blob path
+
+        A file already stored with the same hash is replaced with the same content, so a blob
+        found broken by the verifier is repaired when any of its images is downloaded again.
+        """
+        blob = ImageBlob(hash=content_hash, ext=ext, size=size)
+        blob.path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(path, blob.path)
+        return blob
+
+    def _host_slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._hosts_lock:
+            if host not in self._hosts:
+                self._hosts[host] = threading.BoundedSemaphore(self.per_host)
+            return self._hosts[host]
+
+    def close(self):
+        self.session.close()
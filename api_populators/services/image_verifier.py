@@ -0,0 +1,118 @@
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import suppress
+from typing import Iterable, List, Optional, Tuple, Type
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from PIL import Image
+
+from api.images import IMAGE_MODELS, RunStats
+from api.models import ImageBlob
+from api.models.image_model import ImageBase
+
+
+def inspect_image(path: str, deep: bool = False) -> Tuple[Optional[str], Optional[int], Optional[int], int]:
+    """Check that the file of an image exists and can be decoded, run in the worker processes
+
+    Args:
+        path (str): path of the image.
+        deep (bool, optional): decode every pixel, slower but finds truncated images. Defaults to False.
+
+    Returns:
+        Tuple[Optional[str], Optional[int], Optional[int], int]: problem found, width, height and size of the file
+    """
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return 'missing', None, None, 0
+    if not size:
+        return 'empty', None, None, 0
+    try:
+        with Image.open(path) as image:
+            width, height = image.size
+            if deep:
+                image.load()
+            else:
+                image.verify()
+    except (OSError, SyntaxError, ValueError, Image.DecompressionBombError):
+        return 'undecodable', None, None, size
+    return None, width, height, size
+
+
+class ImageVerifier:
+    """Verify the files of the ready images in a process pool and repair the broken ones
+
+    The images with a missing, empty, undecodable or truncated file are queued again to be
+    downloaded and the stored dimensions that do not match the file are updated. A broken image
+    only drops its reference to the blob, which is shared by the images of the same content, and
+    `collect_blobs` removes the file once no image references it. The files stored by filename
+    before the blobs are only read by the downloader, so the broken ones are removed.
+
+    Args:
+        processes (Optional[int], optional): worker processes, one per CPU when None. Defaults to None.
+        batch_size (int, optional): images verified before their rows are updated. Defaults to 1000.
+        deep (bool, optional): decode every pixel of the images. Defaults to False.
+    """
+
+    def __init__(self, processes: Optional[int] = None, batch_size: int = 1000, deep: bool = False):
+        self.processes = processes
+        self.batch_size = batch_size
+        self.deep = deep
+        self.stats = RunStats('checked')
+        self.problems: List[Tuple[str, int, str, str]] = []
+
+    def run(self, models: Optional[Iterable[Type[ImageBase]]] = None, repair: bool = True) -> RunStats:
+        """Verify the ready images of the models
+
+        Args:
+            models (Optional[Iterable[Type[ImageBase]]], optional): image models to verify. Defaults to all.
+            repair (bool, optional): requeue the broken images and fix the dimensions. Defaults to True.
+
+        Returns:
+            RunStats: images checked and found per problem
+        """
+        with ProcessPoolExecutor(max_workers=self.processes) as executor:
+            for model in models or IMAGE_MODELS:
+                images = model.objects.filter(state=ImageBase.State.READY).select_related('blob').order_by('pk')
+                last_pk = 0
+                while batch := list(images.filter(pk__gt=last_pk)[:self.batch_size]):
+                    last_pk = batch[-1].pk
+                    self._verify_batch(executor, model, batch, repair)
+        return self.stats
+
+    def _verify_batch(self, executor: ProcessPoolExecutor, model: Type[ImageBase], batch: List[ImageBase],
+                      repair: bool):
+        paths = [str(image.file_path) for image in batch]
+        results = executor.map(inspect_image, paths, [self.deep] * len(paths), chunksize=64)
+        broken, resized = [], []
+        for image, path, (problem, width, height, size) in zip(batch, paths, results):
+            self.stats['checked'] += 1
+            if problem is None and image.blob_id and image.blob.size != size:
+                problem = 'truncated'
+            if problem is None and (image.width, image.height) != (width, height):
+                problem = 'dimensions'
+                image.width, image.height = width, height
+                resized.append(image)
+            elif problem is not None:
+                image.state = ImageBase.State.PENDING
+                broken.append((image, path))
+            if problem is not None:
+                self.stats[problem] += 1
+                self.problems.append((model.__name__, image.pk, path, problem))
+
+        if not repair:
+            return
+        refs = Counter(image.blob_id for image, _ in broken if image.blob_id)
+        for image, path in broken:
+            if not image.blob_id:
+                with suppress(FileNotFoundError):
+                    os.unlink(path)
+            image.blob = None
+        with transaction.atomic():
+            model.objects.bulk_update([image for image, _ in broken], ['state', 'blob'])
+            for blob_hash, count in refs.items():
+                ImageBlob.objects.filter(hash=blob_hash).update(ref_count=Greatest(F('ref_count') - count, 0))
+            model.objects.bulk_update(resized, ['width', 'height'])
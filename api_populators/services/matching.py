@@ -0,0 +1,52 @@
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import List, Optional
+
+
+class TitleMatcher:
+    """Find the most similar of a list of titles
+
+    The titles are stripped once and the similarity is the `SequenceMatcher` ratio, so the
+    matches are the same as comparing every pair. Titles whose ratio can not be over the
+    threshold or the best match found are discarded with cheap upper bounds before computing it:
+    the lengths of both titles and then their characters in common.
+
+    Args:
+        titles (List[str]): titles to match against.
+        threshold (float, optional): min ratio of a match, not included. Defaults to 0.8.
+    """
+
+    def __init__(self, titles: List[str], threshold: float = 0.8):
+        self.titles = [title.strip() for title in titles]
+        self.threshold = threshold
+        self._chars = [Counter(title) for title in self.titles]
+
+    def match(self, title: str) -> Optional[int]:
+        """Index of the most similar title, the first one on ties
+
+        Args:
+            title (str): title to match.
+
+        Returns:
+            Optional[int]: index of the title, None when no ratio is over the threshold
+        """
+        title = title.strip()
+        matcher = SequenceMatcher(None)
+        matcher.set_seq2(title)
+        chars = None
+        best_index, best_ratio = None, self.threshold
+        for index, candidate in enumerate(self.titles):
+            length = len(candidate) + len(title)
+            if not length:
+                ratio = 1.0
+            else:
+                if 2.0 * min(len(candidate), len(title)) / length <= best_ratio:
+                    continue
+                chars = chars or Counter(title)
+                if 2.0 * sum((self._chars[index] & chars).values()) / length <= best_ratio:
+                    continue
+                matcher.set_seq1(candidate)
+                ratio = matcher.ratio()
+            if ratio > best_ratio:
+                best_index, best_ratio = index, ratio
+        return best_index
@@ -0,0 +1,108 @@
+import asyncio
+import time
+from concurrent import futures
+from typing import Any, Callable, Dict, List, Union
+
+
+class SeedPipeline:
+    """Producer/consumer pipeline that overlaps fetching pages and writing them to the database
+
+    Fetchers page through the API and push every batch onto a bounded queue, writers consume
+    the batches concurrently. When the queue is full the fetchers wait, so the network can't
+    outrun the database.
+
+    Args:
+        fetch_page (Callable[[int, int], List[Dict]]): blocking function called with (offset, limit).
+        write_batch (Callable[[List[Dict]], Any]): blocking function that stores a batch of games.
+        total (int): total of items to fetch.
+        page_size (int, optional): items per page. Defaults to 500.
+        fetchers (int, optional): concurrent fetchers. Defaults to 4.
+        writers (int, optional): concurrent database writers. Defaults to 2.
+        queue_size (int, optional): max batches waiting to be written. Defaults to 4.
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[int, int], List[Dict]],
+        write_batch: Callable[[List[Dict]], Any],
+        total: int,
+        page_size: int = 500,
+        fetchers: int = 4,
+        writers: int = 2,
+        queue_size: int = 4,
+    ):
+        self.fetch_page = fetch_page
+        self.write_batch = write_batch
+        self.total = total
+        self.page_size = page_size
+        self.fetchers = fetchers
+        self.writers = writers
+        self.queue_size = queue_size
+        self.stats = {
+            'pages': 0,
+            'items': 0,
+            'fetch_errors': 0,
+            'write_errors': 0,
+            'fetch_time': 0.0,
+            'write_time': 0.0,
+            'wall_time': 0.0,
+        }
+
+    def run(self) -> Dict[str, Union[int, float]]:
+        """Run the pipeline until every page is fetched and written
+
+        Returns:
+            Dict[str, Union[int, float]]: counters and timings of the run
+        """
+        start = time.perf_counter()
+        asyncio.run(self._run())
+        self.stats['wall_time'] = time.perf_counter() - start
+        return self.stats
+
+    async def _run(self):
+        offsets: asyncio.Queue = asyncio.Queue()
+        for offset in range(0, self.total, self.page_size):
+            offsets.put_nowait(offset)
+        batches: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        with futures.ThreadPoolExecutor(max_workers=self.fetchers) as fetch_executor, \
+                futures.ThreadPoolExecutor(max_workers=self.writers) as write_executor:
+            fetchers = [asyncio.create_task(self._fetch(offsets, batches, fetch_executor)) for _ in range(self.fetchers)]
+            writers = [asyncio.create_task(self._write(batches, write_executor)) for _ in range(self.writers)]
+
+            await asyncio.gather(*fetchers)
+            for _ in writers:
+                await batches.put(None)
+            await asyncio.gather(*writers)
+
+    async def _fetch(self, offsets: asyncio.Queue, batches: asyncio.Queue, executor: futures.Executor):
+        loop = asyncio.get_running_loop()
+        while not offsets.empty():
+            offset = offsets.get_nowait()
+            limit = min(self.total - offset, self.page_size)
+            start = time.perf_counter()
+            try:
+                batch = await loop.run_in_executor(executor, self.fetch_page, offset, limit)
+            except Exception as e:
+                self.stats['fetch_errors'] += 1
+                print(f"Failed to fetch games starting from offset {offset}: {e}")
+                continue
+            finally:
+                self.stats['fetch_time'] += time.perf_counter() - start
+
+            if batch:
+                self.stats['pages'] += 1
+                await batches.put(batch)
+
+    async def _write(self, batches: asyncio.Queue, executor: futures.Executor):
+        loop = asyncio.get_running_loop()
+        while (batch := await batches.get()) is not None:
+            start = time.perf_counter()
+            try:
+                await loop.run_in_executor(executor, self.write_batch, batch)
+                self.stats['items'] += len(batch)
+            except Exception as e:
+                self.stats['write_errors'] += 1
+                print(f"Failed to write a batch of {len(batch)} games: {e}")
+            finally:
+                self.stats['write_time'] += time.perf_counter() - start
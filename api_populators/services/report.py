@@ -0,0 +1,91 @@
+import threading
+from typing import Dict, Union
+
+
+class SeedReport:
+    """Summary of a seeding run, safe to update from threads and to merge across processes"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.workers = 1
+        self.games = 0
+        self.failed = 0
+        self.commits = 0
+        self.retries = 0
+        self.fetched = 0
+        self.fetch_errors = 0
+        self.linked = 0
+        self.commit_time = 0.0
+        self.max_commit_time = 0.0
+        self.elapsed = 0.0
+
+    def games_populated(self, count: int = 1):
+        with self._lock:
+            self.games += count
+
+    def games_failed(self, count: int = 1):
+        with self._lock:
+            self.failed += count
+
+    def chunk_committed(self, latency: float):
+        with self._lock:
+            self.commits += 1
+            self.commit_time += latency
+            self.max_commit_time = max(self.max_commit_time, latency)
+
+    def chunk_retried(self):
+        with self._lock:
+            self.retries += 1
+
+    def games_fetched(self, count: int):
+        with self._lock:
+            self.fetched += count
+
+    def fetch_failed(self, count: int = 1):
+        with self._lock:
+            self.fetch_errors += count
+
+    def relations_linked(self, count: int):
+        with self._lock:
+            self.linked += count
+
+    def merge(self, other: 'SeedReport'):
+        """Add the counters of another report (e.g. from a worker process) to this one"""
+        with self._lock:
+            self.games += other.games
+            self.failed += other.failed
+            self.commits += other.commits
+            self.retries += other.retries
+            self.fetched += other.fetched
+            self.fetch_errors += other.fetch_errors
+            self.linked += other.linked
+            self.commit_time += other.commit_time
+            self.max_commit_time = max(self.max_commit_time, other.max_commit_time)
+            self.elapsed = max(self.elapsed, other.elapsed)
+
+    def to_dict(self) -> Dict[str, Union[int, float]]:
+        return {
+            'workers': self.workers,
+            'games': self.games,
+            'failed': self.failed,
+            'commits': self.commits,
+            'retries': self.retries,
+            'fetched': self.fetched,
+            'fetch_errors': self.fetch_errors,
+            'linked': self.linked,
+            'avg_commit_ms': round(self.commit_time / self.commits * 1000, 3) if self.commits else 0.0,
+            'max_commit_ms': round(self.max_commit_time * 1000, 3),
+            'elapsed': round(self.elapsed, 3),
+        }
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        return ', '.join(f'{k}={v}' for k, v in self.to_dict().items())
@@ -0,0 +1,142 @@
+import gzip
+import hashlib
+import json
+import os
+import pathlib
+import tempfile
+import threading
+import time
+from typing import Any, Optional, Union
+
+
+class CacheMissError(LookupError):
+    """Raised when a response is not cached and the API can't be reached (offline mode)"""
+
+
+class ResponseCache:
+    """Content-addressed cache of API responses stored as gzip compressed JSON files
+
+    Every response is stored in `<directory>/<endpoint>/<sha256 of the query>.json.gz`
+    with the time it was fetched, which the ttl is measured from. Reading a response only
+    refreshes the access time of its file, so the least recently used files are the first
+    ones removed when the cache grows over `max_size`. The stored bytes are
+    counted as the responses are written and the directory is only scanned when the count
+    goes over `max_size`, then the files are evicted down to `EVICT_TO` of it, so the next
+    scans are amortized over many writes.
+
+    Args:
+        directory (Union[str, pathlib.Path]): folder where the responses are stored.
+        ttl (float, optional): seconds a response is valid, None never expires. Defaults to None.
+        max_size (int, optional): max bytes stored, None never evicts. Defaults to None.
+    """
+    EVICT_TO = 0.8
+
+    def __init__(self, directory: Union[str, pathlib.Path], ttl: Optional[float] = None, max_size: Optional[int] = None):
+        self.directory = pathlib.Path(directory)
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def path(self, endpoint: str, data: str) -> pathlib.Path:
+        endpoint = endpoint.strip('/')
+        digest = hashlib.sha256(f'{endpoint}\n{data}'.encode()).hexdigest()
+        return self.directory.joinpath(endpoint.replace('/', '_'), f'{digest}.json.gz')
+
+    def get(self, endpoint: str, data: str, ignore_ttl: bool = False) -> Any:
+        """Get a cached response
+
+        Args:
+            endpoint (str): endpoint of the API.
+            data (str): body of the request.
+            ignore_ttl (bool, optional): return expired responses too. Defaults to False.
+
+        Raises:
+            CacheMissError: when the response isn't cached or it's expired.
+
+        Returns:
+            Any: decoded JSON response
+        """
+        path = self.path(endpoint, data)
+        try:
+            with gzip.open(path, 'rt', encoding='utf8') as cached_file:
+                cached = json.load(cached_file)
+            if isinstance(cached, dict) and 'fetched_at' in cached:
+                fetched_at, response = cached['fetched_at'], cached['response']
+            else:
+                # Written without its fetch time, only replayed when the ttl is ignored
+                fetched_at, response = float('-inf'), cached
+            if self.ttl is not None and time.time() - fetched_at > self.ttl and not ignore_ttl:
+                raise FileNotFoundError(path)
+            # The modification time stays the time the response was written
+            os.utime(path, (time.time(), path.stat().st_mtime))
+        except (FileNotFoundError, EOFError, json.JSONDecodeError) as e:
+            self.misses += 1
+            raise CacheMissError(f'No cached response for "{endpoint}" with query: {data}') from e
+
+        self.hits += 1
+        return response
+
+    def set(self, endpoint: str, data: str, response: Any):
+        """Store a response, replacing the file atomically so readers never see partial files
+
+        Args:
+            endpoint (str): endpoint of the API.
+            data (str): body of the request.
+            response (Any): decoded JSON response.
+        """
+        path = self.path(endpoint, data)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handle, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as raw_file, gzip.GzipFile(fileobj=raw_file, mode='wb') as cached_file:
+                cached_file.write(json.dumps({'fetched_at': time.time(), 'response': response}).encode('utf8'))
+            written = os.path.getsize(tmp_path)
+            replaced = path.stat().st_size if path.exists() else 0
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        if self.max_size is None:
+            return
+        with self._lock:
+            if self.size is not None:
+                self.size += written - replaced
+            over_limit = self.size is None or self.size > self.max_size
+        if over_limit:
+            self.evict(int(self.max_size * self.EVICT_TO) if self.size is not None else None)
+
+    def evict(self, target_size: Optional[int] = None):
+        """Remove the expired files and then the least recently used ones until the cache fits in max_size
+
+        The files are expired by their modification time, the time they were written, and ordered by
+        their access time, the time they were last read.
+
+        Args:
+            target_size (int, optional): bytes kept when evicting, below max_size to leave room for the next
+                responses. Defaults to max_size.
+        """
+        target_size = self.max_size if target_size is None else target_size
+        with self._lock:
+            now = time.time()
+            files = []
+            for path in self.directory.glob('*/*.json.gz'):
+                with_stat = path.stat()
+                if self.ttl is not None and now - with_stat.st_mtime > self.ttl:
+                    path.unlink(missing_ok=True)
+                    continue
+                files.append((max(with_stat.st_atime, with_stat.st_mtime), with_stat.st_size, path))
+
+            total_size = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if target_size is None or total_size <= target_size:
+                    break
+                path.unlink(missing_ok=True)
+                total_size -= size
+            self.size = total_size
+
+    def __str__(self):
+        return f'hits={self.hits}, misses={self.misses}'
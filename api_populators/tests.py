@@ -1,10 +1,611 @@
-from django.test import TestCase
+import gzip
+import hashlib
+import io
+import json
+import multiprocessing.pool
+import os
+import random
+import tempfile
+import threading
+import time
+from difflib import SequenceMatcher
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import requests
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.utils import OperationalError
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from PIL import Image
+
+from api.models import Collection, Cover, Game, Genre, ImageBlob, Language, Platform
+from api.schemas import (CoverSchema, GameModeSchema, GameSchema, GenreSchema, KeywordSchema, LanguageSchema, PlatformSchema,
+                         PlayerPerspectiveSchema, ThemeSchema, ThumbnailSchema)
+
+from .management.commands.collect_blobs import Command as CollectBlobsCommand
+from .management.commands.explain_filters import Command as ExplainFiltersCommand
+from .management.commands.fetch import IGDBAPI
+from .management.commands.seed import IGDBPopulator
 from .models import PlatformType
+from .services import (CacheMissError, IGDBClient, ImageDerivativeGenerator, ImageDownloader, ImageVerifier,
+                       ResponseCache, SeedPipeline, TitleMatcher, TokenBucket)
 
 # Create your tests here.
 
 
+class StaticRootMixin:
+    """Points STATIC_ROOT to a temporary directory removed after each test"""
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        static_root = override_settings(STATIC_ROOT=directory.name)
+        static_root.enable()
+        self.addCleanup(static_root.disable)
+
+
+class FakeServerMixin:
+    """Serves a fake HTTP handler in a background thread until the end of each test"""
+
+    def start_server(self, handler, **attributes):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        server.lock = threading.Lock()
+        server.received = []
+        for name, value in attributes.items():
+            setattr(server, name, value)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+
 class PlatformTest(TestCase):
     def test_type(self):
         platform_type = PlatformType(2)
         self.assertEqual(platform_type.name, 'ARCADE')
+
+
+class FakeIGDBHandler(BaseHTTPRequestHandler):
+    """Fake IGDB endpoint that throttles the first requests"""
+    throttled_requests = 0
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length'])).decode()
+        server = self.server
+        with server.lock:
+            server.received.append((self.path, body, time.monotonic()))
+            throttle = len(server.received) <= self.throttled_requests
+
+        if throttle:
+            self.send_response(429)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        content = json.dumps([{'id': len(server.received), 'query': body}]).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class IGDBClientTest(FakeServerMixin, SimpleTestCase):
+    def start_igdb(self, throttled_requests: int = 0):
+        server, base_url = self.start_server(type('Handler', (FakeIGDBHandler,), {'throttled_requests': throttled_requests}))
+        return server, f'{base_url}/v4'
+
+    def test_retries_throttled_requests(self):
+        server, base_url = self.start_igdb(throttled_requests=2)
+        client = IGDBClient(base_url, rate=100, backoff=0.01)
+
+        response = client.post('/games', 'fields *;')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]['query'], 'fields *;')
+        self.assertEqual(len(server.received), 3)
+        self.assertEqual(client.stats.retries, 2)
+        self.assertEqual(client.stats.throttled, 2)
+
+    def test_gives_up_after_max_retries(self):
+        server, base_url = self.start_igdb(throttled_requests=10)
+        client = IGDBClient(base_url, rate=100, max_retries=1, backoff=0.01)
+
+        response = client.post('games', 'fields *;')
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(len(server.received), 2)
+
+    def test_stays_under_rate_limit(self):
+        server, base_url = self.start_igdb()
+        client = IGDBClient(base_url, rate=20, max_concurrency=4)
+
+        threads = [threading.Thread(target=client.post, args=('games', 'fields *;')) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        times = sorted(received[2] for received in server.received)
+        self.assertEqual(client.stats.succeeded, 10)
+        self.assertLessEqual(client.stats.max_in_flight, 4)
+        self.assertLessEqual((len(times) - 1) / (times[-1] - times[0]), 20 * 1.1)
+
+    def test_token_bucket_waits_for_tokens(self):
+        bucket = TokenBucket(rate=50)
+        start = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 5 / 50 * 0.9)
+
+
+class SeedPipelineTest(SimpleTestCase):
+    def test_writes_every_page_with_backpressure(self):
+        lock = threading.Lock()
+        fetched, written = [], []
+        max_ahead = 0
+
+        def fetch_page(offset, limit):
+            nonlocal max_ahead
+            with lock:
+                fetched.append(offset)
+                max_ahead = max(max_ahead, len(fetched) - len(written))
+            return [{'id': i} for i in range(offset, offset + limit)]
+
+        def write_batch(batch):
+            time.sleep(0.01)
+            with lock:
+                written.append(batch[0]['id'])
+
+        pipeline = SeedPipeline(fetch_page, write_batch, total=1050, page_size=100, fetchers=3, writers=2, queue_size=2)
+        stats = pipeline.run()
+
+        self.assertEqual(sorted(written), list(range(0, 1050, 100)))
+        self.assertEqual(stats['items'], 1050)
+        self.assertLessEqual(max_ahead, 2 + 3 + 2)
+
+
+@override_settings(IGDB_SEED_RETRY_BACKOFF=0, IGDB_SEED_MAX_RETRIES=2)
+class PopulatorChunkTest(TransactionTestCase):
+    games = [{'id': i, 'name': f'Game {i}', 'category': 0} for i in range(5)]
+
+    def test_retries_only_the_failed_chunk(self):
+        populate_game = IGDBPopulator.populate_game
+        calls = []
+
+        def flaky_populate_game(populator, game, slug=None):
+            calls.append(game['name'])
+            if calls.count('Game 3') == 1 and game['name'] == 'Game 3':
+                raise OperationalError('deadlock detected')
+            return populate_game(populator, game, slug)
+
+        with mock.patch.object(IGDBPopulator, 'populate_game', flaky_populate_game):
+            populator = IGDBPopulator(None, self.games, max_workers=1, chunk_size=2)
+
+        self.assertEqual(populator.report.games, 5)
+        self.assertEqual(populator.report.retries, 1)
+        self.assertEqual(populator.report.commits, 3)
+        self.assertEqual(calls.count('Game 2'), 2)
+        self.assertEqual(calls.count('Game 0'), 1)
+        self.assertEqual(Game.objects.count(), 5)
+
+    def test_gives_up_after_max_retries(self):
+        with mock.patch.object(IGDBPopulator, 'populate_game', side_effect=OperationalError('deadlock detected')):
+            populator = IGDBPopulator(None, self.games, max_workers=1, chunk_size=5)
+
+        self.assertEqual(populator.report.failed, 5)
+        self.assertEqual(populator.report.retries, 2)
+        self.assertEqual(Game.objects.count(), 0)
+
+    def test_reuses_the_thread_connection_across_chunks(self):
+        connect = BaseDatabaseWrapper.connect
+        with mock.patch.object(BaseDatabaseWrapper, 'connect', autospec=True, side_effect=connect) as connects:
+            populator = IGDBPopulator(None, self.games, max_workers=1, chunk_size=2)
+
+        self.assertEqual(populator.report.commits, 3)
+        self.assertEqual(connects.call_count, 1)
+        self.assertEqual(populator.executor.worker_connections, [])
+
+    def test_skips_empty_batches_in_pool_mode(self):
+        populator = IGDBPopulator(None, self.games, max_workers=1)
+        populator.processes = 2
+        with multiprocessing.pool.ThreadPool(1) as pool:
+            populator._write_games([], pool)
+
+        self.assertEqual(populator.report.games, 5)
+
+
+@override_settings(IGDB_PAGE_SIZE=2)
+class ParsedGamesTest(TransactionTestCase):
+    def test_links_parsed_games_fetching_missing_ones_in_batches(self):
+        igdb_api = mock.Mock()
+        igdb_api.fetch_games.side_effect = lambda limit, ids: [
+            {'id': igdb_id, 'name': f'Game {igdb_id}', 'category': 1, 'dlcs': [1, 99]} for igdb_id in ids
+        ]
+        games = [
+            {'id': 1, 'name': 'Game 1', 'category': 0, 'dlcs': [10, 11], 'similar_games': [2, 12]},
+            {'id': 2, 'name': 'Game 2', 'category': 0, 'remakes': [10]},
+        ]
+
+        populator = IGDBPopulator(igdb_api, games, max_workers=1)
+
+        self.assertEqual(igdb_api.fetch_games.call_count, 2)
+        self.assertEqual(populator.report.fetched, 3)
+        game = Game.objects.get(igdb_id=1)
+        self.assertEqual(sorted(game.dlcs.values_list('igdb_id', flat=True)), [10, 11, 12])
+        self.assertEqual(sorted(game.similar_games.values_list('igdb_id', flat=True)), [2, 12])
+        self.assertEqual(list(Game.objects.get(igdb_id=10).remakes.values_list('igdb_id', flat=True)), [2])
+
+    def test_links_the_other_batches_when_a_fetch_fails(self):
+        def fetch_games(limit, ids):
+            if 10 in ids:
+                raise requests.HTTPError('Request "games" failed with status code 500')
+            return [{'id': igdb_id, 'name': f'Game {igdb_id}', 'category': 1} for igdb_id in ids]
+
+        igdb_api = mock.Mock()
+        igdb_api.fetch_games.side_effect = fetch_games
+        games = [{'id': 1, 'name': 'Game 1', 'category': 0, 'dlcs': [10, 11, 12, 13]}]
+
+        populator = IGDBPopulator(igdb_api, games, max_workers=1)
+
+        self.assertEqual((populator.report.fetched, populator.report.fetch_errors), (2, 1))
+        self.assertEqual(sorted(Game.objects.get(igdb_id=1).dlcs.values_list('igdb_id', flat=True)), [12, 13])
+
+    def test_raises_on_failed_requests(self):
+        client = mock.Mock()
+        client.post.return_value.status_code = 401
+        with self.assertRaises(requests.HTTPError):
+            IGDBAPI(client=client).fetch_games(limit=10)
+
+    def test_fetches_each_collection_once(self):
+        igdb_api = mock.Mock()
+        igdb_api.fetch_games.side_effect = lambda limit, ids: [
+            {'id': igdb_id, 'name': f'Game {igdb_id}', 'category': 0, 'collection': self.collection} for igdb_id in ids
+        ]
+        self.collection = {'id': 7, 'name': 'Saga', 'games': [1, 2, 3, 4]}
+        games = [
+            {'id': 1, 'name': 'Game 1', 'category': 0, 'collection': self.collection},
+            {'id': 2, 'name': 'Game 2', 'category': 0, 'collection': self.collection},
+        ]
+
+        IGDBPopulator(igdb_api, games, max_workers=1)
+
+        igdb_api.fetch_games.assert_called_once_with(limit=2, ids=[3, 4])
+        collection = Collection.objects.get(igdb_id=7)
+        self.assertEqual(sorted(collection.games.values_list('igdb_id', flat=True)), [1, 2, 3, 4])
+
+
+class ReseedTest(TransactionTestCase):
+    responses = {
+        'platforms': [{'id': 6, 'name': 'PC (Microsoft Windows)', 'category': 6, 'abbreviation': 'PC'}],
+        'languages': [{'id': 7, 'locale': 'en-US', 'name': 'English', 'native_name': 'English (US)'}],
+    }
+
+    def test_claims_the_rows_seeded_without_igdb_id(self):
+        platform = Platform.objects.create(name='PC (Microsoft Windows)')
+        language = Language.objects.create(locale='en-US', name='English', native_name='English (US)')
+        game = Game.objects.create(title='Old Game')
+        genre = Genre.objects.create(name='Shooter')
+        collection = Collection.objects.create(name='Saga')
+        igdb_api = IGDBAPI(client=mock.Mock())
+        igdb_api.fetch_games = mock.Mock(return_value=[])
+        games = [{
+            'id': 5, 'name': 'Old Game', 'category': 0,
+            'genres': [{'id': 3, 'name': 'Shooter'}], 'collection': {'id': 8, 'name': 'Saga', 'games': [5]},
+        }]
+
+        with mock.patch.object(IGDBAPI, '_post_request', side_effect=lambda endpoint: self.responses[endpoint]):
+            igdb_api._populate_platforms()
+            igdb_api._populate_languages()
+        IGDBPopulator(igdb_api, games, max_workers=1)
+
+        self.assertEqual(list(Platform.objects.values_list('pk', 'igdb_id', 'abbreviation')), [(platform.pk, 6, 'PC')])
+        self.assertEqual(list(Language.objects.values_list('pk', 'igdb_id')), [(language.pk, 7)])
+        self.assertEqual(list(Game.objects.values_list('pk', 'igdb_id', 'slug')), [(game.pk, 5, 'old-game')])
+        self.assertEqual(list(Genre.objects.values_list('pk', 'igdb_id')), [(genre.pk, 3)])
+        self.assertEqual(list(Collection.objects.values_list('pk', 'igdb_id')), [(collection.pk, 8)])
+        self.assertEqual(list(game.genres.all()), [genre])
+        self.assertEqual(list(collection.games.all()), [game])
+
+    def test_keeps_the_igdb_ids_out_of_the_api(self):
+        for schema in (GameSchema, GenreSchema, KeywordSchema, ThemeSchema, GameModeSchema, PlayerPerspectiveSchema,
+                       PlatformSchema, LanguageSchema):
+            self.assertNotIn('igdb_id', schema.__fields__, schema)
+
+
+class ResponseCacheTest(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_expired_responses_are_misses(self):
+        cache = ResponseCache(self.directory, ttl=60)
+        cache.set('/games', 'fields *; limit 500;', [{'id': 1}])
+        self.assertEqual(cache.get('games', 'fields *; limit 500;'), [{'id': 1}])
+
+        now = time.time()
+        with mock.patch('time.time', return_value=now + 45):
+            self.assertEqual(cache.get('games', 'fields *; limit 500;'), [{'id': 1}])
+        with mock.patch('time.time', return_value=now + 90), self.assertRaises(CacheMissError):
+            cache.get('games', 'fields *; limit 500;')
+        self.assertEqual(cache.get('games', 'fields *; limit 500;', ignore_ttl=True), [{'id': 1}])
+
+        path = cache.path('games', 'fields *; limit 500;')
+        with gzip.open(path, 'wt', encoding='utf8') as cached_file:
+            json.dump([{'id': 2}], cached_file)
+        with self.assertRaises(CacheMissError):
+            cache.get('games', 'fields *; limit 500;')
+        self.assertEqual(cache.get('games', 'fields *; limit 500;', ignore_ttl=True), [{'id': 2}])
+
+    def test_evicts_the_expired_responses_even_when_read(self):
+        cache = ResponseCache(self.directory, ttl=60)
+        cache.set('games', 'offset 0;', [{'id': 0}])
+        path = cache.path('games', 'offset 0;')
+        os.utime(path, (time.time(), time.time() - 120))
+        cache.get('games', 'offset 0;', ignore_ttl=True)
+
+        cache.evict()
+        self.assertFalse(path.exists())
+
+    def test_evicts_least_recently_used(self):
+        cache = ResponseCache(self.directory)
+        for offset in range(3):
+            cache.set('games', f'offset {offset};', [{'id': offset, 'name': 'x' * 1000}])
+            os.utime(cache.path('games', f'offset {offset};'), (time.time() - 10 + offset, time.time() - 10 + offset))
+        cache.get('games', 'offset 0;')
+
+        cache.max_size = sum(os.path.getsize(cache.path('games', f'offset {offset};')) for offset in (0, 2))
+        cache.evict()
+
+        self.assertEqual(cache.get('games', 'offset 0;')[0]['id'], 0)
+        self.assertEqual(cache.get('games', 'offset 2;')[0]['id'], 2)
+        with self.assertRaises(CacheMissError):
+            cache.get('games', 'offset 1;')
+
+    def test_scans_the_directory_only_over_max_size(self):
+        cache = ResponseCache(self.directory)
+        cache.set('games', 'offset 0;', [{'id': 0, 'name': 'x' * 1000}])
+        cache.max_size = os.path.getsize(cache.path('games', 'offset 0;')) * 5
+
+        with mock.patch.object(cache, 'evict', wraps=cache.evict) as evict:
+            for offset in range(1, 20):
+                cache.set('games', f'offset {offset};', [{'id': offset, 'name': 'x' * 1000}])
+
+        self.assertLess(evict.call_count, 10)
+        stored = sum(path.stat().st_size for path in cache.directory.glob('*/*.json.gz'))
+        self.assertLessEqual(stored, cache.max_size)
+        self.assertEqual(cache.size, stored)
+        self.assertEqual(cache.get('games', 'offset 19;')[0]['id'], 19)
+
+    def test_offline_replays_from_cache(self):
+        client = mock.Mock()
+        client.post.return_value.status_code = 200
+        client.post.return_value.json.return_value = [{'id': 1}]
+        cache = ResponseCache(self.directory)
+        IGDBAPI(client=client, cache=cache).fetch_games(limit=10)
+
+        offline_client = mock.Mock()
+        igdb_api = IGDBAPI(client=offline_client, cache=cache, offline=True)
+
+        self.assertEqual(igdb_api.fetch_games(limit=10), [{'id': 1}])
+        with self.assertRaises(CacheMissError):
+            igdb_api.fetch_games(offset=10, limit=10)
+        offline_client.post.assert_not_called()
+
+
+class FakeImageHandler(BaseHTTPRequestHandler):
+    """Fake image host that fails the first request of /flaky.png"""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.received.append(self.path)
+            flaky = self.path == '/flaky.png' and server.received.count(self.path) == 1
+
+        if flaky or self.path == '/missing.png':
+            self.send_response(503 if flaky else 404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(server.image)))
+        self.end_headers()
+        self.wfile.write(server.image)
+
+    def log_message(self, *args):
+        pass
+
+
+class ImageDownloaderTest(StaticRootMixin, FakeServerMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        image = io.BytesIO()
+        Image.new('RGB', (12, 7)).save(image, format='PNG')
+        self.server, self.base_url = self.start_server(FakeImageHandler, image=image.getvalue())
+
+    def test_save_only_queues_the_image(self):
+        cover = Cover.objects.create(filename='game', url=f'{self.base_url}/ok.png')
+
+        self.assertEqual(cover.state, Cover.State.PENDING)
+        self.assertEqual(cover.source_url, f'{self.base_url}/ok.png')
+        self.assertTrue(cover.url.endswith('/covers/game.png'))
+        self.assertEqual(self.server.received, [])
+
+    def test_downloads_pending_images_in_batches(self):
+        for name in ('ok', 'flaky', 'missing'):
+            Cover.objects.create(filename=name, url=f'{self.base_url}/{name}.png')
+
+        stats = ImageDownloader(max_workers=2, per_host=1, max_retries=1, backoff=0.01, batch_size=2).run()
+
+        covers = {cover.filename: cover for cover in Cover.objects.all()}
+        self.assertEqual(covers['ok'].state, Cover.State.READY)
+        self.assertEqual((covers['ok'].width, covers['ok'].height), (12, 7))
+        self.assertEqual(covers['flaky'].state, Cover.State.READY)
+        self.assertTrue(covers['flaky'].file_path.exists())
+        self.assertEqual(covers['missing'].state, Cover.State.FAILED)
+        self.assertEqual(covers['ok'].blob_id, covers['flaky'].blob_id)
+        self.assertEqual(covers['ok'].blob.ref_count, 2)
+        self.assertEqual(covers['ok'].url, covers['ok'].blob.url)
+        self.assertEqual(os.listdir(covers['ok'].file_path.parent), [covers['ok'].file_path.name])
+        self.assertEqual((stats['downloaded'], stats['failed'], stats['retries']), (2, 1, 1))
+
+    def test_skips_known_sources_and_collects_unreferenced_blobs(self):
+        Cover.objects.create(filename='first', url=f'{self.base_url}/ok.png')
+        ImageDownloader(backoff=0.01).run()
+        Cover.objects.create(filename='second', url=f'{self.base_url}/ok.png')
+        stats = ImageDownloader(backoff=0.01).run()
+
+        self.assertEqual((stats['downloaded'], stats['deduplicated']), (0, 1))
+        self.assertEqual(self.server.received, ['/ok.png'])
+        blob = ImageBlob.objects.get()
+        self.assertEqual(blob.ref_count, 2)
+        orphan = blob.path.with_name('0' * 64 + '.png')
+        orphan.write_bytes(b'')
+
+        Cover.objects.all().delete()
+        call_command('collect_blobs', min_age=0, dry_run=True)
+        self.assertTrue(ImageBlob.objects.exists())
+        self.assertTrue(blob.path.exists())
+        self.assertTrue(orphan.exists())
+
+        call_command('collect_blobs', min_age=0)
+
+        self.assertFalse(ImageBlob.objects.exists())
+        self.assertFalse(blob.path.exists())
+        self.assertFalse(orphan.exists())
+
+    def test_keeps_the_file_of_a_blob_referenced_again_while_collected(self):
+        Cover.objects.create(filename='first', url=f'{self.base_url}/ok.png')
+        ImageDownloader(backoff=0.01).run()
+        blob = ImageBlob.objects.get()
+        Cover.objects.all().delete()
+        delete_unreferenced = CollectBlobsCommand.delete_unreferenced
+
+        def referenced_again(command, pks):
+            ImageBlob.objects.filter(pk__in=pks).update(ref_count=1)
+            return delete_unreferenced(command, pks)
+
+        with mock.patch.object(CollectBlobsCommand, 'recount'), \
+                mock.patch.object(CollectBlobsCommand, 'delete_unreferenced', referenced_again):
+            ImageBlob.objects.update(ref_count=0)
+            call_command('collect_blobs', min_age=0)
+
+        self.assertEqual(ImageBlob.objects.get().ref_count, 1)
+        self.assertTrue(blob.path.exists())
+
+
+class ImageDerivativeTest(StaticRootMixin, TestCase):
+    def create_cover(self, filename: str, content: bytes) -> Cover:
+        blob, _ = ImageBlob.objects.get_or_create(hash=hashlib.sha256(content).hexdigest(), ext='.png', size=len(content))
+        blob.path.parent.mkdir(parents=True, exist_ok=True)
+        blob.path.write_bytes(content)
+        cover = Cover.objects.create(filename=filename, url=f'https://images.igdb.com/t_thumb/{filename}.png')
+        Cover.objects.filter(pk=cover.pk).update(state=Cover.State.READY, blob=blob)
+        return Cover.objects.get(pk=cover.pk)
+
+    def test_generates_variants_per_width_and_format_once_per_blob(self):
+        png = io.BytesIO()
+        Image.new('RGBA', (12, 6)).save(png, format='PNG')
+        cover = self.create_cover('game', png.getvalue())
+        same_content = self.create_cover('game-remaster', png.getvalue())
+        self.create_cover('broken', b'not an image')
+
+        generator = ImageDerivativeGenerator(widths=(4, 8, 100), formats=('jpeg', 'webp', 'bmp2'), processes=1)
+        stats = generator.run()
+
+        self.assertEqual((stats['blobs'], stats['variants'], stats['failed']), (1, 6, 1))
+        variants = CoverSchema.from_django(cover).variants
+        self.assertEqual([(v.format.value, v.width, v.height) for v in variants],
+                         [('jpeg', 4, 2), ('jpeg', 8, 4), ('jpeg', 12, 6), ('webp', 4, 2), ('webp', 8, 4), ('webp', 12, 6)])
+        self.assertEqual(CoverSchema.from_django(same_content).variants, variants)
+        for schema in (CoverSchema, ThumbnailSchema):
+            self.assertFalse({'source_url', 'state', 'blob'} & schema.__fields__.keys(), schema)
+        blob = cover.blob
+        self.assertEqual(variants[4].url, f'{settings.IMAGE_STATIC_URL}{blob.variants_folder}/{blob.hash}-8w.webp')
+        with Image.open(os.path.join(settings.STATIC_ROOT, blob.variants_folder, f'{blob.hash}-8w.webp')) as variant:
+            self.assertEqual(variant.size, (8, 4))
+        self.assertEqual(generator.run()['blobs'], 0)
+
+
+class ImageVerifierTest(StaticRootMixin, TestCase):
+    def create_cover(self, filename: str, content: bytes = None, size=(12, 7)) -> Cover:
+        cover = Cover.objects.create(filename=filename, url=f'https://images.igdb.com/t_thumb/{filename}.png')
+        cover.file_path.parent.mkdir(parents=True, exist_ok=True)
+        if content is not None:
+            cover.file_path.write_bytes(content)
+        Cover.objects.filter(pk=cover.pk).update(state=Cover.State.READY, width=size[0], height=size[1])
+        return cover
+
+    def test_requeues_broken_images_and_fixes_dimensions(self):
+        image = io.BytesIO()
+        Image.new('RGB', (12, 7)).save(image, format='PNG')
+        self.create_cover('ok', image.getvalue())
+        self.create_cover('resized', image.getvalue(), size=(24, 14))
+        empty = self.create_cover('empty', b'')
+        self.create_cover('garbage', b'not an image')
+        self.create_cover('missing')
+
+        stats = ImageVerifier(processes=1).run()
+
+        self.assertEqual(stats, {'checked': 5, 'dimensions': 1, 'empty': 1, 'undecodable': 1, 'missing': 1})
+        states = dict(Cover.objects.values_list('filename', 'state'))
+        self.assertEqual(states, {'ok': 'ready', 'resized': 'ready', 'empty': 'pending', 'garbage': 'pending',
+                                  'missing': 'pending'})
+        self.assertEqual(Cover.objects.values_list('width', 'height').get(filename='resized'), (12, 7))
+        self.assertFalse(empty.file_path.exists())
+
+    def test_drops_the_reference_to_a_broken_blob_without_removing_it(self):
+        blob = ImageBlob.objects.create(hash='ab' * 32, ext='.png', size=12, ref_count=2)
+        blob.path.parent.mkdir(parents=True)
+        blob.path.write_bytes(b'not an image')
+        broken, shared = self.create_cover('broken'), self.create_cover('shared')
+        Cover.objects.filter(pk__in=[broken.pk, shared.pk]).update(blob=blob)
+
+        stats = ImageVerifier(processes=1).run(repair=False)
+        self.assertEqual(stats['undecodable'], 2)
+        ImageVerifier(processes=1).run()
+
+        self.assertEqual(list(Cover.objects.values_list('state', 'blob').distinct()), [('pending', None)])
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 0)
+        self.assertTrue(blob.path.exists())
+
+
+class TitleMatcherTest(SimpleTestCase):
+    def brute_force(self, titles, title):
+        matches = [(index, SequenceMatcher(None, name.strip(), title.strip()).ratio()) for index, name in enumerate(titles)]
+        if matches:
+            index, ratio = max(matches, key=lambda x: x[1])
+            if ratio > 0.8:
+                return index
+        return None
+
+    def test_matches_like_comparing_every_pair(self):
+        rng = random.Random(0)
+        words = ['final', 'fantasy', 'vii', 'remake', 'the', 'legend', 'of', 'zelda', ' ', '', 'ii', 'edition']
+        for _ in range(300):
+            titles = [' '.join(rng.choices(words, k=rng.randint(0, 4))) for _ in range(rng.randint(0, 6))]
+            title = rng.choice(titles) if titles and rng.random() < 0.3 else ' '.join(rng.choices(words, k=3))
+            title = title + rng.choice(['', 's', ' ', 'x'])
+            self.assertEqual(TitleMatcher(titles).match(title), self.brute_force(titles, title), (titles, title))
+
+
+class ExplainFiltersTest(TestCase):
+    def test_filters_and_sorts_use_indexes(self):
+        call_command('explain_filters')
+
+    def test_fails_on_filters_scanning_a_whole_index(self):
+        # The default ordering by title lets the planner walk the title index and filter every summary
+        unindexed = Game.objects.filter(summary__icontains='zelda')[:10]
+        with mock.patch.object(ExplainFiltersCommand, 'get_cases', return_value=[('game', unindexed, False)]):
+            with self.assertRaisesMessage(CommandError, 'game: Index Scan on api_game'):
+                call_command('explain_filters')
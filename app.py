@@ -37,7 +37,9 @@ def custom_openapi():
                 "Keywords",
                 "Themes",
                 "Platforms",
-                "Languages"
+                "Languages",
+                "Media",
+                "Autocomplete"
             ]
         }
     ]
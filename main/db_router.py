@@ -0,0 +1,99 @@
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+PRIMARY = 'default'
+
+_replica_reads: ContextVar[bool] = ContextVar('replica_reads', default=False)
+_primary_pinned: ContextVar[bool] = ContextVar('primary_pinned', default=False)
+_last_write: ContextVar[float] = ContextVar('last_write', default=float('-inf'))
+
+
+@contextmanager
+def replica_reads() -> Iterator[None]:
+    """Send the reads inside the block to the read replicas, also usable as a decorator
+
+    The writes of the block only keep its own reads on the primary, a block starts without any.
+    """
+    token = _replica_reads.set(True)
+    last_write_token = _last_write.set(float('-inf'))
+    try:
+        yield
+    finally:
+        _last_write.reset(last_write_token)
+        _replica_reads.reset(token)
+
+
+@contextmanager
+def use_primary() -> Iterator[None]:
+    """Keep the reads inside the block on the primary, even inside `replica_reads`"""
+    token = _primary_pinned.set(True)
+    try:
+        yield
+    finally:
+        _primary_pinned.reset(token)
+
+
+class ReplicaRouter:
+    """Route the reads of `replica_reads` blocks to the replicas and everything else to the primary
+
+    The replicas are the `replica_*` databases, used round-robin and checked with `SELECT 1` at most
+    once per DB_REPLICA_CHECK_INTERVAL seconds; a failing replica is skipped until it answers again
+    and the reads fall back to the primary when none does. After a write, the following reads of the
+    same request stay on the primary for DB_READ_YOUR_WRITES_WINDOW seconds, so they see it before the
+    replicas do; the other requests served by the process keep reading from the replicas.
+
+    Code outside the `replica_reads` blocks, like the management commands and their workers, never
+    reaches a replica.
+    """
+
+    def __init__(self):
+        self.replicas: List[str] = [alias for alias in settings.DATABASES if alias.startswith('replica')]
+        self.health: Dict[str, Tuple[bool, float]] = {}
+        self._replicas = itertools.cycle(self.replicas)
+        self._lock = threading.Lock()
+
+    def db_for_read(self, model, **hints) -> str:
+        if not self.replicas or not _replica_reads.get() or _primary_pinned.get():
+            return PRIMARY
+        if time.monotonic() - _last_write.get() < settings.DB_READ_YOUR_WRITES_WINDOW:
+            return PRIMARY
+        for _ in self.replicas:
+            with self._lock:
+                alias = next(self._replicas)
+            if self.is_healthy(alias):
+                return alias
+        return PRIMARY
+
+    def db_for_write(self, model, **hints) -> str:
+        _last_write.set(time.monotonic())
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints) -> Optional[bool]:
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints) -> Optional[bool]:
+        """Only the primary is migrated, the replicas receive the changes from it"""
+        return db == PRIMARY
+
+    def is_healthy(self, alias: str) -> bool:
+        healthy, checked_at = self.health.get(alias, (True, float('-inf')))
+        if time.monotonic() - checked_at < settings.DB_REPLICA_CHECK_INTERVAL:
+            return healthy
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute('SELECT 1')
+            healthy = True
+        except DatabaseError as e:
+            print(f'Replica {alias} is not available: {e}')
+            if not connections[alias].in_atomic_block:
+                connections[alias].close()
+            healthy = False
+        self.health[alias] = (healthy, time.monotonic())
+        return healthy
@@ -1,8 +1,9 @@
 from fastapi import APIRouter
 
-from api.endpoints import (game_router, genre_router, keyword_router,
-                           language_router, platform_router,
-                           player_perspective_router, theme_router)
+from api.endpoints import (autocomplete_router, game_router, genre_router,
+                           keyword_router, language_router, media_router,
+                           platform_router, player_perspective_router,
+                           theme_router)
 
 router = APIRouter()
 
@@ -13,3 +14,5 @@ router.include_router(keyword_router)
 router.include_router(theme_router)
 router.include_router(platform_router)
 router.include_router(language_router)
+router.include_router(media_router)
+router.include_router(autocomplete_router)
@@ -34,6 +34,15 @@ DB_USER = env('DB_USER')
 DB_PASSWORD = env('DB_PASSWORD')
 DB_HOST = env('DB_HOST')
 DB_PORT = env('DB_PORT')
+# Read replicas (host:port) of the database, used by the GET routes of the API (see main.db_router)
+DB_REPLICAS = env.list('DB_REPLICAS', default=[])
+DB_REPLICA_CONNECT_TIMEOUT = env.int('DB_REPLICA_CONNECT_TIMEOUT', default=2)
+DB_REPLICA_CHECK_INTERVAL = env.float('DB_REPLICA_CHECK_INTERVAL', default=10)
+# Seconds the reads of a request stay on the primary after it writes (0 disables it)
+DB_READ_YOUR_WRITES_WINDOW = env.float('DB_READ_YOUR_WRITES_WINDOW', default=0)
+# Trigram indexes of the wildcard filters, they need the pg_trgm extension. Disable them before the first
+# migrate on servers without it, the models and the migrations leave them out together
+DB_TRIGRAM_INDEXES = env.bool('DB_TRIGRAM_INDEXES', default=True)
 
 SECRET_KEY = env('SECRET_KEY')
 CELERY_BROKER_URL = env('CELERY_BROKER_URL')
@@ -41,6 +50,62 @@ CELERY_BROKER_URL = env('CELERY_BROKER_URL')
 TWITCH_CLIENT_ID = env('TWITCH_CLIENT_ID')
 TWITCH_AUTH = env('TWITCH_AUTH')
 
+# IGDB API client limits (https://api-docs.igdb.com/#rate-limits)
+IGDB_BASE_URL = env('IGDB_BASE_URL', default='https://api.igdb.com/v4')
+IGDB_REQUESTS_PER_SECOND = env.float('IGDB_REQUESTS_PER_SECOND', default=4)
+IGDB_MAX_CONCURRENCY = env.int('IGDB_MAX_CONCURRENCY', default=8)
+IGDB_TIMEOUT = env.float('IGDB_TIMEOUT', default=30)
+IGDB_MAX_RETRIES = env.int('IGDB_MAX_RETRIES', default=5)
+
+# Seeding pipeline: pages fetched from IGDB are queued and written by concurrent workers
+IGDB_SEED_TOTAL = env.int('IGDB_SEED_TOTAL', default=10000)
+IGDB_PAGE_SIZE = env.int('IGDB_PAGE_SIZE', default=500)
+IGDB_SEED_FETCHERS = env.int('IGDB_SEED_FETCHERS', default=4)
+IGDB_SEED_WRITERS = env.int('IGDB_SEED_WRITERS', default=2)
+IGDB_SEED_QUEUE_SIZE = env.int('IGDB_SEED_QUEUE_SIZE', default=4)
+# Worker processes used to populate the games (0 populates with threads in the same process)
+IGDB_SEED_PROCESSES = env.int('IGDB_SEED_PROCESSES', default=0)
+# Games written per transaction and retries of a chunk on operational errors (e.g. deadlocks)
+IGDB_SEED_CHUNK_SIZE = env.int('IGDB_SEED_CHUNK_SIZE', default=50)
+IGDB_SEED_MAX_RETRIES = env.int('IGDB_SEED_MAX_RETRIES', default=3)
+IGDB_SEED_RETRY_BACKOFF = env.float('IGDB_SEED_RETRY_BACKOFF', default=0.5)
+
+# On-disk cache of the IGDB responses, used by `seed --cache` and replayed by `seed --offline`
+IGDB_CACHE_ENABLED = env.bool('IGDB_CACHE_ENABLED', default=False)
+IGDB_CACHE_DIR = env('IGDB_CACHE_DIR', default=str(BASE_DIR.joinpath('.igdb_cache')))
+IGDB_CACHE_TTL = env.int('IGDB_CACHE_TTL', default=7 * 24 * 60 * 60)
+IGDB_CACHE_MAX_SIZE = env.int('IGDB_CACHE_MAX_SIZE', default=1024 * 1024 * 1024)
+
+# Images are saved as pending and downloaded afterwards by `download_images` (also run at the end of `seed`)
+IMAGE_STATIC_URL = env('IMAGE_STATIC_URL', default='http://127.0.0.1:8000/static/')
+IMAGE_DOWNLOAD_WORKERS = env.int('IMAGE_DOWNLOAD_WORKERS', default=16)
+IMAGE_DOWNLOAD_PER_HOST = env.int('IMAGE_DOWNLOAD_PER_HOST', default=8)
+IMAGE_DOWNLOAD_TIMEOUT = env.float('IMAGE_DOWNLOAD_TIMEOUT', default=30)
+IMAGE_DOWNLOAD_MAX_RETRIES = env.int('IMAGE_DOWNLOAD_MAX_RETRIES', default=3)
+IMAGE_DOWNLOAD_BATCH_SIZE = env.int('IMAGE_DOWNLOAD_BATCH_SIZE', default=200)
+# Resized variants generated from the downloaded images by `generate_derivatives` (formats not supported by Pillow are skipped)
+IMAGE_VARIANT_WIDTHS = env.list('IMAGE_VARIANT_WIDTHS', cast=int, default=[90, 180, 360, 720])
+IMAGE_VARIANT_FORMATS = env.list('IMAGE_VARIANT_FORMATS', default=['jpeg', 'webp', 'avif'])
+IMAGE_VARIANT_QUALITY = env.int('IMAGE_VARIANT_QUALITY', default=80)
+# Worker processes used to resize the images (0 uses one per CPU)
+IMAGE_VARIANT_PROCESSES = env.int('IMAGE_VARIANT_PROCESSES', default=0)
+# Worker processes used by `verify_images` to decode the stored images (0 uses one per CPU)
+IMAGE_VERIFY_PROCESSES = env.int('IMAGE_VERIFY_PROCESSES', default=0)
+# Images resized on request by /media/{kind}/{image_id}, cached on disk up to a max size
+IMAGE_RESIZE_CACHE_DIR = env('IMAGE_RESIZE_CACHE_DIR', default=str(BASE_DIR.joinpath('.resize_cache')))
+IMAGE_RESIZE_CACHE_MAX_SIZE = env.int('IMAGE_RESIZE_CACHE_MAX_SIZE', default=512 * 1024 * 1024)
+IMAGE_RESIZE_PROCESSES = env.int('IMAGE_RESIZE_PROCESSES', default=2)
+IMAGE_RESIZE_MAX_WIDTH = env.int('IMAGE_RESIZE_MAX_WIDTH', default=2048)
+# In-process prefix indexes of /autocomplete, rebuilt on catalog changes or after the ttl (to see other processes)
+AUTOCOMPLETE_TTL = env.int('AUTOCOMPLETE_TTL', default=5 * 60)
+AUTOCOMPLETE_MAX_SCAN = env.int('AUTOCOMPLETE_MAX_SCAN', default=2000)
+AUTOCOMPLETE_THUMB_WIDTH = env.int('AUTOCOMPLETE_THUMB_WIDTH', default=90)
+# Cache shared by the API workers, e.g. dbcache://api_cache (table created by `createcachetable`) or memcache://host:port
+CACHE_URL = env('CACHE_URL', default='dbcache://api_cache')
+# Counts per value of the facets requested with `facets=`, cached with the count per filtered set
+FACETS_CACHE_TTL = env.int('FACETS_CACHE_TTL', default=60)
+FACETS_MAX_VALUES = env.int('FACETS_MAX_VALUES', default=50)
+
 
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
@@ -108,6 +173,22 @@ DATABASES = {
         'PORT': DB_PORT,
     }
 }
+for index, replica in enumerate(DB_REPLICAS):
+    replica_host, _, replica_port = replica.partition(':')
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'HOST': replica_host,
+        'PORT': replica_port or DB_PORT,
+        'OPTIONS': {'connect_timeout': DB_REPLICA_CONNECT_TIMEOUT},
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['main.db_router.ReplicaRouter']
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+
+CACHES = {'default': env.cache_url_config(CACHE_URL)}
 
 
 # Password validation
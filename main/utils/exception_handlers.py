@@ -6,8 +6,8 @@ from fastapi.responses import JSONResponse
 from starlette.status import HTTP_422_UNPROCESSABLE_ENTITY
 
 from .exceptions import (EndpointException, FilterException,
-                         LimitException, OffsetException, SlugException,
-                         SortException)
+                         LimitException, MediaException, OffsetException,
+                         SearchException, SlugException, SortException)
 
 
 async def endpoint_exception_handler(request: Request, exc: EndpointException) -> JSONResponse:
@@ -44,7 +44,9 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 exception_handlers = {
     FilterException: endpoint_exception_handler,
     LimitException: endpoint_exception_handler,
+    MediaException: endpoint_exception_handler,
     OffsetException: endpoint_exception_handler,
+    SearchException: endpoint_exception_handler,
     SlugException: endpoint_exception_handler,
     SortException: endpoint_exception_handler,
     RequestValidationError: validation_exception_handler
@@ -1,4 +1,4 @@
-from typing import Any, Dict, Union
+from typing import Any, Dict, Iterable, Union
 
 
 class EndpointException(Exception):
@@ -56,13 +56,42 @@ class SlugException(EndpointException):
 
 
 class FilterException(EndpointException):
-    def __init__(self, code: int = 1, key: str = '', model: str = ''):
+    def __init__(self, code: int = 1, key: str = '', model: str = '', choices: Iterable[str] = ()):
         key_length = len(key.split(",")) - 2
         remove_text = f'Remove {key_length} field{"s" if key_length > 1 else ""}'
         type_errors = {
             0: (404, 'Field not found', f'No field \'{key}\' found in {model} Schema.'),
             1: (400, 'Invalid filter field', 'The filter field must be specified between square brackets \'[]\'. Add at least one filter field to proceed.'),
-            2: (403, 'Too many fields', f'Filter field can only be a max of two words separated by commas \',\' or pipes \'|\'. {remove_text} between: {" or".join(key.replace(",", ", ").rsplit(",", 1))} in \'filters\' param')
+            2: (403, 'Too many fields', f'Filter field can only be a max of two words separated by commas \',\' or pipes \'|\'. {remove_text} between: {" or".join(key.replace(",", ", ").rsplit(",", 1))} in \'filters\' param'),
+            3: (400, 'Invalid tags filter', f'Tags filter \'{key}\' must be \'all:\', \'any:\' or \'none:\' followed by tags separated by commas \',\'.'),
+            4: (404, 'Tag not found', f'No tag \'{key}\' found in Genres, Keywords or Themes.'),
+            5: (400, 'Invalid facet', f'No facet \'{key}\' found in {model}s, use: {", ".join(choices)}.'),
+            6: (400, 'Invalid filter operator', f'Filter field \'{key}\' can only be compared with: {", ".join(choices)}.'),
+            7: (400, 'Invalid filter value', f'Filter \'{key}\' has a value that is not valid for its field.'),
+            8: (400, 'Invalid relation filter', f'Relation filter \'{key}\' is not allowed in {model}s, use: {", ".join(choices)}.'),
+            9: (400, 'Invalid filter field', f'Filter field \'{key}\' is a relation of {model}s, filter by its fields instead: {", ".join(choices) or "none allowed"}.'),
+        }
+        status_code, cause, message = type_errors[code]
+        super().__init__(status_code=status_code, cause=cause, message=message)
+
+
+class MediaException(EndpointException):
+    def __init__(self, code: int = 0, value: str = ''):
+        type_errors = {
+            0: (404, 'Image not found', f'No image \'{value}\' found.'),
+            1: (400, 'Invalid format', f'Format \'{value}\' is not supported.'),
+            2: (500, 'Invalid image', f'Image \'{value}\' could not be resized.'),
+        }
+        status_code, cause, message = type_errors[code]
+        super().__init__(status_code=status_code, cause=cause, message=message)
+
+
+class SearchException(EndpointException):
+    def __init__(self, code: int = 0, value: str = ''):
+        type_errors = {
+            0: (400, 'Invalid cursor', f'Cursor \'{value}\' is not a cursor of this search.'),
+            1: (400, 'Invalid search', 'The search query \'q\' must have at least one word.'),
+            2: (400, 'Invalid type', f'Type \'{value}\' is not one of: game, genre, keyword or platform.'),
         }
         status_code, cause, message = type_errors[code]
         super().__init__(status_code=status_code, cause=cause, message=message)
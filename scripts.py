@@ -40,6 +40,7 @@ def seed():
     print_info("Running migrations")
     subprocess.run([py, manage, "makemigrations"], check=True)
     subprocess.run([py, manage, "migrate"], check=True)
+    subprocess.run([py, manage, "createcachetable"], check=True)
     print_done("Migrations completed")
 
     print_info("Running seed data script")